@@ -0,0 +1,74 @@
+"""
+Headless CLI startup time and import footprint.
+
+Runs ss_cli subcommands in fresh interpreters under -X importtime and reports wall
+time, modules imported and the heaviest imports. Exits non-zero if a subcommand
+pulls in PyQt5, the CLR bridge or GPUtil:
+    python -m benchmarks.bench_cli_startup [--repeat 5]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FORBIDDEN = ("PyQt5", "clr", "GPUtil", "pythonnet")
+
+
+def profile(args, env):
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-m", "ss_cli", *args],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - started
+    imports = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            imports.append((name.rstrip(), int(cumulative)))
+    return wall, imports
+
+
+def run(repeat=5):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, SWAPSPECTRA_NGX_MODELS_ROOT=tmp, XDG_STATE_HOME=tmp)
+        results = {}
+        for args in (["--help"], ["status", "--json"], ["swap", "--dry-run", "nvngx_dlss.dll"]):
+            walls, imports = [], []
+            for _ in range(repeat):
+                wall, imports = profile(args, env)
+                walls.append(wall)
+            top_level = [(name.strip(), us) for name, us in imports if not name.startswith("  ")]
+            modules = {name.strip() for name, _ in imports}
+            results[" ".join(args)] = {
+                "wall_ms": min(walls) * 1000,
+                "modules": len(modules),
+                "import_ms": sum(us for _, us in top_level) / 1000,
+                "heaviest": sorted(top_level, key=lambda item: -item[1])[:5],
+                "forbidden": sorted(m for m in modules if m.split(".")[0] in FORBIDDEN),
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    results = run(args.repeat)
+    failed = False
+    for command, r in results.items():
+        print(f"ss_cli {command}: {r['wall_ms']:.0f} ms wall, {r['modules']} modules, {r['import_ms']:.1f} ms importing")
+        for name, us in r["heaviest"]:
+            print(f"    {name:30} {us / 1000:6.1f} ms")
+        if r["forbidden"]:
+            print(f"    FORBIDDEN: {', '.join(r['forbidden'])}")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
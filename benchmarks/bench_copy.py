@@ -0,0 +1,78 @@
+"""
+DLL copy throughput: core.copyengine against shutil.copy plus a rehash.
+
+Copies one large random file with each method and reports MB/s:
+    python -m benchmarks.bench_copy [--size-mb 300] [--dir PATH]
+
+Use --dir to measure on a particular disk; later runs read the source from the page cache.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.copyengine import copy_file  # noqa: E402
+from core.dll_catalog import hash_file  # noqa: E402
+
+
+def make_source(path, size_mb):
+    block = os.urandom(1024 * 1024)
+    with open(path, "wb") as f:
+        for i in range(size_mb):
+            f.write(block[i % 256:] + block[:i % 256])  # Distinct blocks, cheap to generate
+    return hash_file(path)
+
+
+def naive(src, dst, expected):
+    shutil.copy(src, dst)
+    assert hash_file(dst) == expected
+    return "shutil"
+
+
+def engine_verified(src, dst, expected):
+    return copy_file(src, dst, expected_sha256=expected, fsync=False).method
+
+
+def engine_kernel(src, dst, expected):
+    return copy_file(src, dst, verify=False, fsync=False).method
+
+
+def run(size_mb=300, directory=None, repeat=3):
+    results = {"size_mb": size_mb}
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        src = os.path.join(tmp, "nvngx_dlss.dll")
+        expected = make_source(src, size_mb)
+        for name, fn in (("shutil_copy_rehash", naive), ("copy_verified", engine_verified),
+                         ("copy_kernel", engine_kernel)):
+            best = None
+            for _ in range(repeat):
+                dst = os.path.join(tmp, f"{name}.bin")
+                started = time.perf_counter()
+                method = fn(src, dst, expected)
+                elapsed = time.perf_counter() - started
+                os.remove(dst)
+                best = elapsed if best is None else min(best, elapsed)
+            results[name] = {"method": method, "ms": best * 1000, "mb_s": size_mb / best}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=300)
+    parser.add_argument("--dir", default=None, help="folder to copy in (default: system temp)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    results = run(args.size_mb, args.dir, args.repeat)
+    print(f"{results['size_mb']} MB file, best of {args.repeat}")
+    for name in ("shutil_copy_rehash", "copy_verified", "copy_kernel"):
+        r = results[name]
+        print(f"  {name:20} {r['ms']:8.1f} ms  {r['mb_s']:7.0f} MB/s  ({r['method']})")
+
+
+if __name__ == "__main__":
+    main()
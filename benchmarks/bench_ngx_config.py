@@ -0,0 +1,115 @@
+"""
+nvngx_config.txt parse and write costs on large synthetic configs.
+
+Compares core.ngx_config against the NvngxUpdater.UpdateConfig approach
+(regex over every line and a full rewrite per key):
+    python -m benchmarks.bench_ngx_config [--sections 2000] [--keys 8] [--updates 3]
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.ngx_config import NgxConfig, NgxConfigFile  # noqa: E402
+
+
+def build_config(sections, keys):
+    lines = ["; synthetic nvngx_config.txt"]
+    for s in range(sections):
+        lines.append(f"[model{s}]")
+        lines.extend(f"app_{k:07X} = 1.{s}.{k}" for k in range(keys))
+        lines.append("")
+    return "\r\n".join(lines) + "\r\n"
+
+
+def naive_update(path, section, key, value):
+    """One key per call, as UpdateConfig does it: read all, regex each line, rewrite all."""
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    section_re = re.compile(r"^\s*\[(.+?)\]\s*$")
+    current, found = None, False
+    for i, line in enumerate(lines):
+        match = section_re.match(line)
+        if match:
+            current = match.group(1)
+        elif current == section and line.split("=", 1)[0].strip() == key:
+            lines[i] = f"{key} = {value}"
+            found = True
+    if not found:
+        lines += [f"[{section}]", f"{key} = {value}"]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\r\n".join(lines) + "\r\n")
+
+
+def timed(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def run(sections=2000, keys=8, updates=3, repeat=20):
+    text = build_config(sections, keys)
+    batch = {f"model{s}": {"app_0000000": f"9.9.{s}"} for s in range(updates)}
+    results = {"sections": sections, "keys": keys, "updates": updates, "bytes": len(text)}
+
+    results["parse_ms"] = timed(lambda: NgxConfig.parse(text), repeat)
+    model = NgxConfig.parse(text)
+    results["render_ms"] = timed(model.render, repeat)
+    assert model.render() == text
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "nvngx_config.txt")
+
+        def naive():
+            for section, values in batch.items():
+                for key, value in values.items():
+                    naive_update(path, section, key, value)
+
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        results["naive_update_ms"] = timed(naive, repeat)
+
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        config = NgxConfigFile(path)
+        counter = [0]
+
+        def batched():
+            counter[0] += 1
+            config.update({section: {key: f"{value}.{counter[0]}" for key, value in values.items()}
+                           for section, values in batch.items()})
+
+        results["batched_update_ms"] = timed(batched, repeat)
+        current = {section: {key: config.get(section, key) for key in values} for section, values in batch.items()}
+        results["noop_update_ms"] = timed(lambda: config.update(current), repeat)
+        results["cached_load_ms"] = timed(config.load, repeat * 10)
+        results["parses"], results["writes"] = config.parses, config.writes
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sections", type=int, default=2000)
+    parser.add_argument("--keys", type=int, default=8, help="keys per section")
+    parser.add_argument("--updates", type=int, default=3, help="sections changed per batch, like a DLSS+FG+RR swap")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    r = run(args.sections, args.keys, args.updates, args.repeat)
+    print(f"{r['sections']} sections x {r['keys']} keys ({r['bytes'] / 1024:.0f} KiB)")
+    print(f"  parse           {r['parse_ms']:8.2f} ms")
+    print(f"  render          {r['render_ms']:8.2f} ms")
+    print(f"  naive update    {r['naive_update_ms']:8.2f} ms  ({r['updates']} full rewrites)")
+    print(f"  batched update  {r['batched_update_ms']:8.2f} ms  (one write)")
+    print(f"  no-op update    {r['noop_update_ms']:8.2f} ms  (no write)")
+    print(f"  cached load     {r['cached_load_ms']:8.4f} ms")
+    print(f"  parses {r['parses']}, writes {r['writes']}")
+
+
+if __name__ == "__main__":
+    main()
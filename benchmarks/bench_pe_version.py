@@ -0,0 +1,116 @@
+"""
+DLSS DLL version scan throughput on synthetic PE files.
+
+Builds minimal PE32+ images carrying a VS_VERSIONINFO resource and an export
+table, then times core.pe_version.read_dll_version across all of them:
+    python -m benchmarks.bench_pe_version [--files 500] [--padding-kb 1024]
+"""
+
+import argparse
+import os
+import struct
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.pe_version import VERSION_FUNCTION, read_dll_version  # noqa: E402
+
+SECTION_RVA = 0x1000
+SECTION_RAW = 0x400
+
+
+def build_synthetic_pe(file_version, exports=(VERSION_FUNCTION,), padding=0):
+    """
+    Return the bytes of a minimal PE32+ DLL.
+
+    Args:
+        file_version: (major, minor, build, private) stored in VS_FIXEDFILEINFO
+        exports: Exported function names
+        padding: Extra zero bytes appended to the section, to mimic DLL size
+    """
+    section = bytearray()
+
+    def rva(offset):
+        return SECTION_RVA + offset
+
+    # Export directory, name pointer table and strings
+    names_offset = 40
+    strings_offset = names_offset + 4 * len(exports)
+    strings = bytearray()
+    name_rvas = []
+    for name in exports:
+        name_rvas.append(rva(strings_offset + len(strings)))
+        strings += name.encode("ascii") + b"\0"
+    section += struct.pack("<IIHHIIIIIII", 0, 0, 0, 0, 0, 1, len(exports), len(exports), 0, rva(names_offset), 0)
+    section += b"".join(struct.pack("<I", r) for r in name_rvas) + strings
+    section += b"\0" * (-len(section) % 4)
+
+    # Resource tree: type RT_VERSION -> id 1 -> language 0x409 -> data entry
+    res = len(section)
+    directory = struct.pack("<IIHHHH", 0, 0, 0, 0, 0, 1)
+    level2, level3, data_entry, info = 24, 48, 72, 88
+    section += directory + struct.pack("<II", 16, 0x80000000 | level2)
+    section += directory + struct.pack("<II", 1, 0x80000000 | level3)
+    section += directory + struct.pack("<II", 0x409, data_entry)
+
+    key = "VS_VERSION_INFO\0".encode("utf-16-le")
+    major, minor, build, private = file_version
+    fixed = struct.pack(
+        "<13I", 0xFEEF04BD, 0x10000, (major << 16) | minor, (build << 16) | private,
+        (major << 16) | minor, (build << 16) | private, 0x3F, 0, 0x40004, 2, 0, 0, 0,
+    )
+    version_info = struct.pack("<HHH", 0, len(fixed), 0) + key + b"\0\0" + fixed
+    version_info = struct.pack("<H", len(version_info)) + version_info[2:]
+    section += struct.pack("<IIII", rva(res + info), len(version_info), 0, 0)
+    section += version_info
+    resource_size = len(section) - res
+    section += b"\0" * padding
+    section += b"\0" * (-len(section) % 0x200)
+
+    # Headers
+    dos = bytearray(0x40)
+    dos[:2] = b"MZ"
+    struct.pack_into("<I", dos, 0x3C, 0x40)
+    coff = struct.pack("<HHIIIHH", 0x8664, 1, 0, 0, 0, 240, 0x2022)
+    optional = bytearray(240)
+    struct.pack_into("<H", optional, 0, 0x20B)
+    struct.pack_into("<I", optional, 108, 16)
+    struct.pack_into("<II", optional, 112, rva(0), 40)  # Export directory
+    struct.pack_into("<II", optional, 112 + 16, rva(res), resource_size)  # Resource directory
+    section_header = struct.pack("<8sIIIIIIHHI", b".rdata", len(section), SECTION_RVA, len(section),
+                                 SECTION_RAW, 0, 0, 0, 0, 0x40000040)
+
+    headers = bytes(dos) + b"PE\0\0" + coff + bytes(optional) + section_header
+    return headers + b"\0" * (SECTION_RAW - len(headers)) + bytes(section)
+
+
+def run(files=500, padding_kb=1024):
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(files):
+            path = os.path.join(tmp, f"nvngx_dlss_{i}.dll")
+            with open(path, "wb") as f:
+                f.write(build_synthetic_pe((310, i % 8, i % 200, 0), padding=padding_kb * 1024))
+            paths.append(path)
+
+        started = time.perf_counter()
+        for i, path in enumerate(paths):
+            info = read_dll_version(path)
+            assert info.version_string == f"310.{i % 8}.{i % 200}" and info.has_version_export
+        elapsed = time.perf_counter() - started
+    return {"files": files, "total_ms": elapsed * 1000, "per_file_us": elapsed / files * 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--padding-kb", type=int, default=1024, help="section padding per file")
+    args = parser.parse_args()
+    results = run(args.files, args.padding_kb)
+    print(f"{results['files']} files in {results['total_ms']:.1f} ms ({results['per_file_us']:.1f} us/file)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Cost of a status label update: a per-widget stylesheet vs. the compiled theme.
+
+Builds a window shaped like the main one (labels, a row of buttons, a log view)
+on the offscreen Qt platform and flips a status label ON/OFF both ways:
+    old: label.setStyleSheet(f"... color: {color};") as main_W used to
+    new: ThemeEngine.set_status(label, "on"/"off") under one app stylesheet,
+         which only switches the label's foreground palette role
+Also times a full dark/light theme switch:
+    python -m benchmarks.bench_theme [--updates 2000] [--buttons 8]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+OLD_STATUS_STYLE = "font-size: 16px; font-weight: bold; color: {color};"
+
+
+def build_window(QtWidgets, buttons, role=None):
+    window = QtWidgets.QWidget()
+    layout = QtWidgets.QVBoxLayout(window)
+    labels = []
+    for text in ("Current Status: G-SYNC OFF", "DLSS Overlay: OFF"):
+        label = QtWidgets.QLabel(text)
+        if role:
+            label.setProperty("role", role)
+        layout.addWidget(label)
+        labels.append(label)
+    row = QtWidgets.QHBoxLayout()
+    for i in range(buttons):
+        row.addWidget(QtWidgets.QPushButton(f"Button {i}"))
+    layout.addLayout(row)
+    layout.addWidget(QtWidgets.QPlainTextEdit())
+    window.show()
+    return window, labels
+
+
+def time_updates(app, update, updates):
+    started = time.perf_counter()
+    for i in range(updates):
+        update(i)
+        if i % 50 == 0:
+            app.processEvents()  # Let polish/layout work land inside the measurement
+    app.processEvents()
+    return (time.perf_counter() - started) * 1e6 / updates
+
+
+def run(updates=2000, buttons=8):
+    from PyQt5 import QtWidgets
+    from program.themes import Themes, ThemeEngine
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    results = {}
+
+    # Before: the window carries the dark stylesheet, each update parses a new one
+    engine = ThemeEngine("dark")
+    app.setStyleSheet("")
+    window, labels = build_window(QtWidgets, buttons)
+    window.setStyleSheet(engine.stylesheet())
+    label = labels[0]
+
+    def old_update(i):
+        label.setText(f"Current Status: G-SYNC {'ON' if i % 2 else 'OFF'}")
+        label.setStyleSheet(OLD_STATUS_STYLE.format(color="lightgreen" if i % 2 else "red"))
+    results["setStyleSheet_us"] = time_updates(app, old_update, updates)
+    window.close()
+
+    # After: one application stylesheet, updates switch the foreground role
+    engine.apply("dark", app)
+    window, labels = build_window(QtWidgets, buttons, role="status")
+    label = labels[0]
+
+    def new_update(i):
+        label.setText(f"Current Status: G-SYNC {'ON' if i % 2 else 'OFF'}")
+        engine.set_status(label, "on" if i % 2 else "off")
+    results["role_us"] = time_updates(app, new_update, updates)
+
+    def unchanged_update(i):
+        engine.set_status(label, "on")  # Same value: nothing to do
+    results["role_unchanged_us"] = time_updates(app, unchanged_update, updates)
+
+    names = list(Themes.PALETTES)
+    switches = max(updates // 100, 5)
+    started = time.perf_counter()
+    for i in range(switches):
+        engine.apply(names[i % len(names)], app)
+        app.processEvents()
+    results["theme_switch_ms"] = (time.perf_counter() - started) * 1000 / switches
+    window.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--updates", type=int, default=2000)
+    parser.add_argument("--buttons", type=int, default=8)
+    args = parser.parse_args()
+    try:
+        results = run(args.updates, args.buttons)
+    except ImportError as e:
+        print(f"skipped: {e}")
+        return
+    print(f"status update, per-widget setStyleSheet: {results['setStyleSheet_us']:8.1f} us")
+    print(f"status update, foreground role:          {results['role_us']:8.1f} us")
+    print(f"status update, status unchanged:         {results['role_unchanged_us']:8.1f} us")
+    print(f"theme switch (whole app):                {results['theme_switch_ms']:8.2f} ms")
+    print(f"speed-up: {results['setStyleSheet_us'] / results['role_us']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
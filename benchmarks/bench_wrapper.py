@@ -0,0 +1,95 @@
+"""
+Per-toggle latency: one-shot wrapper spawning vs. the persistent helper.
+
+Runs against local stand-ins, so it works on Linux:
+    python -m benchmarks.bench_wrapper [--toggles 200] [--work-ms 0]
+"""
+
+import argparse
+import os
+import stat
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.executor import run_gsync_command  # noqa: E402
+from core.wrapper_host import WrapperHost, make_host_runner  # noqa: E402
+
+ONE_SHOT = """#!/bin/sh
+sleep {work}
+exit 0
+"""
+
+HELPER = """#!{python}
+import sys, time
+print("READY", flush=True)
+for line in sys.stdin:
+    seq, option = line.split()
+    time.sleep({work})
+    print(f"{{seq}} 0 applied {{option}}", flush=True)
+"""
+
+
+def write_script(directory, name, content):
+    path = os.path.join(directory, name)
+    with open(path, "w") as f:
+        f.write(content)
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+    return path
+
+
+def measure(runner, executable, toggles):
+    samples = []
+    for i in range(toggles):
+        started = time.perf_counter()
+        success, message = runner(executable, 2 if i % 2 else 0, timeout=10)
+        samples.append((time.perf_counter() - started) * 1000)
+        if not success:
+            raise RuntimeError(message)
+    return samples
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        "mean_ms": statistics.mean(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p95_ms": samples[int(len(samples) * 0.95) - 1],
+    }
+
+
+def run(toggles=200, work_ms=0.0):
+    work = work_ms / 1000
+    with tempfile.TemporaryDirectory() as tmp:
+        one_shot = write_script(tmp, "wrapper", ONE_SHOT.format(work=work))
+        helper = write_script(tmp, "helper", HELPER.format(python=sys.executable, work=work))
+
+        results = {"one_shot": summarize(measure(run_gsync_command, one_shot, toggles))}
+
+        host = WrapperHost([helper])
+        runner = make_host_runner(host, run_gsync_command)
+        runner(one_shot, 0, timeout=10)  # Start-up is paid once, outside the measurement
+        try:
+            results["persistent"] = summarize(measure(runner, one_shot, toggles))
+        finally:
+            host.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--toggles", type=int, default=200)
+    parser.add_argument("--work-ms", type=float, default=0.0, help="simulated driver work per toggle")
+    args = parser.parse_args()
+
+    results = run(args.toggles, args.work_ms)
+    for mode, stats in results.items():
+        print(f"{mode:>10}: " + ", ".join(f"{k} {v:.3f}" for k, v in stats.items()))
+    print(f"speed-up: {results['one_shot']['mean_ms'] / results['persistent']['mean_ms']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Backend hot-path benchmark suite with regression thresholds.
+
+Times config access (core.xmlEt), the registry helpers (core.registry), one
+wrapper invocation (core.executor.run_gsync_command), the nvidia-smi probe
+(core.ckGpu), GSyncToggleApp construction on the offscreen Qt platform and a
+profile watcher poll (core.profiles) over a fake process table.
+winreg, nvidia-smi, pyuac and the wrapper are replaced by local fakes, so it runs on Linux:
+    python -m benchmarks.run [--output results.json] [--baseline old.json] [--only registry_read]
+
+Each result is checked against benchmarks/thresholds.json: "max_ms" is an
+absolute ceiling on the median, "tolerance" the allowed ratio to the same
+benchmark in --baseline. Any breach exits with status 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import stat
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+THRESHOLDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thresholds.json")
+
+FAKE_WRAPPER = """#!{python}
+import sys
+sys.exit(0 if sys.argv[1:] in (["0"], ["2"]) else 1)
+"""
+
+FAKE_SMI = """#!{python}
+print("0, GPU-00000000-0000-0000-0000-000000000000, NVIDIA GeForce RTX 4090, 3, 24564, 1024, 23540, 41")
+"""
+
+CONFIG_XML = "<config><gsync>on</gsync><overlay>off</overlay><closeOnTray>true</closeOnTray></config>"
+
+
+class Skip(Exception):
+    """The benchmark cannot run here, e.g. PyQt5 is missing."""
+
+
+def write_script(directory, name, content):
+    path = os.path.join(directory, name)
+    with open(path, "w") as f:
+        f.write(content.format(python=sys.executable))
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+    return path
+
+
+def measure(fn, number, repeat):
+    """Median and p95 per call, in milliseconds, over repeat batches of number calls."""
+    fn()  # Warm-up
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - started) * 1000 / number)
+    samples.sort()
+    return {
+        "median_ms": statistics.median(samples),
+        "p95_ms": samples[max(int(len(samples) * 0.95) - 1, 0)],
+        "calls": number * repeat,
+    }
+
+
+# Benchmarks: each takes the scratch folder and a repeat count and returns measure()'s dict
+def bench_config_get(tmp, repeat):
+    from core.xmlEt import ConfigStore, loadCFG
+    path = os.path.join(tmp, "config.xml")
+    with open(path, "w") as f:
+        f.write(CONFIG_XML)
+    cfg = loadCFG()
+    cfg.store = ConfigStore(path)
+    return measure(lambda: cfg.get("gsync"), 2000, repeat)
+
+
+def bench_config_set(tmp, repeat):
+    from core.xmlEt import ConfigStore, loadCFG
+    path = os.path.join(tmp, "config_set.xml")
+    with open(path, "w") as f:
+        f.write(CONFIG_XML)
+    cfg = loadCFG()
+    cfg.store = ConfigStore(path, debounce=0)  # Every set writes the file, the worst case
+    values = iter(["on", "off"] * 100000)
+    return measure(lambda: cfg.set("gsync", next(values)), 20, repeat)
+
+
+def _memory_registry():
+    from core.regbackend import HKCU, HKLM, MemoryRegistryBackend
+    from core.registry import registry_cache
+    from resources.settings import Settings
+    registry_cache.set_backend(MemoryRegistryBackend({
+        (HKCU, Settings.REGISTRY_PATH): {"GSyncStatus": "ON", "NvngxStatus": "OFF"},
+        (HKLM, Settings.REGISTRY_PATH_DLSS): {"ShowDlssIndicator": 0x400},
+    }))
+    return registry_cache
+
+
+def bench_registry_read(tmp, repeat):
+    from core.registry import read_dlss_overlay_status, read_status
+    cache = _memory_registry()
+
+    def read():
+        cache.invalidate()  # Cold read: one backend call per key
+        read_status()
+        read_dlss_overlay_status()
+    return measure(read, 2000, repeat)
+
+
+def bench_registry_update(tmp, repeat):
+    from core.registry import update_dlss_overlay_in_registry, update_status_in_registry
+    _memory_registry()
+    options = iter([0, 2] * 1000000)
+
+    def update():
+        option = next(options)
+        update_status_in_registry(option)
+        update_dlss_overlay_in_registry(option // 2)
+    return measure(update, 2000, repeat)
+
+
+def bench_gsync_command(tmp, repeat):
+    if os.name == "nt":
+        raise Skip("the fake wrapper is a script, which cannot be spawned directly on Windows")
+    from core.executor import run_gsync_command
+    wrapper = write_script(tmp, "wrapper", FAKE_WRAPPER)
+    options = iter([0, 2] * 100000)
+
+    def toggle():
+        success, message = run_gsync_command(wrapper, next(options), timeout=10)
+        if not success:
+            raise RuntimeError(message)
+    return measure(toggle, 5, repeat)
+
+
+def bench_gpu_probe(tmp, repeat):
+    if os.name == "nt":
+        raise Skip("the fake nvidia-smi is a script, which cannot be spawned directly on Windows")
+    from core.ckGpu import GpuProbe, is_nvidia
+    probe = GpuProbe(smi_path=write_script(tmp, "nvidia-smi", FAKE_SMI), ttl=0)
+
+    def run_probe():
+        if not is_nvidia(probe.get(force=True, timeout=10)):
+            raise RuntimeError("fake nvidia-smi output was not parsed")
+    return measure(run_probe, 5, repeat)
+
+
+def _fake_pyuac():
+    """pyuac (imported by core.elevation) is Windows-only; stand in a non-admin user elsewhere."""
+    try:
+        import pyuac  # noqa: F401
+    except ImportError:
+        import types
+        fake = types.ModuleType("pyuac")
+        fake.isUserAdmin = lambda: False
+        fake.runAsAdmin = lambda *args, **kwargs: None
+        sys.modules["pyuac"] = fake
+
+
+def bench_app_construct(tmp, repeat):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5 import QtWidgets
+    except ImportError:
+        raise Skip("PyQt5 is not installed")
+    _fake_pyuac()
+    from core.ckGpu import gpu_probe
+    from program.main_W import GSyncToggleApp
+
+    _memory_registry()
+    gpu_probe.smi_path = write_script(tmp, "nvidia-smi-app", FAKE_SMI)
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+    def construct():
+        window = GSyncToggleApp()
+        app.processEvents()
+        window.executor.shutdown()
+        window.telemetry.stop()
+        window.close()
+        window.deleteLater()
+        app.processEvents()
+    return measure(construct, 1, max(repeat // 2, 3))
+
+
+def bench_profile_poll(tmp, repeat):
+    from core.profiles import FakeProcessSource, ProfileEngine, ProfileStore
+    path = os.path.join(tmp, "profiles.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"profiles": [
+            {"name": "by name", "match": "Alpha.exe", "gsync": "off"},
+            {"name": "by path", "match": "/opt/Games/Bee.bin", "gsync": "on", "overlay": "on"},
+        ]}, f)
+    state = {"gsync": "ON", "overlay": "OFF"}
+    source = FakeProcessSource()
+    engine = ProfileEngine(ProfileStore(path), source, read_state=lambda: dict(state), apply=state.update)
+    for i in range(3000):
+        source.start(f"proc{i}", f"/usr/bin/proc{i}")
+    engine.poll()  # First poll names every process; matching is covered by tests/test_profiles.py
+
+    # Timed: steady-state polls over a 3000-process table
+    return measure(engine.poll, 100, repeat)
+
+
+BENCHMARKS = {
+    "config_get": bench_config_get,
+    "config_set": bench_config_set,
+    "registry_read": bench_registry_read,
+    "registry_update": bench_registry_update,
+    "gsync_command": bench_gsync_command,
+    "gpu_probe": bench_gpu_probe,
+    "app_construct": bench_app_construct,
+    "profile_poll": bench_profile_poll,
+}
+
+
+def run(names=None, repeat=15):
+    """Run the selected benchmarks in a scratch environment and return {name: result}."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # Logs, caches and the NGX models folder all go to the scratch folder
+        os.environ["XDG_STATE_HOME"] = tmp
+        os.environ["LOCALAPPDATA"] = tmp
+        os.environ["SWAPSPECTRA_NGX_MODELS_ROOT"] = os.path.join(tmp, "models")
+        for name in names or BENCHMARKS:
+            try:
+                results[name] = dict(BENCHMARKS[name](tmp, repeat), status="ok")
+            except Skip as e:
+                results[name] = {"status": "skipped", "reason": str(e)}
+    return results
+
+
+def check(results, thresholds, baseline=None):
+    """Threshold breaches as messages; an empty list means the run passed."""
+    failures = []
+    for name, result in results.items():
+        if result["status"] != "ok":
+            continue
+        limits = thresholds.get(name, {})
+        median = result["median_ms"]
+        if "max_ms" in limits and median > limits["max_ms"]:
+            failures.append(f"{name}: median {median:.3f} ms is over the {limits['max_ms']} ms ceiling")
+        previous = (baseline or {}).get(name, {})
+        if previous.get("status") == "ok" and "tolerance" in limits:
+            allowed = previous["median_ms"] * limits["tolerance"]
+            if median > allowed:
+                failures.append(f"{name}: median {median:.3f} ms is over {limits['tolerance']}x "
+                                f"the baseline {previous['median_ms']:.3f} ms")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="results JSON from an earlier run to compare against")
+    parser.add_argument("--thresholds", default=THRESHOLDS)
+    parser.add_argument("--only", action="append", choices=sorted(BENCHMARKS), help="run only this benchmark")
+    parser.add_argument("--repeat", type=int, default=15, help="timed batches per benchmark")
+    args = parser.parse_args()
+
+    with open(args.thresholds, encoding="utf-8") as f:
+        thresholds = json.load(f)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    results = run(args.only, args.repeat)
+    for name, result in results.items():
+        if result["status"] == "ok":
+            print(f"{name:>16}: median {result['median_ms']:8.3f} ms, p95 {result['p95_ms']:8.3f} ms")
+        else:
+            print(f"{name:>16}: skipped ({result['reason']})")
+
+    if args.output:
+        from resources.settings import Settings
+        document = {
+            "version": Settings.APP_VERSION,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+
+    failures = check(results, thresholds, baseline)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Capabilities Module.
+Optional backends (the idsw-gvlib assembly, NVAPI, the GPU probe, the registry)
+load on first use instead of at import time. A backend that cannot load is
+reported as an unavailable capability, so the UI can disable the feature
+instead of failing to start.
+
+Loaders are registered as "module:function" strings, so importing this module
+imports none of the backends.
+"""
+
+import importlib
+import threading
+import time
+import logging
+from typing import Callable, Dict, List, Optional
+from core.profiler import startup_profiler
+
+logger = logging.getLogger(__name__)
+
+UNLOADED = "unloaded"
+AVAILABLE = "available"
+UNAVAILABLE = "unavailable"
+
+
+class CapabilityUnavailable(Exception):
+    """A backend is missing or failed to load. Raised by loaders and by Capability.get()."""
+
+
+class Capability:
+    """
+    One lazily loaded backend.
+
+    Args:
+        name: Short identifier, e.g. "nvapi"
+        loader: "module:function" or a callable returning the backend object
+        description: What the user loses when it is unavailable
+    """
+
+    def __init__(self, name: str, loader, description: str = ""):
+        self.name = name
+        self.description = description
+        self._loader = loader
+        self._lock = threading.Lock()
+        self.state = UNLOADED
+        self.error: Optional[str] = None
+        self.load_ms: Optional[float] = None
+        self._value = None
+
+    def _resolve(self) -> Callable:
+        if callable(self._loader):
+            return self._loader
+        module, _, function = self._loader.partition(":")
+        return getattr(importlib.import_module(module), function)
+
+    def load(self) -> bool:
+        """Load the backend if not tried yet. Returns whether it is available."""
+        with self._lock:
+            if self.state != UNLOADED:
+                return self.state == AVAILABLE
+            started = time.perf_counter()
+            try:
+                self._value = self._resolve()()
+                self.state = AVAILABLE
+            except Exception as e:  # Includes ImportError for a missing pythonnet
+                self.error = str(e) or type(e).__name__
+                self.state = UNAVAILABLE
+            self.load_ms = (time.perf_counter() - started) * 1000
+        startup_profiler.record(f"load {self.name}", self.load_ms)
+        if self.state == AVAILABLE:
+            logger.info(f"Loaded {self.name} in {self.load_ms:.1f} ms")
+        else:
+            logger.warning(f"{self.name} unavailable: {self.error}")
+        return self.state == AVAILABLE
+
+    @property
+    def available(self) -> bool:
+        return self.load()
+
+    def get(self):
+        """The loaded backend object. Raises CapabilityUnavailable if it cannot load."""
+        if not self.load():
+            raise CapabilityUnavailable(f"{self.name} unavailable: {self.error}")
+        return self._value
+
+    def reset(self) -> None:
+        """Forget the outcome so the next use tries again, e.g. after installing a driver."""
+        with self._lock:
+            self.state, self.error, self.load_ms, self._value = UNLOADED, None, None, None
+
+
+class CapabilityRegistry:
+    """Named capabilities, each loaded on first use."""
+
+    def __init__(self):
+        self._capabilities: Dict[str, Capability] = {}
+
+    def register(self, name: str, loader, description: str = "") -> Capability:
+        capability = Capability(name, loader, description)
+        self._capabilities[name] = capability
+        return capability
+
+    def __getitem__(self, name: str) -> Capability:
+        return self._capabilities[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._capabilities
+
+    def get(self, name: str):
+        return self._capabilities[name].get()
+
+    def available(self, name: str) -> bool:
+        return self._capabilities[name].available
+
+    def report(self) -> List[dict]:
+        """State of every capability, without loading anything."""
+        return [
+            {"name": c.name, "state": c.state, "load_ms": c.load_ms, "error": c.error, "description": c.description}
+            for c in self._capabilities.values()
+        ]
+
+    def report_lines(self) -> List[str]:
+        lines = []
+        for entry in self.report():
+            cost = f", {entry['load_ms']:.1f} ms" if entry["load_ms"] is not None else ""
+            error = f": {entry['error']}" if entry["error"] else ""
+            lines.append(f"{entry['name']}: {entry['state']}{cost}{error}")
+        return lines
+
+
+# Process-wide registry
+capabilities = CapabilityRegistry()
+capabilities.register("gvlib", "core.nvgxswap:load_gvlib", "idsw-gvlib .NET helpers (presence check, NGX model clearing)")
+capabilities.register("nvapi", "core.nvapi_init:load_nvapi", "NVAPI through the gvlib wrapper")
+capabilities.register("gpu_probe", "core.ckGpu:load_gpu_probe", "GPU detection and telemetry through nvidia-smi")
+capabilities.register("registry", "core.registry:load_registry", "G-SYNC and DLSS overlay state in the Windows registry")
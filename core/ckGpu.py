@@ -1,53 +1,225 @@
-import GPUtil
+"""
+GPU Probe Module.
+Queries installed GPUs through nvidia-smi off the startup path and caches the result.
+"""
 
+import os
+import shutil
+import subprocess
+import threading
+import time
+import logging
+from concurrent.futures import Future
+from typing import Callable, List, Optional
+from resources.settings import Settings
+from core.metrics import metrics
 
+logger = logging.getLogger(__name__)
 
-#GPU
-def get_gpu_info():
-    gpus = GPUtil.getGPUs()
-    if not gpus:
+# Same query GPUtil runs, limited to the fields we expose
+QUERY_FIELDS = (
+    "index", "uuid", "name", "utilization.gpu",
+    "memory.total", "memory.used", "memory.free", "temperature.gpu",
+)
+
+
+def find_nvidia_smi() -> Optional[str]:
+    """
+    Locate the nvidia-smi executable the same way GPUtil does.
+
+    Returns:
+        Optional[str]: Path to nvidia-smi, or None if it cannot be found.
+    """
+    smi = shutil.which("nvidia-smi")
+    if smi:
+        return smi
+    if os.name == "nt":
+        candidate = os.path.join(
+            os.environ.get("SystemDrive", "C:") + os.sep,
+            "Program Files", "NVIDIA Corporation", "NVSMI", "nvidia-smi.exe",
+        )
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def _to_float(value: str) -> Optional[float]:
+    try:
+        return float(value)
+    except ValueError:
+        # nvidia-smi reports "[N/A]" / "[Not Supported]" for missing sensors
         return None
-    
-    nvcV = any("NVIDIA" in gpu.name.upper() for gpu in GPUtil.getGPUs())
-    print(f"NVIDIA GPU Hardware status: {nvcV}")
 
+
+def parse_smi_output(output: str) -> List[dict]:
+    """
+    Parse `--format=csv,noheader,nounits` output into GPU info dictionaries.
+
+    Args:
+        output: Raw stdout from nvidia-smi
+
+    Returns:
+        List[dict]: One dictionary per GPU, keyed like GPUtil's GPU attributes.
+    """
     gpu_info_list = []
-    for gpu in gpus:
-        gpu_info = {
-            'id': gpu.id,
-            'name': gpu.name,
-            'load': gpu.load,
-            'memoryTotal': gpu.memoryTotal,
-            'memoryUsed': gpu.memoryUsed,
-            'memoryFree': gpu.memoryFree,
-            'temperature': gpu.temperature,
-            'uuid': gpu.uuid
-        }
-
-        gpu_info_list.append(gpu_info)
-    
+    for line in output.splitlines():
+        fields = [field.strip() for field in line.split(",")]
+        if len(fields) != len(QUERY_FIELDS):
+            continue
+        index, uuid, name, load, mem_total, mem_used, mem_free, temperature = fields
+        load = _to_float(load)
+        gpu_info_list.append({
+            'id': int(index) if index.isdigit() else index,
+            'name': name,
+            'load': load / 100 if load is not None else None,
+            'memoryTotal': _to_float(mem_total),
+            'memoryUsed': _to_float(mem_used),
+            'memoryFree': _to_float(mem_free),
+            'temperature': _to_float(temperature),
+            'uuid': uuid,
+        })
     return gpu_info_list
 
-gpu_info_list = get_gpu_info()
 
-# Extract individual values
-if gpu_info_list:
-    first_gpu_info = gpu_info_list[0]  # Accessing information for the first GPU
-    GPUid_ = first_gpu_info['id']
-    GPUname = first_gpu_info['name']
-    GPUload = first_gpu_info['load']
-    GPUmemory_total = first_gpu_info['memoryTotal']
-    GPUmemory_used = first_gpu_info['memoryUsed']
-    GPUmemory_free = first_gpu_info['memoryFree']
-    GPUtemperature = first_gpu_info['temperature']
-    GPUuuid = first_gpu_info['uuid']
-else:
-    id_ = name = load = memory_total = memory_used = memory_free = temperature = uuid = None
+class GpuProbe:
+    """
+    Cached, thread-safe GPU probe.
+
+    A probe runs nvidia-smi once on a background thread. Concurrent callers
+    share the in-flight probe, results are reused until they are older than
+    the TTL, and subscribers are notified every time a probe completes.
+    Subscribers are called from the probe thread, so Qt code should relay
+    them through a signal.
+    """
+
+    def __init__(self, smi_path: Optional[str] = None, ttl: float = Settings.GPU_PROBE_TTL,
+                 timeout: float = Settings.GPU_PROBE_TIMEOUT):
+        self.smi_path = smi_path
+        self.ttl = ttl
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._inflight: Optional[Future] = None
+        self._result: Optional[List[dict]] = None
+        self._stamp: Optional[float] = None
+        self._subscribers: List[Callable[[Optional[List[dict]]], None]] = []
+
+    def subscribe(self, callback: Callable[[Optional[List[dict]]], None]) -> None:
+        """Register a callback receiving the GPU info list after every probe."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Optional[List[dict]]], None]) -> None:
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def cached(self) -> Optional[List[dict]]:
+        """Return the last probe result without probing, or None if never probed."""
+        return self._result
+
+    def is_fresh(self) -> bool:
+        return self._stamp is not None and (time.monotonic() - self._stamp) < self.ttl
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._stamp = None
+
+    def refresh_async(self, force: bool = False) -> Future:
+        """
+        Start a probe in the background unless a fresh result or a probe in flight exists.
+
+        Args:
+            force: Ignore the cached result and probe again
+
+        Returns:
+            Future: Resolves to the GPU info list (or None when no GPU is reported).
+        """
+        with self._lock:
+            if self._inflight is not None:
+                return self._inflight
+            if not force and self.is_fresh():
+                future = Future()
+                future.set_result(self._result)
+                return future
+            future = self._inflight = Future()
+
+        thread = threading.Thread(target=self._run, args=(future,), name="GpuProbe", daemon=True)
+        thread.start()
+        return future
+
+    def get(self, force: bool = False, timeout: Optional[float] = None) -> Optional[List[dict]]:
+        """Blocking variant of refresh_async()."""
+        return self.refresh_async(force).result(timeout)
+
+    def _run(self, future: Future) -> None:
+        started = time.perf_counter()
+        try:
+            result = self._probe()
+            outcome = "ok" if result else "no_gpu"
+        except Exception as e:
+            logger.error(f"GPU probe failed: {e}")
+            result, outcome = None, "error"
+        metrics.observe("gpu_probe_seconds", time.perf_counter() - started)
+        metrics.inc("gpu_probes_total", outcome=outcome)
+
+        with self._lock:
+            self._result = result
+            self._stamp = time.monotonic()
+            self._inflight = None
+            subscribers = list(self._subscribers)
+        future.set_result(result)
+
+        for callback in subscribers:
+            try:
+                callback(result)
+            except Exception:
+                logger.exception("GPU probe subscriber failed")
+
+    def _probe(self) -> Optional[List[dict]]:
+        smi = self.smi_path or find_nvidia_smi()
+        if not smi:
+            logger.info("nvidia-smi not found, no NVIDIA GPU reported")
+            return None
+
+        started = time.perf_counter()
+        result = subprocess.run(
+            [smi, f"--query-gpu={','.join(QUERY_FIELDS)}", "--format=csv,noheader,nounits"],
+            capture_output=True, text=True, timeout=self.timeout,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+        )
+        if result.returncode != 0:
+            logger.warning(f"nvidia-smi exited with {result.returncode}: {result.stderr.strip()}")
+            return None
+
+        gpu_info_list = parse_smi_output(result.stdout)
+        logger.debug(f"GPU probe took {(time.perf_counter() - started) * 1000:.1f} ms")
+        return gpu_info_list or None
+
+
+def first_gpu_name(gpu_info_list: Optional[List[dict]]) -> str:
+    """Return the first GPU's name, or an empty string if no GPU was reported."""
+    if gpu_info_list:
+        return gpu_info_list[0]['name']
+    return ""
+
 
+def is_nvidia(gpu_info_list: Optional[List[dict]]) -> bool:
+    return any("NVIDIA" in gpu['name'].upper() for gpu in gpu_info_list or [])
 
 
-    
+# Process-wide probe shared by the UI and backend modules
+gpu_probe = GpuProbe()
 
 
+def load_gpu_probe() -> GpuProbe:
+    """The shared probe, for the "gpu_probe" capability. Unavailable without nvidia-smi."""
+    from core.capabilities import CapabilityUnavailable
+    if not (gpu_probe.smi_path or find_nvidia_smi()):
+        raise CapabilityUnavailable("nvidia-smi not found")
+    return gpu_probe
 
 
+# GPU
+def get_gpu_info() -> Optional[List[dict]]:
+    """Return the GPU info list, probing only if the cached result is stale."""
+    return gpu_probe.get()
@@ -0,0 +1,209 @@
+"""
+Copy Engine Module.
+Copies DLLs for the swap path in a single pass: data is hashed as it streams to the
+destination, so the copy is verified without reading either file a second time.
+Hashing runs on a second thread, overlapped with the reads and writes.
+
+When no hash is needed the kernel copies for us instead, trying in order:
+reflink (FICLONE), os.copy_file_range, os.sendfile, then a plain buffered stream.
+"""
+
+import errno
+import hashlib
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, NamedTuple, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+COPY_CHUNK = 8 * 1024 * 1024
+PROGRESS_INTERVAL = 0.1  # Seconds between progress callbacks
+FICLONE = 0x40049409  # Linux ioctl: share extents with the source (btrfs, XFS)
+
+ProgressCallback = Callable[[int, int], None]  # (bytes copied, total bytes)
+
+
+class CopyCancelled(Exception):
+    """The copy was cancelled; the partial destination was removed."""
+
+
+class CopyVerifyError(Exception):
+    """The copied data does not hash to the expected value."""
+
+
+class CopyResult(NamedTuple):
+    size: int
+    sha256: Optional[str]  # None when copied without hashing
+    method: str  # "stream", "reflink", "copy_file_range", "sendfile"
+    elapsed: float
+
+
+class _Progress:
+    """Calls back at most every interval seconds, plus once at the end."""
+
+    def __init__(self, callback: Optional[ProgressCallback], total: int, interval: float,
+                 cancel: Optional[threading.Event]):
+        self.callback = callback
+        self.total = total
+        self.interval = interval
+        self.cancel = cancel
+        self.done = 0
+        self._last = 0.0
+
+    def advance(self, n: int) -> None:
+        self.done += n
+        if self.cancel is not None and self.cancel.is_set():
+            raise CopyCancelled("Copy cancelled")
+        if self.callback is not None:
+            now = time.monotonic()
+            if now - self._last >= self.interval:
+                self._last = now
+                self.callback(self.done, self.total)
+
+    def finish(self) -> None:
+        if self.callback is not None:
+            self.callback(self.done, self.total)
+
+
+def _stream(fsrc, fdst, progress: _Progress, digest, chunk_size: int) -> None:
+    if digest is None:
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        while True:
+            n = fsrc.readinto(buffer)
+            if not n:
+                break
+            fdst.write(view[:n])
+            progress.advance(n)
+        return
+
+    # Two buffers: one is hashed on a worker thread (hashlib drops the GIL)
+    # while the next is read and written, so the hash costs no extra wall time
+    buffers = [bytearray(chunk_size), bytearray(chunk_size)]
+    hashing = [None, None]
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="CopyHash") as hasher:
+        slot = 0
+        while True:
+            if hashing[slot] is not None:
+                hashing[slot].result()  # Buffer is free again
+            n = fsrc.readinto(buffers[slot])
+            if not n:
+                break
+            chunk = memoryview(buffers[slot])[:n]
+            hashing[slot] = hasher.submit(digest.update, chunk)
+            fdst.write(chunk)
+            progress.advance(n)
+            slot ^= 1
+        for future in hashing:
+            if future is not None:
+                future.result()
+
+
+def _reflink(fsrc, fdst) -> bool:
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    try:
+        fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        return True
+    except OSError:
+        return False  # Not supported by this filesystem, or across filesystems
+
+
+def _kernel_copy(fsrc, fdst, size: int, progress: _Progress, chunk_size: int) -> Optional[str]:
+    """
+    Copy with copy_file_range or sendfile. Returns the method used, None if neither works.
+
+    A call that copies nothing before the first byte means the method cannot
+    handle this file (some filesystems report sizes they cannot serve this
+    way), so the next method is tried. Running short after that means the
+    source shrank while it was copied, which raises instead of leaving a
+    truncated file behind.
+    """
+    src, dst = fsrc.fileno(), fdst.fileno()
+    for method in ("copy_file_range", "sendfile"):
+        call = getattr(os, method, None)
+        if call is None:
+            continue
+        offset = 0
+        try:
+            while offset < size:
+                if method == "copy_file_range":
+                    n = call(src, dst, min(chunk_size, size - offset), offset, offset)
+                else:
+                    n = call(dst, src, offset, min(chunk_size, size - offset))
+                if n == 0:
+                    break
+                offset += n
+                progress.advance(n)
+        except OSError:
+            if offset:
+                raise  # Failed midway, not merely unsupported
+            continue
+        if offset == size:
+            return method
+        if offset:
+            raise OSError(errno.EIO, f"Source ended after {offset} of {size} bytes", fsrc.name)
+    return None
+
+
+def copy_file(src: str, dst: str, expected_sha256: Optional[str] = None, verify: bool = True,
+              progress: Optional[ProgressCallback] = None, cancel: Optional[threading.Event] = None,
+              fsync: bool = True, chunk_size: int = COPY_CHUNK,
+              interval: float = PROGRESS_INTERVAL) -> CopyResult:
+    """
+    Copy src to dst, hashing on the way.
+
+    Args:
+        src: Source file
+        dst: Destination file, overwritten; removed again if the copy fails
+        expected_sha256: Raise CopyVerifyError if the copied data hashes differently
+        verify: Hash while copying; False lets the kernel copy without the data passing through Python
+        progress: Called with (bytes copied, total) at most every interval seconds
+        cancel: Set it to stop the copy between chunks
+        fsync: Flush the destination to disk before returning
+
+    Returns:
+        CopyResult: Size, hash and how the data was copied
+
+    Raises:
+        CopyCancelled: If cancel was set
+        CopyVerifyError: If the hash does not match expected_sha256
+        OSError: If reading or writing failed
+    """
+    started = time.perf_counter()
+    verify = verify or expected_sha256 is not None
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            size = os.fstat(fsrc.fileno()).st_size
+            tracker = _Progress(progress, size, interval, cancel)
+            digest = hashlib.sha256() if verify else None
+            method = None
+            if not verify:
+                if _reflink(fsrc, fdst):
+                    method = "reflink"
+                    tracker.advance(size)
+                else:
+                    method = _kernel_copy(fsrc, fdst, size, tracker, chunk_size)
+            if method is None:
+                method = "stream"
+                _stream(fsrc, fdst, tracker, digest, chunk_size)
+            if fsync:
+                fdst.flush()
+                os.fsync(fdst.fileno())
+        sha256 = digest.hexdigest() if digest is not None else None
+        if expected_sha256 is not None and sha256 != expected_sha256:
+            raise CopyVerifyError(f"{src} changed while it was being copied")
+    except BaseException:
+        try:
+            os.remove(dst)
+        except OSError:
+            pass
+        raise
+    tracker.finish()
+    return CopyResult(tracker.done, sha256, method, time.perf_counter() - started)
@@ -0,0 +1,266 @@
+"""
+DLSS DLL Catalog Module.
+Crawls folders for DLSS DLLs and keeps their type, version and content hash in a SQLite index.
+"""
+
+import fnmatch
+import hashlib
+import os
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, NamedTuple, Optional
+from resources.settings import Settings
+from core.paths import user_data_dir
+from core.pe_version import PEError, read_dll_version
+
+logger = logging.getLogger(__name__)
+
+# Longest first: "dlssg" and "dlssd" also start with "dlss"
+DLL_TYPES = ("dlssg", "dlssd", "dlss")
+DLL_PATTERN = "nvngx_dlss*.dll"
+HASH_CHUNK = 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dlls (
+    path TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    version TEXT,
+    snippet_version INTEGER,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    scanned_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS dlls_by_type ON dlls (type, snippet_version DESC);
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    subdirs TEXT NOT NULL
+);
+"""
+# A folder changed this recently may change again within its mtime tick; it is listed again next scan
+RACY_NS = 2 * 10 ** 9
+
+
+def dll_type(file_name: str) -> Optional[str]:
+    """Return "dlss", "dlssg" or "dlssd" for an nvngx_<type>*.dll name, else None."""
+    name = os.path.basename(file_name).lower()
+    if "_" not in name:
+        return None
+    base = name.split("_")[1].replace(".dll", "")
+    for kind in DLL_TYPES:
+        if base.startswith(kind):
+            return kind
+    return None
+
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CatalogEntry(NamedTuple):
+    path: str
+    type: str
+    version: Optional[str]
+    snippet_version: Optional[int]
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+class ScanStats(NamedTuple):
+    seen: int
+    indexed: int
+    unchanged: int
+    removed: int
+    failed: int
+    elapsed: float
+
+
+class DllCatalog:
+    """
+    SQLite-backed index of DLSS DLLs found under a set of root folders.
+
+    scan() skips files whose size and mtime match the index, and folders
+    whose mtime matches the index are not listed again: their subfolders and
+    DLLs come from the index, so a rescan of an unchanged library costs one
+    stat per folder. A DLL rewritten in place (same name, folder untouched)
+    is only noticed by scan(full=True).
+
+    The database is opened on first use, normally by the background scan.
+
+    Args:
+        db_path: SQLite file, ":memory:" for a throwaway index
+        workers: Threads hashing and parsing files
+    """
+
+    def __init__(self, db_path: Optional[str] = None, workers: int = 4):
+        self.db_path = db_path or os.path.join(user_data_dir(), Settings.DLSS_CATALOG_DB)
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self):
+        # Called with the lock held
+        if self._conn is None:
+            import sqlite3  # Only the catalog needs it; dll_type() and hash_file() users do not
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    @staticmethod
+    def configured_roots() -> List[str]:
+        """Roots from config.xml (dlssCatalogRoots, ';'-separated), else the defaults."""
+        from core.xmlEt import config
+        value = config.get("dlssCatalogRoots")
+        roots = value.split(";") if value else Settings.DLSS_CATALOG_ROOTS
+        return [os.path.expandvars(root.strip()) for root in roots if root.strip()]
+
+    def _walk(self, root: str, known_dirs: dict, files_by_dir: dict, dir_rows: list, visited: set):
+        """
+        Yield (path, size, mtime_ns) for the DLLs under root.
+
+        Folders whose mtime matches known_dirs are not listed; their DLLs and
+        subfolders come from the index. Listed folders are appended to
+        dir_rows as (path, mtime_ns, subdirs), every folder reached to visited.
+        """
+        fresh_after = time.time_ns() - RACY_NS
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue  # Vanished folder, its DLLs drop out of the index
+            visited.add(directory)
+            cached = known_dirs.get(directory)
+            if cached is not None and cached[0] == mtime_ns:
+                stack.extend(os.path.join(directory, name) for name in cached[1])
+                yield from files_by_dir.get(directory, ())
+                continue
+
+            subdirs = []
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                subdirs.append(entry.name)
+                            elif fnmatch.fnmatch(entry.name.lower(), DLL_PATTERN) and dll_type(entry.name):
+                                st = entry.stat()
+                                yield os.path.abspath(entry.path), st.st_size, st.st_mtime_ns
+                        except OSError:
+                            continue
+            except OSError:
+                continue  # Unreadable folder
+            stack.extend(os.path.join(directory, name) for name in subdirs)
+            if mtime_ns < fresh_after:
+                dir_rows.append((directory, mtime_ns, "\n".join(subdirs)))
+
+    @staticmethod
+    def _index_file(path: str, size: int, mtime_ns: int) -> CatalogEntry:
+        try:
+            info = read_dll_version(path)
+            version, snippet_version = info.version_string, info.snippet_version
+        except PEError as e:
+            logger.debug(f"No version for {path}: {e}")
+            version = snippet_version = None
+        return CatalogEntry(path, dll_type(path), version, snippet_version, size, mtime_ns, hash_file(path))
+
+    def scan(self, roots: Optional[Iterable[str]] = None, full: bool = False) -> ScanStats:
+        """
+        Crawl the roots and bring the index up to date.
+
+        Args:
+            roots: Folders to crawl, defaults to configured_roots()
+            full: List every folder, ignoring the folder mtimes in the index
+        """
+        started = time.perf_counter()
+        roots = [os.path.abspath(root) for root in (roots if roots is not None else self.configured_roots())]
+        with self._lock:
+            conn = self._connection()
+            known = {path: (size, mtime_ns) for path, size, mtime_ns
+                     in conn.execute("SELECT path, size, mtime_ns FROM dlls")}
+            known_dirs = {} if full else {
+                path: (mtime_ns, subdirs.split("\n") if subdirs else [])
+                for path, mtime_ns, subdirs in conn.execute("SELECT path, mtime_ns, subdirs FROM dirs")
+            }
+        files_by_dir = {}
+        for path, (size, mtime_ns) in known.items():
+            files_by_dir.setdefault(os.path.dirname(path), []).append((path, size, mtime_ns))
+
+        seen, changed, dir_rows, visited = set(), [], [], set()
+        for root in roots:
+            for path, size, mtime_ns in self._walk(root, known_dirs, files_by_dir, dir_rows, visited):
+                seen.add(path)
+                if known.get(path) != (size, mtime_ns):
+                    changed.append((path, size, mtime_ns))
+
+        entries, failed_dirs = [], set()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="DllCatalog") as pool:
+            futures = [(item[0], pool.submit(self._index_file, *item)) for item in changed]
+            for path, future in futures:
+                try:
+                    entries.append(future.result())
+                except OSError as e:
+                    failed_dirs.add(os.path.dirname(path))
+                    logger.warning(f"Failed to index DLL: {e}")
+        failed = len(changed) - len(entries)
+        # A folder with a DLL that failed is listed again next time, so the DLL is retried
+        dir_rows = [row for row in dir_rows if row[0] not in failed_dirs]
+
+        removed = [
+            (path,) for path in known
+            if path not in seen and any(path.startswith(os.path.join(root, "")) for root in roots)
+        ]
+        now = time.time()
+        # Folders gone from under the roots; a changed folder's old row is simply replaced
+        stale_dirs = [
+            (path,) for path in known_dirs
+            if path not in visited and any(path == root or path.startswith(os.path.join(root, "")) for root in roots)
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO dlls VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(*entry, now) for entry in entries],
+            )
+            self._conn.executemany("DELETE FROM dlls WHERE path = ?", removed)
+            self._conn.executemany("INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)", dir_rows)
+            self._conn.executemany("DELETE FROM dirs WHERE path = ?", stale_dirs)
+
+        stats = ScanStats(len(seen), len(entries), len(seen) - len(changed), len(removed), failed,
+                          time.perf_counter() - started)
+        logger.info(f"DLSS catalog scan: {stats.seen} DLLs, {stats.indexed} indexed, "
+                    f"{stats.removed} removed in {stats.elapsed * 1000:.0f} ms")
+        return stats
+
+    def entries(self, kind: Optional[str] = None) -> List[CatalogEntry]:
+        """Indexed DLLs, newest version first, optionally of one type."""
+        query = "SELECT path, type, version, snippet_version, size, mtime_ns, sha256 FROM dlls"
+        params = ()
+        if kind:
+            query += " WHERE type = ?"
+            params = (kind,)
+        query += " ORDER BY type, snippet_version DESC, path"
+        with self._lock:
+            return [CatalogEntry(*row) for row in self._connection().execute(query, params)]
+
+    def find_by_hash(self, sha256: str) -> List[CatalogEntry]:
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT path, type, version, snippet_version, size, mtime_ns, sha256 FROM dlls WHERE sha256 = ?",
+                (sha256,),
+            ).fetchall()
+        return [CatalogEntry(*row) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -2,20 +2,31 @@ import sys
 import pyuac
 import core.xmlEt as xl
 
+# Called before this process hands over to an elevated copy of itself
+_before_restart = []
+
+
+def before_restart(callback):
+    """Register a callback to run before an elevated restart, e.g. to release the instance lock."""
+    _before_restart.append(callback)
+
+
+def _restart_as_admin():
+    for callback in _before_restart:
+        callback()
+    pyuac.runAsAdmin()
+    sys.exit(0)  # Exit the current process to allow the elevated process to take over
+
 
 def is_admin():
     return pyuac.isUserAdmin()
 
 def elevate_by_config():  # Attempt elevation if configured and not admin
-    if xl.loadCFG().get('runAsAdmin') == 'true' and not is_admin():
-        pyuac.runAsAdmin()
-        sys.exit(0)  # Exit the current process to allow the elevated process to take over
+    if xl.config.get_bool('runAsAdmin') and not is_admin():
+        _restart_as_admin()
     return True
 
 def elevate():
     if not is_admin():
-        pyuac.runAsAdmin()
-        sys.exit(0)  # Exit the current process to allow the elevated process to take over
+        _restart_as_admin()
     return True
-
-
@@ -1,16 +1,196 @@
 import subprocess
 import os
+import threading
+import time
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, NamedTuple, Optional
+from resources.settings import Settings
+from core.wrapper_host import WrapperHost, helper_command, make_host_runner
+from core.metrics import metrics
 
-def run_gsync_command(gswdll, option):
+logger = logging.getLogger(__name__)
+
+
+def run_gsync_command(gswdll, option, timeout=None, on_start=None, cancelled=None):
+    """
+    Run the G-SYNC wrapper once and wait for it.
+
+    Args:
+        gswdll: Path to the wrapper executable
+        option: 2 for ON, 0 for OFF
+        timeout: Seconds before the wrapper is killed, None to wait forever
+        on_start: Called with the Popen object once the wrapper is running
+        cancelled: Returns True once the caller cancelled; checked before spawning
+
+    Returns:
+        tuple: (success, message)
+    """
     if not os.path.exists(gswdll):
         return False, f"Executable not found: {gswdll}"
+    if cancelled is not None and cancelled():
+        return False, "Command cancelled"
 
     try:
-        result = subprocess.run([gswdll, str(option)], capture_output=True, text=True, shell=True)
-        if result.returncode == 0:
+        # No shell, so a timeout or cancellation kills the wrapper itself
+        proc = subprocess.Popen(
+            [os.path.abspath(gswdll), str(option)],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+        )
+        if on_start is not None:
+            on_start(proc)
+        try:
+            _, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            try:
+                proc.communicate(timeout=1)
+            except subprocess.TimeoutExpired:
+                pass  # A child of the wrapper still holds the pipes open
+            return False, f"Command timed out after {timeout} s"
+        if proc.returncode == 0:
             return True, f"G-SYNC {'ON' if option == 2 else 'OFF'} applied!"
         else:
-            return False, f"Command failed: {result.stderr}"
+            return False, f"Command failed: {stderr}"
     except Exception as e:
         return False, f"An error occurred: {e}"
 
+
+def default_runner() -> Callable:
+    """The helper-backed runner when a helper is configured, one-shot spawning otherwise."""
+    command = helper_command()
+    if command is None:
+        return run_gsync_command
+    return make_host_runner(WrapperHost(command), run_gsync_command)
+
+
+class CommandResult(NamedTuple):
+    option: int
+    success: bool
+    message: str
+    elapsed: float  # seconds
+    cancelled: bool = False
+
+
+class CommandExecutor:
+    """
+    Runs wrapper invocations off the GUI thread, one at a time.
+
+    submit() returns a Future resolving to a CommandResult. While a command
+    runs, further requests collapse into a single pending one that carries
+    the last requested option, so spamming ON/OFF runs at most two commands.
+
+    Args:
+        executable: Path to the wrapper executable
+        timeout: Per-command timeout in seconds
+        on_result: Called with every CommandResult from a worker thread;
+            Qt callers should pass a signal's emit
+        runner: Replacement for run_gsync_command, same signature (cancelled included);
+            defaults to default_runner()
+    """
+
+    def __init__(self, executable: str, timeout: Optional[float] = Settings.COMMAND_TIMEOUT,
+                 on_result: Optional[Callable[[CommandResult], None]] = None,
+                 runner: Optional[Callable] = None, max_workers: int = 1):
+        self.executable = executable
+        self.timeout = timeout
+        self.on_result = on_result
+        self.runner = runner or default_runner()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="GSyncCommand")
+        self._lock = threading.Lock()
+        self._running: Optional[Future] = None
+        self._pending: Optional[Future] = None
+        self._pending_option: Optional[int] = None
+        self._proc: Optional[subprocess.Popen] = None
+        self._cancel_requested = False
+
+    @property
+    def busy(self) -> bool:
+        return self._running is not None
+
+    def submit(self, option: int) -> Future:
+        with self._lock:
+            if self._pending is not None and not self._pending.cancelled():
+                logger.debug(f"Collapsing queued G-SYNC command into option {option}")
+                self._pending_option = option
+                return self._pending
+
+            future = Future()
+            if self._running is None:
+                self._start(option, future)
+            else:
+                self._pending = future
+                self._pending_option = option
+            return future
+
+    def _start(self, option: int, future: Future) -> None:
+        # Called with the lock held
+        future.set_running_or_notify_cancel()
+        self._running = future
+        self._cancel_requested = False
+        self._pool.submit(self._execute, option, future)
+
+    def _set_proc(self, proc: subprocess.Popen) -> None:
+        with self._lock:
+            self._proc = proc
+            cancel = self._cancel_requested
+        if cancel:
+            proc.kill()
+
+    def _cancelled(self) -> bool:
+        with self._lock:
+            return self._cancel_requested
+
+    def _execute(self, option: int, future: Future) -> None:
+        started = time.perf_counter()
+        try:
+            success, message = self.runner(self.executable, option, timeout=self.timeout,
+                                           on_start=self._set_proc, cancelled=self._cancelled)
+        except Exception as e:
+            success, message = False, f"An error occurred: {e}"
+
+        with self._lock:
+            cancelled = self._cancel_requested
+            self._proc = None
+        if cancelled:
+            success, message = False, "Command cancelled"
+        result = CommandResult(option, success, message, time.perf_counter() - started, cancelled)
+        metrics.observe("gsync_command_seconds", result.elapsed, option=option)
+        metrics.inc("gsync_commands_total", option=option,
+                    outcome="cancelled" if cancelled else "ok" if success else "failed")
+        future.set_result(result)
+
+        if self.on_result is not None:
+            try:
+                self.on_result(result)
+            except Exception:
+                logger.exception("Command result callback failed")
+
+        with self._lock:
+            self._running = None
+            pending, option = self._pending, self._pending_option
+            self._pending = self._pending_option = None
+            if pending is not None and not pending.cancelled():
+                self._start(option, pending)
+
+    def cancel(self) -> None:
+        """Drop the queued command and kill the running one."""
+        with self._lock:
+            if self._pending is not None:
+                self._pending.cancel()
+                self._pending = self._pending_option = None
+            if self._running is not None:
+                self._cancel_requested = True
+                if self._proc is not None:
+                    try:
+                        self._proc.kill()
+                    except OSError:
+                        pass
+
+    def shutdown(self, wait: bool = False) -> None:
+        self.cancel()
+        self._pool.shutdown(wait=wait)
+        host = getattr(self.runner, "host", None)
+        if host is not None:
+            host.close()
@@ -1,10 +1,122 @@
+"""
+Logging Module.
+One logging pipeline for the whole process: callers only enqueue records, a
+background listener thread formats them and writes the rotated log files.
+"""
+
+import atexit
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import sys
+from typing import Optional
 from resources.settings import Settings
+from core.paths import user_data_dir
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line."""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _resolve_level(level):
+    """Numeric level for a name or number, None if logging does not know it."""
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(str(level).strip().upper())
+    return value if isinstance(value, int) else None
+
+
+def setup_logging(log_dir: Optional[str] = None, level: Optional[str] = None,
+                  json_lines: Optional[bool] = None) -> None:
+    """
+    Configure logging for the process. Calls after the first one do nothing.
+
+    Args:
+        log_dir: Directory for the log files, defaults to the per-user logs directory
+        level: Root level name, defaults to SWAPSPECTRA_LOG_LEVEL or Settings.LOG_LEVEL
+        json_lines: Also write a .jsonl file, defaults to SWAPSPECTRA_LOG_JSON or Settings.LOG_JSON
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    requested = level or os.environ.get("SWAPSPECTRA_LOG_LEVEL") or Settings.LOG_LEVEL
+    level = _resolve_level(requested)
+    if level is None:
+        level = _resolve_level(Settings.LOG_LEVEL)
+    if json_lines is None:
+        json_lines = Settings.LOG_JSON or _env_flag("SWAPSPECTRA_LOG_JSON")
+
+    handlers = []
+    try:
+        log_dir = log_dir or user_data_dir("logs")
+        os.makedirs(log_dir, exist_ok=True)
+        log_path = os.path.join(log_dir, Settings.LOG_FILE)
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_path, maxBytes=Settings.LOG_MAX_BYTES, backupCount=Settings.LOG_BACKUP_COUNT,
+            encoding="utf-8", delay=True,
+        )
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        handlers.append(file_handler)
+
+        if json_lines:
+            json_handler = logging.handlers.RotatingFileHandler(
+                os.path.splitext(log_path)[0] + ".jsonl", maxBytes=Settings.LOG_MAX_BYTES,
+                backupCount=Settings.LOG_BACKUP_COUNT, encoding="utf-8", delay=True,
+            )
+            json_handler.setFormatter(JsonLinesFormatter())
+            handlers.append(json_handler)
+    except OSError as e:
+        print(f"Failed to set up log files in {log_dir}: {e}", file=sys.stderr)
+
+    # Windowed (frozen) builds have no stderr
+    if sys.stderr is not None:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        handlers.append(console_handler)
+
+    record_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(record_queue))
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(record_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    if _resolve_level(requested) is None:
+        logging.getLogger(__name__).warning(
+            f"Unknown log level {requested!r}, using {Settings.LOG_LEVEL}")
 
-def setup_logging():
-    logging.basicConfig(
-        filename=Settings.LOG_FILE,
-        level=logging.INFO,
-        format="%(asctime)s - %(levelname)s - %(message)s",
-    )
 
+def shutdown_logging() -> None:
+    """Drain the queue and close the log files."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
@@ -0,0 +1,247 @@
+"""
+Metrics Module.
+Counters and fixed-bucket latency histograms for backend operations (registry
+access, wrapper runs, DLL swaps, NVAPI initialization, GPU probes), exported
+as Prometheus text or JSON.
+
+Enabled by default; SWAPSPECTRA_METRICS=0 turns it off, after which every
+recording call returns after one attribute check. Only the standard library
+is imported, so any module can record metrics without import cost.
+"""
+
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Optional, Tuple
+
+ENV_VAR = "SWAPSPECTRA_METRICS"
+PREFIX = "swapspectra_"
+
+# Upper bounds in seconds, from a cached registry read to a hung wrapper
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Labels = Tuple[Tuple[str, object], ...]
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted(labels.items())) if len(labels) > 1 else tuple(labels.items())
+
+
+def _series_order(item) -> list:
+    return [(key, str(value)) for key, value in item[0]]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, object]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count", "max")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th observation, capped at the max."""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return min(self.buckets[i], self.max) if i < len(self.buckets) else self.max
+        return self.max
+
+
+class MetricsRegistry:
+    """
+    Process-wide counters and histograms, keyed by name and labels.
+
+    Names are given without the "swapspectra_" prefix and with Prometheus
+    conventions: counters end in _total, histograms in _seconds.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, _Histogram]] = {}
+        self._help: Dict[str, str] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+
+    def configure(self) -> bool:
+        """Apply SWAPSPECTRA_METRICS. Returns whether metrics are enabled."""
+        value = os.environ.get(ENV_VAR, "").strip().lower()
+        if value in ("0", "false", "no", "off"):
+            self.enabled = False
+        elif value in ("1", "true", "yes", "on"):
+            self.enabled = True
+        return self.enabled
+
+    def describe(self, name: str, help_text: str, buckets: Optional[Tuple[float, ...]] = None) -> None:
+        """Set the HELP line and, for histograms, the buckets of a metric."""
+        self._help[name] = help_text
+        if buckets is not None:
+            self._buckets[name] = tuple(sorted(buckets))
+
+    # Recording
+    def inc(self, name: str, amount: float = 1, **labels) -> None:
+        if not self.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        if not self.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(self._buckets.get(name, DEFAULT_BUCKETS))
+            histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, name: str, **labels):
+        """Observe the duration of the enclosed block, also when it raises."""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def timed(self, name: str, **labels):
+        """Decorator form of time()."""
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - started, **labels)
+            return wrapper
+        return decorator
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    # Reading
+    def snapshot(self) -> dict:
+        """Everything recorded so far, as plain data (the JSON export)."""
+        with self._lock:
+            counters = [
+                {"name": name, "labels": {k: str(v) for k, v in labels}, "value": value}
+                for name, series in sorted(self._counters.items()) for labels, value in sorted(series.items(), key=_series_order)
+            ]
+            histograms = [
+                {
+                    "name": name, "labels": {k: str(v) for k, v in labels}, "count": h.count, "sum": h.sum, "max": h.max,
+                    "p50": h.quantile(0.5), "p95": h.quantile(0.95),
+                    "buckets": dict(zip([*map(str, h.buckets), "+Inf"], h.counts)),
+                }
+                for name, series in sorted(self._histograms.items()) for labels, h in sorted(series.items(), key=_series_order)
+            ]
+        return {"enabled": self.enabled, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "counters": counters, "histograms": histograms}
+
+    def summary_lines(self) -> List[str]:
+        """One human-readable line per series, for the diagnostics tab."""
+        snapshot = self.snapshot()
+        lines = []
+        for h in snapshot["histograms"]:
+            labels = _format_labels(_labels(h["labels"]))
+            lines.append(f"{h['name']}{labels}: {h['count']} calls, p50 <= {h['p50'] * 1000:.1f} ms, "
+                         f"p95 <= {h['p95'] * 1000:.1f} ms, max {h['max'] * 1000:.1f} ms")
+        for c in snapshot["counters"]:
+            lines.append(f"{c['name']}{_format_labels(_labels(c['labels']))}: {c['value']:g}")
+        return lines
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format, version 0.0.4."""
+        out = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                full = PREFIX + name
+                if name in self._help:
+                    out.append(f"# HELP {full} {self._help[name]}")
+                out.append(f"# TYPE {full} counter")
+                for labels, value in sorted(series.items(), key=_series_order):
+                    out.append(f"{full}{_format_labels(labels)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                full = PREFIX + name
+                if name in self._help:
+                    out.append(f"# HELP {full} {self._help[name]}")
+                out.append(f"# TYPE {full} histogram")
+                for labels, h in sorted(series.items(), key=_series_order):
+                    cumulative = 0
+                    for bound, n in zip([*map(repr, h.buckets), "+Inf"], h.counts):
+                        cumulative += n
+                        out.append(f"{full}_bucket{_format_labels(labels, ('le', bound))} {cumulative}")
+                    out.append(f"{full}_sum{_format_labels(labels)} {h.sum!r}")
+                    out.append(f"{full}_count{_format_labels(labels)} {h.count}")
+        return "\n".join(out) + "\n"
+
+    def export(self, path: str, fmt: Optional[str] = None) -> None:
+        """
+        Write fmt ("json" or "prometheus") to path, atomically.
+
+        Without fmt the extension decides: JSON for .json, Prometheus text otherwise.
+        """
+        if fmt is None:
+            fmt = "json" if path.lower().endswith(".json") else "prometheus"
+        if fmt == "json":
+            text = json.dumps(self.snapshot(), indent=2)
+        else:
+            text = self.to_prometheus()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+
+# Process-wide registry
+metrics = MetricsRegistry()
+metrics.configure()
+metrics.describe("registry_op_seconds", "Registry backend calls by operation")
+metrics.describe("registry_errors_total", "Registry backend calls that failed, by operation and error")
+metrics.describe("gsync_command_seconds", "G-SYNC wrapper invocations, including queueing in the helper")
+metrics.describe("gsync_commands_total", "G-SYNC wrapper invocations by option and outcome")
+metrics.describe("dll_swap_seconds", "NVNGX DLL installs through update_nvngx")
+metrics.describe("dll_swaps_total", "NVNGX DLL installs by outcome")
+metrics.describe("nvapi_init_seconds", "NVAPI initialization")
+metrics.describe("nvapi_init_total", "NVAPI initialization attempts by outcome")
+metrics.describe("gpu_probe_seconds", "nvidia-smi probes")
+metrics.describe("gpu_probes_total", "nvidia-smi probes by outcome")
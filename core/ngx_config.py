@@ -0,0 +1,273 @@
+"""
+NGX Config Module.
+Reads and edits nvngx_config.txt, the INI-style file mapping each NGX model type
+to the DLL version the driver should load:
+
+    [dlss]
+    app_E658703 = 310.2.1
+
+The file is parsed once into an order-preserving model; untouched lines
+(comments, unknown keys, spacing) are written back byte for byte.
+"""
+
+import os
+import tempfile
+import threading
+import logging
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+from resources.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+CONFIG_FILE = "nvngx_config.txt"
+CONFIG_KEY = "app_E658703"  # Key NvngxUpdater writes the version under, in each [<type>] section
+
+
+def models_root() -> str:
+    """NGX models folder, overridable with SWAPSPECTRA_NGX_MODELS_ROOT."""
+    return os.environ.get("SWAPSPECTRA_NGX_MODELS_ROOT") or Settings.NGX_MODELS_ROOT
+
+
+class _Block:
+    """One [section] and the lines under it, up to the next header."""
+
+    __slots__ = ("name", "header", "lines")
+
+    def __init__(self, name: Optional[str], header: Optional[str]):
+        self.name = name
+        self.header = header
+        self.lines: List[list] = []  # [key or None, raw text]
+
+
+class NgxConfig:
+    """Parsed nvngx_config.txt. Build with NgxConfig.parse()."""
+
+    def __init__(self, newline: str = "\n"):
+        self.newline = newline
+        self._blocks: List[_Block] = [_Block(None, None)]  # Lines before the first header
+        self._sections: Dict[str, _Block] = {}
+        self._keys: Dict[Tuple[str, str], list] = {}
+
+    @classmethod
+    def parse(cls, text: str) -> "NgxConfig":
+        config = cls("\r\n" if "\r\n" in text else "\n")
+        block = config._blocks[0]
+        for raw in text.splitlines():
+            stripped = raw.strip()
+            if stripped.startswith("[") and stripped.endswith("]"):
+                block = config._add_block(stripped[1:-1].strip(), raw)
+            elif "=" in raw and block.name is not None and not stripped.startswith((";", "#")):
+                line = [raw.split("=", 1)[0].strip(), raw]
+                block.lines.append(line)
+                config._keys.setdefault((block.name, line[0]), line)  # First one wins, as in a lookup
+            else:
+                block.lines.append([None, raw])
+        return config
+
+    def copy(self) -> "NgxConfig":
+        """Independent copy, cheaper than parsing the text again."""
+        clone = NgxConfig(self.newline)
+        clone._blocks, blocks, lines = [], {}, {}
+        for block in self._blocks:
+            copied = _Block(block.name, block.header)
+            for line in block.lines:
+                copied.lines.append(list(line))
+                lines[id(line)] = copied.lines[-1]
+            clone._blocks.append(copied)
+            blocks[id(block)] = copied
+        clone._sections = {name: blocks[id(block)] for name, block in self._sections.items()}
+        clone._keys = {key: lines[id(line)] for key, line in self._keys.items()}
+        return clone
+
+    def would_change(self, updates: Mapping[str, Mapping[str, str]]) -> bool:
+        return any(self.get(section, key) != str(value)
+                   for section, values in updates.items() for key, value in values.items())
+
+    def _add_block(self, name: str, header: str) -> _Block:
+        block = _Block(name, header)
+        self._blocks.append(block)
+        self._sections.setdefault(name, block)
+        return block
+
+    def sections(self) -> List[str]:
+        return list(self._sections)
+
+    def items(self, section: str) -> Iterator[Tuple[str, str]]:
+        for (name, key), line in self._keys.items():
+            if name == section:
+                yield key, line[1].split("=", 1)[1].strip()
+
+    def get(self, section: str, key: str, default: Optional[str] = None) -> Optional[str]:
+        line = self._keys.get((section, key))
+        return line[1].split("=", 1)[1].strip() if line else default
+
+    def set(self, section: str, key: str, value: str) -> bool:
+        """Set one value. Returns True if the content changed."""
+        return self.update({section: {key: value}})
+
+    def update(self, updates: Mapping[str, Mapping[str, str]]) -> bool:
+        """
+        Apply {section: {key: value}} in one pass, adding missing sections and keys.
+
+        Returns:
+            bool: True if the content changed.
+        """
+        changed = False
+        for section, values in updates.items():
+            for key, value in values.items():
+                value = str(value)
+                line = self._keys.get((section, key))
+                if line is not None:
+                    if line[1].split("=", 1)[1].strip() != value:
+                        line[1] = f"{key} = {value}"
+                        changed = True
+                    continue
+                block = self._sections.get(section) or self._add_block(section, f"[{section}]")
+                line = [key, f"{key} = {value}"]
+                # After the section's last key, before trailing blank lines and comments
+                position = len(block.lines)
+                while position and block.lines[position - 1][0] is None:
+                    position -= 1
+                block.lines.insert(position, line)
+                self._keys[(section, key)] = line
+                changed = True
+        return changed
+
+    def render(self) -> str:
+        out = []
+        for block in self._blocks:
+            if block.header is not None:
+                out.append(block.header)
+            out.extend(line[1] for line in block.lines)
+        return self.newline.join(out) + self.newline if out else ""
+
+
+def _stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def decode(data: bytes) -> Tuple[str, str]:
+    """
+    (text, encoding) of nvngx_config.txt content: UTF-8 with or without a BOM,
+    else Latin-1, which maps every byte so the file is written back unchanged.
+    """
+    if data.startswith(b"\xef\xbb\xbf"):
+        encoding = "utf-8-sig"
+    else:
+        encoding = "utf-8"
+    try:
+        return data.decode(encoding), encoding
+    except UnicodeDecodeError:
+        return data.decode("latin-1"), "latin-1"
+
+
+def write_atomic(path: str, text: str, encoding: str = "utf-8") -> None:
+    """Write text to path through a temp file and rename, so readers never see half a file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".nvngx_config.", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding=encoding, newline="") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class NgxConfigFile:
+    """
+    nvngx_config.txt on disk, re-parsed only when its mtime or size changes.
+
+    Args:
+        path: Path to nvngx_config.txt
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._text = ""
+        self.encoding = "utf-8"  # As read; writes keep it, including a BOM
+        self._model: Optional[NgxConfig] = None
+        self.parses = 0
+        self.writes = 0
+
+    def _load_locked(self) -> NgxConfig:
+        stamp = _stamp(self.path)
+        if self._model is None or stamp != self._stamp:
+            text, encoding = "", "utf-8"
+            if stamp is not None:
+                with open(self.path, "rb") as f:
+                    text, encoding = decode(f.read())
+                if encoding == "latin-1":
+                    logger.warning(f"{self.path} is not UTF-8, reading it as Latin-1")
+            self._model, self._text, self._stamp = NgxConfig.parse(text), text, stamp
+            self.encoding = encoding
+            self.parses += 1
+        return self._model
+
+    def load(self) -> NgxConfig:
+        """The parsed file. Treat it as read-only; change values through update()."""
+        with self._lock:
+            return self._load_locked()
+
+    def get(self, section: str, key: str, default: Optional[str] = None) -> Optional[str]:
+        return self.load().get(section, key, default)
+
+    def render_update(self, updates: Mapping[str, Mapping[str, str]]) -> Optional[str]:
+        """New file content with the updates applied, or None if nothing would change."""
+        with self._lock:
+            model = self._load_locked()
+            if not model.would_change(updates):
+                return None
+            model = model.copy()  # The cached model stays as on disk
+        model.update(updates)
+        return model.render()
+
+    def encode(self, text: str) -> bytes:
+        """File content in the encoding the file was read with."""
+        return text.encode(self.encoding)
+
+    def update(self, updates: Mapping[str, Mapping[str, str]]) -> bool:
+        """
+        Apply updates and write the file once, only if the content changed.
+
+        Returns:
+            bool: True if the file was written.
+        """
+        with self._lock:
+            model = self._load_locked()
+            if not model.update(updates):
+                return False
+            text = model.render()
+            try:
+                write_atomic(self.path, text, self.encoding)
+            except BaseException:
+                self._model = None  # Model is ahead of the file; re-read next time
+                raise
+            self._text, self._stamp = text, _stamp(self.path)
+            self.writes += 1
+            return True
+
+
+_files: Dict[str, NgxConfigFile] = {}
+_files_lock = threading.Lock()
+
+
+def config_file(path: str) -> NgxConfigFile:
+    """Shared NgxConfigFile for path, so every caller hits the same parse cache."""
+    path = os.path.abspath(path)
+    with _files_lock:
+        if path not in _files:
+            _files[path] = NgxConfigFile(path)
+        return _files[path]
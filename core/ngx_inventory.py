@@ -0,0 +1,262 @@
+"""
+NGX Inventory Module.
+Reports which DLL versions are installed under the NGX models folder, how much
+disk each one uses, and removes old ones selectively.
+
+Layout read: <models root>/<type>/versions/<snippet version>/files/...
+"""
+
+import os
+import shutil
+import threading
+import logging
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from core.ngx_config import CONFIG_FILE, CONFIG_KEY, config_file, models_root
+from core.pe_version import format_version
+
+logger = logging.getLogger(__name__)
+
+
+class InstalledVersion(NamedTuple):
+    type: str
+    snippet_version: Optional[int]  # None if the folder name is not a number
+    version: str
+    path: str
+    size: int
+    files: int
+    active: bool  # nvngx_config.txt points at it, under any key of its section
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _du(path: str) -> Tuple[int, int]:
+    """Total size and count of the files under path."""
+    size = files = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            size += entry.stat(follow_symlinks=False).st_size
+                            files += 1
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return size, files
+
+
+class _Version:
+    __slots__ = ("stamp", "size", "files")
+
+    def __init__(self, stamp, size, files):
+        self.stamp, self.size, self.files = stamp, size, files
+
+
+class _Type:
+    __slots__ = ("stamp", "versions")
+
+    def __init__(self):
+        self.stamp = None
+        self.versions: Dict[str, _Version] = {}
+
+
+class NgxInventory:
+    """
+    Cached view of the NGX models tree.
+
+    refresh() only re-lists a folder whose mtime changed and only re-sizes a
+    version whose folders changed, so an unchanged tree costs a few stat calls.
+    invalidate() is the hook for a file watcher to force a rescan of a subtree.
+
+    Args:
+        root: NGX models folder, defaults to models_root()
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = os.path.abspath(root or models_root())
+        self._lock = threading.Lock()
+        self._root_stamp = None
+        self._types: Dict[str, _Type] = {}
+        self.dirs_listed = 0  # Folder listings done, for checking the cache works
+
+    def _versions_dir(self, kind: str) -> str:
+        return os.path.join(self.root, kind, "versions")
+
+    def _refresh_locked(self) -> None:
+        stamp = _mtime(self.root)
+        if stamp is None:
+            self._types.clear()
+            self._root_stamp = None
+            return
+        if stamp != self._root_stamp:
+            kinds = set()
+            try:
+                with os.scandir(self.root) as it:
+                    kinds = {e.name for e in it if e.is_dir(follow_symlinks=False) and not e.name.startswith(".")}
+            except OSError:
+                pass
+            self.dirs_listed += 1
+            for kind in set(self._types) - kinds:
+                del self._types[kind]
+            for kind in kinds:
+                self._types.setdefault(kind, _Type())
+            self._root_stamp = stamp
+
+        for kind, cached in self._types.items():
+            versions_dir = self._versions_dir(kind)
+            stamp = _mtime(versions_dir)
+            if stamp != cached.stamp:
+                names = set()
+                if stamp is not None:
+                    try:
+                        with os.scandir(versions_dir) as it:
+                            names = {e.name for e in it if e.is_dir(follow_symlinks=False)}
+                    except OSError:
+                        pass
+                    self.dirs_listed += 1
+                for name in set(cached.versions) - names:
+                    del cached.versions[name]
+                for name in names - set(cached.versions):
+                    cached.versions[name] = _Version(None, 0, 0)
+                cached.stamp = stamp
+
+            for name, version in cached.versions.items():
+                path = os.path.join(versions_dir, name)
+                stamp = (_mtime(path), _mtime(os.path.join(path, "files")))
+                if stamp != version.stamp:
+                    version.size, version.files = _du(path)
+                    version.stamp = stamp
+                    self.dirs_listed += 1
+
+    def refresh(self) -> List[InstalledVersion]:
+        """Bring the cache up to date and return what is installed, newest first per type."""
+        with self._lock:
+            self._refresh_locked()
+            cached = [(kind, name, v.size, v.files)
+                      for kind, t in self._types.items() for name, v in t.versions.items()]
+
+        referenced = self.referenced_versions()
+        result = []
+        for kind, name, size, files in cached:
+            snippet = int(name) if name.isdigit() else None
+            version = format_version(snippet) if snippet is not None else name
+            result.append(InstalledVersion(
+                kind, snippet, version, os.path.join(self._versions_dir(kind), name),
+                size, files, version in referenced.get(kind, ()),
+            ))
+        result.sort(key=lambda v: (v.type, -(v.snippet_version or 0), v.path))
+        return result
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Forget cached state at or under path (everything if None), e.g. from a watcher."""
+        with self._lock:
+            if path is None:
+                self._root_stamp = None
+                self._types.clear()
+                return
+            path = os.path.abspath(path)
+            if path == self.root:
+                self._root_stamp = None
+            for kind, cached in self._types.items():
+                versions_dir = self._versions_dir(kind)
+                if path in (os.path.join(self.root, kind), versions_dir):
+                    cached.stamp = None
+                for name, version in cached.versions.items():
+                    version_path = os.path.join(versions_dir, name)
+                    if path == version_path or path.startswith(os.path.join(version_path, "")):
+                        version.stamp = None
+
+    def watch_paths(self) -> List[str]:
+        """Folders a watcher should follow so invalidate() gets called on changes."""
+        with self._lock:
+            paths = [self.root]
+            for kind, cached in self._types.items():
+                paths += [os.path.join(self.root, kind), self._versions_dir(kind)]
+                for name in cached.versions:
+                    paths += [os.path.join(self._versions_dir(kind), name),
+                              os.path.join(self._versions_dir(kind), name, "files")]
+        return [path for path in paths if os.path.isdir(path)]
+
+    def active_versions(self) -> Dict[str, str]:
+        """{type: version} as set in nvngx_config.txt under CONFIG_KEY, the key swaps write."""
+        config = config_file(os.path.join(self.root, CONFIG_FILE)).load()
+        active = {}
+        for kind in config.sections():
+            value = config.get(kind, CONFIG_KEY)
+            if value:
+                active[kind] = value
+        return active
+
+    def referenced_versions(self) -> Dict[str, Set[str]]:
+        """
+        {type: versions} named by any key in nvngx_config.txt.
+
+        Other applications register their own keys next to CONFIG_KEY, and the
+        driver may load any of them, so all of these count as active.
+        """
+        config = config_file(os.path.join(self.root, CONFIG_FILE)).load()
+        return {kind: {value for _, value in config.items(kind) if value} for kind in config.sections()}
+
+    def usage(self) -> Dict[str, int]:
+        """Bytes used per type."""
+        totals: Dict[str, int] = {}
+        for version in self.refresh():
+            totals[version.type] = totals.get(version.type, 0) + version.size
+        return totals
+
+    def prune(self, keep: int, types: Optional[List[str]] = None, dry_run: bool = False) -> List[InstalledVersion]:
+        """
+        Delete all but the newest keep versions of each type. Active versions are never deleted.
+
+        Deleting runs under the swap engine's lock, so it cannot race an install,
+        and the active versions are read again under it.
+
+        Args:
+            keep: Versions to keep per type, not counting older active ones
+            types: Only prune these types
+            dry_run: Only report what would be deleted
+
+        Returns:
+            List[InstalledVersion]: Versions deleted (or that would be).
+
+        Raises:
+            core.ngx_swap.SwapError: If an install held the lock for too long.
+        """
+        if dry_run:
+            return self._doomed(keep, types)
+
+        from core.ngx_swap import NgxSwapEngine
+        engine = NgxSwapEngine(self.root)
+        removed = []
+        with engine.lock():
+            for version in self._doomed(keep, types):
+                try:
+                    shutil.rmtree(version.path)
+                    removed.append(version)
+                    logger.info(f"Removed {version.type} {version.version} ({version.size / 1024 / 1024:.1f} MB)")
+                except OSError as e:
+                    logger.error(f"Failed to remove {version.path}: {e}")
+                self.invalidate(os.path.dirname(version.path))
+            if removed:
+                engine.prune_store()  # Drop stored copies nothing links to any more
+        return removed
+
+    def _doomed(self, keep: int, types: Optional[List[str]]) -> List[InstalledVersion]:
+        by_type: Dict[str, List[InstalledVersion]] = {}
+        for version in self.refresh():
+            if types is None or version.type in types:
+                by_type.setdefault(version.type, []).append(version)
+        doomed = []
+        for versions in by_type.values():
+            doomed += [v for v in versions[max(keep, 0):] if not v.active]
+        return doomed
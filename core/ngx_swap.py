@@ -0,0 +1,447 @@
+"""
+NGX Swap Engine Module.
+Installs a batch of DLSS DLLs into the NGX models folder as a single journaled transaction.
+
+Layout written, as NvngxUpdater does it:
+    <models root>/<type>/versions/<snippet version>/files/160_E658703.bin
+    <models root>/nvngx_config.txt   [<type>] app_E658703 = <major.minor.patch>
+
+DLL content is kept once in a content-addressed store (<state dir>/store/<sha256>)
+and hard-linked into place, so installing an identical DLL never copies it again
+(the stored copy is re-hashed before reuse, since the links share its data).
+
+Everything that touches the journal, the store or the installed files runs
+under <state dir>/lock, so two installs (or an install and a prune) never
+interleave, whether they come from this process or another one.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+import logging
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from core.copyengine import CopyCancelled, CopyVerifyError, ProgressCallback, copy_file
+from core.dll_catalog import dll_type, hash_file
+from core.ngx_config import CONFIG_FILE, CONFIG_KEY, config_file, models_root
+from core.pe_version import PEError, read_dll_version
+
+try:
+    import fcntl
+    msvcrt = None
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+LOCK_FILE = "lock"
+LOCK_TIMEOUT = 30.0  # Seconds to wait for another install to finish
+LOCK_POLL = 0.05
+MODEL_FILE = "160_E658703.bin"
+STAGED_SUFFIX = ".swapspectra-new"
+BACKUP_SUFFIX = ".swapspectra-old"
+
+
+class SwapError(Exception):
+    """The batch was rejected or could not be applied; nothing was changed."""
+
+
+class SwapItem(NamedTuple):
+    source: str
+    type: str
+    version: str  # major.minor.patch, as written to nvngx_config.txt
+    snippet_version: int  # Folder name under versions/
+    sha256: str
+    dest: str
+
+
+def _fsync_write(path: str, data: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class _StateLock:
+    """
+    Exclusive lock on a state folder: a thread lock within this process, plus
+    an OS lock on a file for other processes. Re-entrant for the owning thread.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def acquire(self, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        if not self._thread_lock.acquire(timeout=max(timeout, 0)):
+            raise SwapError("Another DLL install is in progress")
+        try:
+            if self._depth == 0:
+                self._lock_file(deadline)
+            self._depth += 1
+        except BaseException:
+            self._thread_lock.release()
+            raise
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+                else:
+                    self._file.seek(0)
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            except OSError:
+                pass  # Closing the file drops the lock as well
+            self._file.close()
+            self._file = None
+        self._thread_lock.release()
+
+    def _lock_file(self, deadline: float) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        f = open(self.path, "a+b")
+        try:
+            while True:
+                try:
+                    if fcntl is not None:
+                        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    else:
+                        f.seek(0)
+                        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    if time.monotonic() >= deadline:
+                        raise SwapError("Another DLL install is in progress")
+                    time.sleep(LOCK_POLL)
+        except BaseException:
+            f.close()
+            raise
+        self._file = f
+
+
+_state_locks: Dict[str, _StateLock] = {}
+_state_locks_guard = threading.Lock()
+
+
+def _state_lock(state_dir: str) -> _StateLock:
+    """The one _StateLock per state folder in this process, shared by every engine on it."""
+    key = os.path.normcase(os.path.abspath(state_dir))
+    with _state_locks_guard:
+        lock = _state_locks.get(key)
+        if lock is None:
+            lock = _state_locks[key] = _StateLock(os.path.join(key, LOCK_FILE))
+        return lock
+
+
+class NgxSwapEngine:
+    """
+    Transactional installer for DLSS, Frame Generation and Ray Reconstruction DLLs.
+
+    apply() stages every file next to its destination, writes a journal,
+    then renames everything into place and writes nvngx_config.txt once.
+    If the process dies midway, recover() (run automatically before the
+    next apply) rolls the unfinished batch back from the journal. apply(),
+    recover() and prune_store() hold lock() while they run.
+
+    Args:
+        root: NGX models folder, defaults to models_root()
+        state_dir: Journal and content store, defaults to <root>/.swapspectra
+    """
+
+    def __init__(self, root: Optional[str] = None, state_dir: Optional[str] = None):
+        self.root = os.path.abspath(root or models_root())
+        self.state_dir = state_dir or os.path.join(self.root, ".swapspectra")
+        self.store_dir = os.path.join(self.state_dir, "store")
+        self.journal_path = os.path.join(self.state_dir, "journal.json")
+        self.config_path = os.path.join(self.root, CONFIG_FILE)
+
+    @contextmanager
+    def lock(self, timeout: float = LOCK_TIMEOUT):
+        """
+        Hold the state folder's lock, waiting up to timeout seconds for it.
+
+        Re-entrant within a thread, so callers can group several engine calls.
+
+        Raises:
+            SwapError: If another install still holds it after timeout.
+        """
+        lock = _state_lock(self.state_dir)
+        lock.acquire(timeout)
+        try:
+            yield
+        finally:
+            lock.release()
+
+    # Planning
+    def plan(self, dll_paths: Iterable[str]) -> List[SwapItem]:
+        items: Dict[str, SwapItem] = {}
+        for source in dll_paths:
+            source = os.path.abspath(source.strip().strip('"'))
+            kind = dll_type(source)
+            if kind is None:
+                raise SwapError(f"Invalid DLL type from filename: {os.path.basename(source)}")
+            if not os.path.isfile(source):
+                raise SwapError(f"DLL not found at {source}")
+            if kind in items:
+                raise SwapError(f"More than one {kind} DLL in the batch")
+            try:
+                info = read_dll_version(source)
+            except (PEError, OSError) as e:
+                raise SwapError(f"Cannot read the version of {source}: {e}")
+            dest = os.path.join(self.root, kind, "versions", str(info.snippet_version), "files", MODEL_FILE)
+            items[kind] = SwapItem(source, kind, info.version_string, info.snippet_version, hash_file(source), dest)
+        if not items:
+            raise SwapError("No DLLs to install")
+        return list(items.values())
+
+    # Content store
+    def _store_object(self, item: SwapItem, progress: Optional[ProgressCallback] = None,
+                      cancel: Optional[threading.Event] = None) -> str:
+        """
+        Path of the stored copy of item's content, copying it in only once.
+
+        A stored object shares its data with every installed file linked to it,
+        so a tool that rewrites an installed DLL in place changes the object too.
+        It is hashed again before reuse and replaced if it no longer matches.
+        """
+        obj = os.path.join(self.store_dir, item.sha256)
+        if os.path.exists(obj) and hash_file(obj) != item.sha256:
+            logger.warning(f"Stored copy {obj} was modified through an installed file, replacing it")
+            os.remove(obj)  # Drops only the store's link; installed files keep their data
+        if not os.path.exists(obj):
+            os.makedirs(self.store_dir, exist_ok=True)
+            tmp = f"{obj}.{uuid.uuid4().hex}.tmp"
+            # Hashed while copying: a source changed since plan() fails here without a re-read
+            copy_file(item.source, tmp, expected_sha256=item.sha256, progress=progress, cancel=cancel)
+            os.replace(tmp, obj)
+        elif progress is not None:
+            progress(os.path.getsize(obj), os.path.getsize(obj))
+        return obj
+
+    def _stage(self, obj: str, staged: str) -> None:
+        _remove(staged)
+        try:
+            os.link(obj, staged)
+        except OSError:
+            # Different volume or no hard link support; the store copy is already verified
+            copy_file(obj, staged, verify=False)
+
+    @staticmethod
+    def _is_installed(item: SwapItem) -> bool:
+        try:
+            if os.path.getsize(item.dest) != os.path.getsize(item.source):
+                return False
+        except OSError:
+            return False
+        return hash_file(item.dest) == item.sha256
+
+    # Journal
+    def _write_journal(self, journal: dict) -> None:
+        os.makedirs(self.state_dir, exist_ok=True)
+        tmp = self.journal_path + ".tmp"
+        _fsync_write(tmp, json.dumps(journal, indent=2).encode("utf-8"))
+        os.replace(tmp, self.journal_path)
+
+    def _read_journal(self) -> Optional[dict]:
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.error(f"Unreadable swap journal {self.journal_path}: {e}")
+            return None
+
+    # Transaction
+    def apply(self, dll_paths: Iterable[str], progress: Optional[ProgressCallback] = None,
+              cancel: Optional[threading.Event] = None) -> List[SwapItem]:
+        """
+        Install all DLLs or none of them.
+
+        Args:
+            dll_paths: DLLs to install, at most one per type
+            progress: Called with (bytes copied, total bytes) for the whole batch
+            cancel: Set it to abandon the batch while files are being copied
+
+        Returns:
+            List[SwapItem]: What was installed.
+
+        Raises:
+            SwapError: If the batch is invalid or failed, or another install held
+                the lock for too long; the install is left as it was.
+        """
+        with self.lock():
+            return self._apply_locked(dll_paths, progress, cancel)
+
+    def _apply_locked(self, dll_paths: Iterable[str], progress: Optional[ProgressCallback],
+                      cancel: Optional[threading.Event]) -> List[SwapItem]:
+        self.recover()
+        items = self.plan(dll_paths)
+
+        journal = {
+            "id": uuid.uuid4().hex,
+            "state": "prepared",
+            "ops": [],
+            "config": {
+                "path": self.config_path,
+                "staged": self.config_path + STAGED_SUFFIX,
+                "backup": self.config_path + BACKUP_SUFFIX,
+                "existed": os.path.exists(self.config_path),
+            },
+            "created_dirs": [],
+        }
+        try:
+            self._write_journal(journal)
+
+            # Stage every DLL next to its destination
+            pending = [item for item in items if not self._is_installed(item)]
+            for item in items:
+                if item not in pending:
+                    logger.info(f"{item.type} {item.version} already installed, skipping copy")
+            total = sum(os.path.getsize(item.source) for item in pending)
+            copied = 0
+
+            def item_progress(done, _size):
+                if progress is not None:
+                    progress(copied + done, total)
+
+            for item in pending:
+                if cancel is not None and cancel.is_set():
+                    raise CopyCancelled("Copy cancelled")
+                directory = os.path.dirname(item.dest)
+                missing = directory
+                while not os.path.exists(missing) and os.path.dirname(missing) != missing:
+                    journal["created_dirs"].append(missing)  # Deepest first
+                    missing = os.path.dirname(missing)
+                op = {
+                    "dest": item.dest,
+                    "staged": item.dest + STAGED_SUFFIX,
+                    "backup": item.dest + BACKUP_SUFFIX,
+                    "existed": os.path.exists(item.dest),
+                }
+                journal["ops"].append(op)
+                self._write_journal(journal)
+                os.makedirs(directory, exist_ok=True)
+                self._stage(self._store_object(item, item_progress, cancel), op["staged"])
+                copied += os.path.getsize(item.source)
+
+            # Stage the config, written once for the whole batch and only if it changes
+            updates = {item.type: {CONFIG_KEY: item.version} for item in items}
+            config = config_file(self.config_path)
+            text = config.render_update(updates)
+            journal["config"]["changed"] = text is not None
+            if text is not None:
+                _fsync_write(journal["config"]["staged"], config.encode(text))
+
+            journal["state"] = "committing"
+            self._write_journal(journal)
+        except CopyCancelled as e:
+            self._rollback(journal)
+            raise SwapError("DLL install cancelled") from e
+        except CopyVerifyError as e:
+            self._rollback(journal)
+            raise SwapError(str(e)) from e
+        except Exception as e:
+            self._rollback(journal)
+            raise SwapError(f"Failed to stage DLL install: {e}") from e
+
+        try:
+            for op in journal["ops"]:
+                if op["existed"]:
+                    os.replace(op["dest"], op["backup"])
+                os.replace(op["staged"], op["dest"])
+            config = journal["config"]
+            if config["changed"]:
+                if config["existed"]:
+                    shutil.copy2(config["path"], config["backup"])
+                os.replace(config["staged"], config["path"])
+        except Exception as e:
+            self._rollback(journal)
+            raise SwapError(f"Failed to install DLLs, changes rolled back: {e}") from e
+
+        journal["state"] = "committed"
+        self._write_journal(journal)
+        self._cleanup(journal)
+        for item in items:
+            logger.info(f"Installed {item.type} {item.version} to {item.dest}")
+        return items
+
+    def _rollback(self, journal: dict) -> None:
+        logger.warning(f"Rolling back DLL install {journal.get('id')}")
+        if journal.get("state") == "committing":
+            for op in reversed(journal["ops"]):
+                if os.path.exists(op["backup"]):
+                    os.replace(op["backup"], op["dest"])
+                elif not op["existed"] and not os.path.exists(op["staged"]):
+                    _remove(op["dest"])  # Already renamed into place
+            config = journal["config"]
+            if os.path.exists(config["backup"]):
+                os.replace(config["backup"], config["path"])
+            elif config.get("changed") and not config["existed"] and not os.path.exists(config["staged"]):
+                _remove(config["path"])
+        for op in journal["ops"]:
+            _remove(op["staged"])
+        _remove(journal["config"]["staged"])
+        for directory in journal.get("created_dirs", []):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                pass
+        _remove(self.journal_path)
+
+    def _cleanup(self, journal: dict) -> None:
+        for op in journal["ops"]:
+            _remove(op["backup"])
+        _remove(journal["config"]["backup"])
+        _remove(self.journal_path)
+
+    def recover(self) -> Optional[str]:
+        """
+        Finish or undo a batch interrupted by a crash.
+
+        Returns:
+            Optional[str]: "rolled back", "completed", or None if nothing was pending.
+        """
+        with self.lock():
+            journal = self._read_journal()
+            if journal is None:
+                return None
+            if journal.get("state") == "committed":
+                self._cleanup(journal)
+                return "completed"
+            self._rollback(journal)
+            return "rolled back"
+
+    # Store maintenance
+    def prune_store(self) -> int:
+        """Delete stored objects no installed file links to any more. Returns the count removed."""
+        removed = 0
+        with self.lock():
+            try:
+                entries = list(os.scandir(self.store_dir))
+            except FileNotFoundError:
+                return 0
+            for entry in entries:
+                try:
+                    # DirEntry.stat() reports st_nlink as 0 on Windows; os.stat() has the real count
+                    if entry.is_file() and os.stat(entry.path).st_nlink <= 1:
+                        os.remove(entry.path)
+                        removed += 1
+                except OSError:
+                    continue
+        return removed
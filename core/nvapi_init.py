@@ -3,19 +3,14 @@ NVAPI Initialization Module.
 Handles the initialization and setup of NVIDIA GPU API wrapper through CLR interop.
 """
 
-import clr
 import sys
 import os
 import logging
 import atexit
 from typing import Optional
 from resources.settings import Settings
+from core.metrics import metrics
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 _nvapi_loaded = False
@@ -31,13 +26,24 @@ def initialize_nvapi() -> bool:
         FileNotFoundError: If the required DLL is not found.
         ImportError: If there are issues loading the assembly.
     """
-    global _nvapi_loaded
-    
     # Check if already initialized
     if _nvapi_loaded:
         logger.debug("NVAPI already initialized")
         return True
 
+    outcome = "error"
+    try:
+        with metrics.time("nvapi_init_seconds"):
+            success = _initialize()
+        outcome = "ok" if success else "failed"
+        return success
+    finally:
+        metrics.inc("nvapi_init_total", outcome=outcome)
+
+
+def _initialize() -> bool:
+    global _nvapi_loaded
+
     # Verify nvapi64.dll exists
     nvapi_path = os.path.join(os.environ.get('SystemRoot', ''), 'System32', 'nvapi64.dll')
     if not os.path.exists(nvapi_path):
@@ -57,6 +63,7 @@ def initialize_nvapi() -> bool:
 
     # Load the assembly
     try:
+        import clr
         clr.AddReference("idsw-gvlib")
         from NvApiCall import NvapiWrapper  # type: ignore
         
@@ -83,6 +90,22 @@ def initialize_nvapi() -> bool:
         logger.error(f"Failed to load NVAPI assembly: {str(e)}")
         raise ImportError(f"Failed to load NVAPI assembly: {str(e)}")
 
+def load_nvapi():
+    """
+    Initialize NVAPI for the "nvapi" capability.
+
+    Returns:
+        The NvapiWrapper class.
+
+    Raises:
+        CapabilityUnavailable: If NVAPI is not installed or does not initialize.
+    """
+    from core.capabilities import CapabilityUnavailable
+    if not initialize_nvapi():
+        raise CapabilityUnavailable("NVAPI initialization failed")
+    from NvApiCall import NvapiWrapper  # type: ignore
+    return NvapiWrapper
+
 def shutdown_nvapi() -> None:
     """Properly shutdown NVAPI when the program exits."""
     global _nvapi_loaded
@@ -1,33 +1,57 @@
-import clr
+"""
+NVNGX Swap Module.
+Installs DLSS DLLs into the NGX models folder, and loads the idsw-gvlib assembly
+on demand for the helpers only it provides.
+"""
+
 import sys
 import os
+import threading
 import logging
-from typing import Optional
+from types import SimpleNamespace
+from typing import List, Optional
 from resources.settings import Settings
 from core.registry import read_nvngx_status
+from core.pe_version import PEError, read_dll_version
+from core.ngx_swap import NgxSwapEngine, SwapError
+from core.copyengine import ProgressCallback
+from core.capabilities import CapabilityUnavailable, capabilities
+from core.metrics import metrics
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
-# Add the directory containing your DLL to the path
-dll_path = Settings.gvlibname
-if not os.path.exists(dll_path):
-    raise FileNotFoundError(f"DLL not found at {dll_path}")
 
-sys.path.append(os.path.dirname(dll_path))
+def load_gvlib() -> SimpleNamespace:
+    """
+    Load the idsw-gvlib assembly through pythonnet. Called once, by the "gvlib" capability.
 
-# Load the assembly
-try:
+    Raises:
+        CapabilityUnavailable: If the DLL is missing.
+        ImportError: If pythonnet or the assembly's types cannot be loaded.
+    """
+    dll_path = os.path.abspath(Settings.gvlibname)
+    if not os.path.exists(dll_path):
+        raise CapabilityUnavailable(f"DLL not found at {dll_path}")
+    if os.path.dirname(dll_path) not in sys.path:
+        sys.path.append(os.path.dirname(dll_path))
+
+    import clr
     clr.AddReference("idsw-gvlib")
-    from NvngxUpdaterLib import NvngxUpdater # type: ignore
+    from NvngxUpdaterLib import NvngxUpdater  # type: ignore
     from ClearNVGX import ClearNvngx  # type: ignore
-except Exception as e:
-    logger.error(f"Failed to load idsw-gvlib assembly: {e}")
-    raise
+    from ReturnPresence import ReturnPresence  # type: ignore
+    return SimpleNamespace(NvngxUpdater=NvngxUpdater, ClearNvngx=ClearNvngx, ReturnPresence=ReturnPresence)
+
+
+def clear_nvngx_models() -> bool:
+    """Delete every installed NGX model through ClearNvngx. Returns False if gvlib is unavailable."""
+    try:
+        gvlib = capabilities.get("gvlib")
+    except CapabilityUnavailable as e:
+        logger.error(f"Cannot clear NGX models: {e}")
+        return False
+    gvlib.ClearNvngx.ClearNvngxModels()
+    return True
 
 def update_nvngx(dll_path: str) -> bool:
     """
@@ -42,18 +66,52 @@ def update_nvngx(dll_path: str) -> bool:
     if not dll_path:
         logger.error("DLL path cannot be empty")
         return False
-        
-    dll_path = os.path.abspath(dll_path)
-    if not os.path.exists(dll_path):
-        logger.error(f"DLL not found at {dll_path}")
-        return False
-        
+    return update_nvngx_batch([dll_path])
+
+def update_nvngx_batch(dll_paths: List[str], progress: Optional[ProgressCallback] = None,
+                       cancel: Optional[threading.Event] = None) -> bool:
+    """
+    Install several NVNGX DLLs (at most one per type) as one transaction.
+
+    Args:
+        dll_paths: Paths to the source DLSS, Frame Generation and Ray Reconstruction DLLs
+        progress: Called with (bytes copied, total bytes) while files are copied
+        cancel: Set it to abandon the install; nothing is changed
+
+    Returns:
+        bool: True if every DLL was installed, False if none was
+    """
+    outcome = "failed"
+    try:
+        with metrics.time("dll_swap_seconds", dlls=len(dll_paths)):
+            success = _update_nvngx_batch(dll_paths, progress, cancel)
+        outcome = "ok" if success else "failed"
+        return success
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        metrics.inc("dll_swaps_total", outcome=outcome)
+
+
+def _update_nvngx_batch(dll_paths: List[str], progress: Optional[ProgressCallback],
+                        cancel: Optional[threading.Event]) -> bool:
+    for dll_path in dll_paths:
+        try:
+            info = read_dll_version(os.path.abspath(dll_path))
+        except (PEError, OSError) as e:
+            logger.error(f"Not a valid DLSS DLL: {dll_path} ({e})")
+            return False
+        if not info.has_version_export:
+            logger.warning(f"{dll_path} does not export NVSDK_NGX_GetSnippetVersion")
+        logger.info(f"Detected DLSS DLL version {info.version_string} in {dll_path}")
+
     try:
-        logger.info(f"Attempting to update NVNGX DLL from {dll_path}")
-        NvngxUpdater.UpdateNvngxDll(dll_path)
+        logger.info(f"Attempting to update NVNGX DLLs from {', '.join(dll_paths)}")
+        NgxSwapEngine().apply(dll_paths, progress=progress, cancel=cancel)
         logger.info("NVNGX DLL update completed successfully")
         return True
-    except Exception as e:
+    except SwapError as e:
         logger.error(f"Error updating NVNGX DLL: {e}")
         return False
 
@@ -0,0 +1,23 @@
+"""
+Paths Module.
+Per-user locations for files the app writes (logs, caches, indexes).
+"""
+
+import os
+from resources.settings import Settings
+
+
+def user_data_dir(*parts: str) -> str:
+    """
+    Return (and create) a per-user application directory.
+
+    %LOCALAPPDATA%\\SwapSpectra on Windows, $XDG_STATE_HOME/swapspectra elsewhere.
+    """
+    if os.name == "nt":
+        base = os.path.join(os.environ.get("LOCALAPPDATA") or os.path.expanduser("~"), Settings.APP_TITLE)
+    else:
+        state = os.environ.get("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+        base = os.path.join(state, Settings.APP_TITLE.lower())
+    path = os.path.join(base, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,192 @@
+"""
+PE Version Module.
+Reads DLSS DLL versions straight from the PE/COFF file, without loading or running the DLL.
+
+The version NvngxUpdater obtains by calling NVSDK_NGX_GetSnippetVersion is
+packed as (major << 16) | (minor << 8) | patch. The same numbers are the
+first three parts of the VS_FIXEDFILEINFO file version, which is what this
+module reads from the memory-mapped file.
+"""
+
+import mmap
+import struct
+from typing import List, NamedTuple, Optional, Tuple
+
+VERSION_FUNCTION = "NVSDK_NGX_GetSnippetVersion"
+
+RT_VERSION = 16
+VS_FIXEDFILEINFO_SIGNATURE = 0xFEEF04BD
+IMAGE_DIRECTORY_ENTRY_EXPORT = 0
+IMAGE_DIRECTORY_ENTRY_RESOURCE = 2
+
+
+class PEError(ValueError):
+    """The file is not a PE image or a required structure is malformed."""
+
+
+class DllVersionInfo(NamedTuple):
+    file_version: Tuple[int, int, int, int]
+    snippet_version: int  # Same value NVSDK_NGX_GetSnippetVersion returns
+    version_string: str  # Same text NvngxUpdater.FormatVersion produces
+    has_version_export: bool
+
+
+def format_version(version: int) -> str:
+    """Python equivalent of NvngxUpdater.FormatVersion."""
+    return f"{(version >> 16) & 0xFFFF}.{(version >> 8) & 0xFF}.{version & 0xFF}"
+
+
+def pack_snippet_version(file_version: Tuple[int, int, int, int]) -> int:
+    major, minor, patch, _ = file_version
+    return ((major & 0xFFFF) << 16) | ((minor & 0xFF) << 8) | (patch & 0xFF)
+
+
+class PEImage:
+    """Minimal read-only view over a PE file's headers, sections and directories."""
+
+    def __init__(self, data):
+        self.data = data
+        if len(data) < 0x40 or data[:2] != b"MZ":
+            raise PEError("missing MZ header")
+        pe_offset = struct.unpack_from("<I", data, 0x3C)[0]
+        if data[pe_offset:pe_offset + 4] != b"PE\0\0":
+            raise PEError("missing PE signature")
+
+        coff = pe_offset + 4
+        number_of_sections, = struct.unpack_from("<H", data, coff + 2)
+        optional_size, = struct.unpack_from("<H", data, coff + 16)
+        optional = coff + 20
+        magic, = struct.unpack_from("<H", data, optional)
+        if magic == 0x10B:  # PE32
+            count_offset, dirs_offset = 92, 96
+        elif magic == 0x20B:  # PE32+
+            count_offset, dirs_offset = 108, 112
+        else:
+            raise PEError(f"unknown optional header magic 0x{magic:x}")
+
+        dir_count, = struct.unpack_from("<I", data, optional + count_offset)
+        self.directories = [
+            struct.unpack_from("<II", data, optional + dirs_offset + 8 * i)
+            for i in range(min(dir_count, 16))
+        ]
+
+        self.sections = []
+        table = optional + optional_size
+        for i in range(number_of_sections):
+            virtual_size, virtual_address, raw_size, raw_pointer = struct.unpack_from("<IIII", data, table + 40 * i + 8)
+            self.sections.append((virtual_address, max(virtual_size, raw_size), raw_pointer, raw_size))
+
+    def offset(self, rva: int) -> int:
+        """Translate an RVA to a file offset."""
+        for virtual_address, size, raw_pointer, raw_size in self.sections:
+            if virtual_address <= rva < virtual_address + size:
+                delta = rva - virtual_address
+                if delta >= raw_size:
+                    break
+                return raw_pointer + delta
+        raise PEError(f"RVA 0x{rva:x} is outside every section")
+
+    def directory(self, index: int) -> Optional[Tuple[int, int]]:
+        if index >= len(self.directories):
+            return None
+        rva, size = self.directories[index]
+        return (rva, size) if rva and size else None
+
+    def c_string(self, offset: int, limit: int = 512) -> str:
+        end = self.data.find(b"\0", offset, offset + limit)
+        if end < 0:
+            raise PEError("unterminated string")
+        return bytes(self.data[offset:end]).decode("ascii", "replace")
+
+    def export_names(self) -> List[str]:
+        directory = self.directory(IMAGE_DIRECTORY_ENTRY_EXPORT)
+        if directory is None:
+            return []
+        base = self.offset(directory[0])
+        number_of_names, = struct.unpack_from("<I", self.data, base + 24)
+        names_rva, = struct.unpack_from("<I", self.data, base + 32)
+        names = self.offset(names_rva)
+        return [
+            self.c_string(self.offset(struct.unpack_from("<I", self.data, names + 4 * i)[0]))
+            for i in range(number_of_names)
+        ]
+
+    def _resource_entries(self, offset: int):
+        named, ids = struct.unpack_from("<HH", self.data, offset + 12)
+        for i in range(named + ids):
+            name, target = struct.unpack_from("<II", self.data, offset + 16 + 8 * i)
+            yield name, target & 0x7FFFFFFF, bool(target & 0x80000000)
+
+    def version_resource(self) -> Optional[memoryview]:
+        """Raw VS_VERSIONINFO bytes of the first RT_VERSION resource."""
+        directory = self.directory(IMAGE_DIRECTORY_ENTRY_RESOURCE)
+        if directory is None:
+            return None
+        root = self.offset(directory[0])
+
+        node = None
+        for name, target, subdir in self._resource_entries(root):
+            if name == RT_VERSION and subdir:
+                node = root + target
+                break
+        if node is None:
+            return None
+        # Name level, then language level: take the first entry of each
+        for _ in range(2):
+            entries = list(self._resource_entries(node))
+            if not entries:
+                return None
+            _, target, is_dir = entries[0]
+            node = root + target
+        if is_dir:
+            raise PEError("version resource nested too deeply")
+        data_rva, size = struct.unpack_from("<II", self.data, node)
+        start = self.offset(data_rva)
+        return memoryview(self.data)[start:start + size]
+
+
+def parse_fixed_file_info(resource) -> Tuple[int, int, int, int]:
+    """Extract the file version from VS_VERSIONINFO bytes."""
+    # wLength, wValueLength, wType, then L"VS_VERSION_INFO\0" padded to 32 bits
+    offset = 40
+    signature = struct.unpack_from("<I", resource, offset)[0] if len(resource) >= offset + 52 else None
+    if signature != VS_FIXEDFILEINFO_SIGNATURE:
+        # Tolerate odd padding by scanning aligned words
+        offset = bytes(resource).find(struct.pack("<I", VS_FIXEDFILEINFO_SIGNATURE))
+        if offset < 0 or offset % 4 or len(resource) < offset + 52:
+            raise PEError("VS_FIXEDFILEINFO not found")
+    version_ms, version_ls = struct.unpack_from("<II", resource, offset + 8)
+    return version_ms >> 16, version_ms & 0xFFFF, version_ls >> 16, version_ls & 0xFFFF
+
+
+def read_dll_version(path: str) -> DllVersionInfo:
+    """
+    Read the version of a DLSS DLL without loading it.
+
+    Raises:
+        PEError: If the file is not a PE image or has no version resource.
+        OSError: If the file cannot be opened.
+    """
+    with open(path, "rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise PEError("empty file")
+    try:
+        try:
+            image = PEImage(data)
+            resource = image.version_resource()
+            if resource is None:
+                raise PEError("no version resource")
+            try:
+                file_version = parse_fixed_file_info(resource)
+            finally:
+                resource.release()
+            has_export = VERSION_FUNCTION in image.export_names()
+        except struct.error as e:
+            raise PEError(f"truncated PE structure: {e}")
+    finally:
+        data.close()
+
+    snippet_version = pack_snippet_version(file_version)
+    return DllVersionInfo(file_version, snippet_version, format_version(snippet_version), has_export)
@@ -0,0 +1,144 @@
+"""
+Startup Profiler Module.
+Records wall time, CPU time and module imports for each startup phase.
+
+Enabled with the SWAPSPECTRA_PROFILE_STARTUP=1 environment variable or the
+--profile-startup command line flag. Only the standard library is imported
+here so the profiler can be loaded before anything it measures.
+"""
+
+import json
+import logging
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+ENV_VAR = "SWAPSPECTRA_PROFILE_STARTUP"
+CLI_FLAG = "--profile-startup"
+
+
+class StartupProfiler:
+    """Collects per-phase timings and writes them as a JSON trace."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.phases: List[dict] = []
+        self._origin_wall = time.perf_counter()
+        self._origin_cpu = time.process_time()
+        self._depth = 0
+        self._trace_path: Optional[str] = None
+
+    def configure(self, argv: Optional[List[str]] = None) -> bool:
+        """
+        Enable profiling from the environment or command line.
+
+        The flag is removed from argv so Qt never sees it.
+
+        Returns:
+            bool: Whether profiling is enabled.
+        """
+        if argv is not None and CLI_FLAG in argv:
+            argv.remove(CLI_FLAG)
+            self.enabled = True
+        if os.environ.get(ENV_VAR, "").strip().lower() in ("1", "true", "yes", "on"):
+            self.enabled = True
+        return self.enabled
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block as a named phase. Free when disabled."""
+        if not self.enabled:
+            yield
+            return
+
+        modules_before = len(sys.modules)
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.phases.append({
+                "name": name,
+                "depth": self._depth,
+                "start_ms": round((wall - self._origin_wall) * 1000, 3),
+                "wall_ms": round((time.perf_counter() - wall) * 1000, 3),
+                "cpu_ms": round((time.process_time() - cpu) * 1000, 3),
+                "imports": len(sys.modules) - modules_before,
+            })
+
+    def record(self, name: str, wall_ms: float, cpu_ms: Optional[float] = None) -> None:
+        """Record a phase timed elsewhere, e.g. work finishing on a background thread."""
+        if not self.enabled:
+            return
+        self.phases.append({
+            "name": name,
+            "depth": 0,
+            "start_ms": round((time.perf_counter() - self._origin_wall) * 1000 - wall_ms, 3),
+            "wall_ms": round(wall_ms, 3),
+            "cpu_ms": round(cpu_ms, 3) if cpu_ms is not None else None,
+            "imports": 0,
+        })
+        if self._trace_path:
+            logger.info(f"Startup phase {name}: {wall_ms:.1f} ms wall")
+            try:
+                self.write_trace(self._trace_path)
+            except OSError as e:
+                logger.error(f"Failed to update startup trace: {e}")
+
+    def to_dict(self) -> dict:
+        from resources.settings import Settings
+        return {
+            "app_version": Settings.APP_VERSION,
+            "build": Settings.BUILD_VERSION,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "frozen": bool(getattr(sys, "frozen", False)),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "total_wall_ms": round((time.perf_counter() - self._origin_wall) * 1000, 3),
+            "total_cpu_ms": round((time.process_time() - self._origin_cpu) * 1000, 3),
+            "modules_loaded": len(sys.modules),
+            "phases": self.phases,
+        }
+
+    def write_trace(self, path: str) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_path, path)
+
+    def report_lines(self) -> List[str]:
+        lines = [f"Startup profile ({len(self.phases)} phases):"]
+        for phase in sorted(self.phases, key=lambda p: p["start_ms"]):
+            cpu = f"{phase['cpu_ms']:.1f}" if phase["cpu_ms"] is not None else "-"
+            lines.append(
+                f"{'  ' * (phase['depth'] + 1)}{phase['name']}: "
+                f"{phase['wall_ms']:.1f} ms wall, {cpu} ms cpu, {phase['imports']} imports"
+            )
+        return lines
+
+    def finish(self, path: str) -> List[str]:
+        """
+        Write the JSON trace and return a human readable report for the caller
+        to log (the launcher shows it in the window's log, which also reaches the log file).
+
+        Later record() calls rewrite the trace so late phases are not lost.
+        """
+        if not self.enabled:
+            return []
+        self._trace_path = path
+        try:
+            self.write_trace(path)
+        except OSError as e:
+            logger.error(f"Failed to write startup trace to {path}: {e}")
+        return self.report_lines()
+
+
+# Process-wide profiler, configured by ss_launch.main
+startup_profiler = StartupProfiler()
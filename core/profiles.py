@@ -0,0 +1,537 @@
+"""
+Profiles Module.
+Per-game G-SYNC, DLSS overlay and DLSS DLL profiles, applied automatically
+while a matching game runs and undone when it exits.
+
+profiles.json (in user_data_dir()):
+    {
+      "profiles": [
+        {"name": "Cyberpunk", "match": ["Cyberpunk2077.exe"],
+         "gsync": "on", "overlay": "off", "dlss": ["D:\\dlls\\nvngx_dlss.dll"]},
+        {"name": "Emulator", "match": ["C:\\Emu\\bin\\emu.exe"], "gsync": "off"}
+      ]
+    }
+
+A match entry without a folder compares the executable name, one with a folder
+compares the full path. Settings left out are not touched.
+
+The process table is diffed between polls: listing pids is the only per-process
+cost, and a process is only named (and its path only resolved) when it first
+shows up, so a steady system costs one enumeration and a set difference.
+"""
+
+import abc
+import json
+import os
+import sys
+import time
+import logging
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from core.paths import user_data_dir
+from resources.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileError(Exception):
+    """profiles.json is unreadable or malformed."""
+
+
+# Process sources
+class ProcessSource(abc.ABC):
+    """
+    Where the watcher gets processes from.
+
+    pids() is called every poll and must be cheap; name() and path() are only
+    called for pids that were not there on the previous poll.
+    """
+
+    @abc.abstractmethod
+    def pids(self) -> Set[int]:
+        ...
+
+    @abc.abstractmethod
+    def name(self, pid: int) -> Optional[str]:
+        """Executable file name, e.g. "game.exe", or None if the process is gone."""
+
+    def path(self, pid: int) -> Optional[str]:
+        """Full executable path, or None if it cannot be read."""
+        return None
+
+
+class ProcfsSource(ProcessSource):
+    """Linux /proc."""
+
+    def __init__(self, root: str = "/proc"):
+        self.root = root
+
+    def pids(self) -> Set[int]:
+        with os.scandir(self.root) as it:
+            return {int(e.name) for e in it if e.name.isdigit()}
+
+    def name(self, pid: int) -> Optional[str]:
+        path = self.path(pid)
+        if path:
+            return os.path.basename(path)
+        try:  # Other users' processes: no exe link, comm is truncated to 15 characters
+            with open(os.path.join(self.root, str(pid), "comm"), encoding="utf-8", errors="replace") as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def path(self, pid: int) -> Optional[str]:
+        try:
+            return os.readlink(os.path.join(self.root, str(pid), "exe"))
+        except OSError:
+            return None
+
+
+class Toolhelp32Source(ProcessSource):
+    """Windows process snapshot (CreateToolhelp32Snapshot); names come with the snapshot."""
+
+    TH32CS_SNAPPROCESS = 0x00000002
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESSENTRY32W(ctypes.Structure):
+            _fields_ = [
+                ("dwSize", wintypes.DWORD),
+                ("cntUsage", wintypes.DWORD),
+                ("th32ProcessID", wintypes.DWORD),
+                ("th32DefaultHeapID", ctypes.c_size_t),
+                ("th32ModuleID", wintypes.DWORD),
+                ("cntThreads", wintypes.DWORD),
+                ("th32ParentProcessID", wintypes.DWORD),
+                ("pcPriClassBase", wintypes.LONG),
+                ("dwFlags", wintypes.DWORD),
+                ("szExeFile", wintypes.WCHAR * 260),
+            ]
+
+        self._ctypes = ctypes
+        self._kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        self._kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+        self._kernel32.OpenProcess.restype = wintypes.HANDLE
+        self._entry = PROCESSENTRY32W()
+        self._names: Dict[int, str] = {}
+
+    def pids(self) -> Set[int]:
+        kernel32, entry = self._kernel32, self._entry
+        snapshot = kernel32.CreateToolhelp32Snapshot(self.TH32CS_SNAPPROCESS, 0)
+        if snapshot in (None, -1, 0xFFFFFFFFFFFFFFFF, 0xFFFFFFFF):
+            raise OSError(self._ctypes.get_last_error(), "CreateToolhelp32Snapshot failed")
+        names = {}
+        try:
+            entry.dwSize = self._ctypes.sizeof(entry)
+            ok = kernel32.Process32FirstW(snapshot, self._ctypes.byref(entry))
+            while ok:
+                names[entry.th32ProcessID] = entry.szExeFile
+                ok = kernel32.Process32NextW(snapshot, self._ctypes.byref(entry))
+        finally:
+            kernel32.CloseHandle(snapshot)
+        self._names = names
+        return set(names)
+
+    def name(self, pid: int) -> Optional[str]:
+        return self._names.get(pid)
+
+    def path(self, pid: int) -> Optional[str]:
+        ctypes = self._ctypes
+        handle = self._kernel32.OpenProcess(self.PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return None
+        try:
+            size = ctypes.c_ulong(32768)
+            buffer = ctypes.create_unicode_buffer(size.value)
+            if not self._kernel32.QueryFullProcessImageNameW(handle, 0, buffer, ctypes.byref(size)):
+                return None
+            return buffer.value
+        finally:
+            self._kernel32.CloseHandle(handle)
+
+
+class FakeProcessSource(ProcessSource):
+    """In-memory process table for tests and benchmarks: start() and stop() processes by hand."""
+
+    def __init__(self):
+        self.processes: Dict[int, Tuple[str, Optional[str]]] = {}
+        self.lookups = 0  # name()/path() calls, for checking only new pids are resolved
+        self._next_pid = 1000
+
+    def start(self, name: str, path: Optional[str] = None, pid: Optional[int] = None) -> int:
+        if pid is None:
+            pid, self._next_pid = self._next_pid, self._next_pid + 4
+        self.processes[pid] = (name, path)
+        return pid
+
+    def stop(self, pid: int) -> None:
+        self.processes.pop(pid, None)
+
+    def pids(self) -> Set[int]:
+        return set(self.processes)
+
+    def name(self, pid: int) -> Optional[str]:
+        self.lookups += 1
+        return self.processes.get(pid, (None, None))[0]
+
+    def path(self, pid: int) -> Optional[str]:
+        self.lookups += 1
+        return self.processes.get(pid, (None, None))[1]
+
+
+def default_source() -> Optional[ProcessSource]:
+    """The platform's process source, or None if there is none."""
+    if sys.platform == "win32":
+        try:
+            return Toolhelp32Source()
+        except (OSError, AttributeError) as e:
+            logger.error(f"Process watcher unavailable: {e}")
+            return None
+    if os.path.isdir("/proc/self"):
+        return ProcfsSource()
+    return None
+
+
+class ProcessWatcher:
+    """
+    Turns successive process listings into started/exited events.
+
+    Only pids named in a rule are kept, so memory and per-poll Python work
+    follow the number of changes, not the number of processes.
+
+    Args:
+        source: Where processes come from
+        interesting: Lower-case executable names worth resolving; None for all
+    """
+
+    def __init__(self, source: ProcessSource, interesting: Optional[Set[str]] = None):
+        self.source = source
+        self.interesting = interesting
+        self._seen: Set[int] = set()
+        self.tracked: Dict[int, str] = {}  # pid -> lower-case name, interesting processes only
+        self.resolved = 0  # Processes named so far
+
+    def poll(self) -> Tuple[List[Tuple[int, str]], List[int]]:
+        """(started [(pid, lower-case name)], exited [pid]) since the last poll, tracked processes only."""
+        pids = self.source.pids()
+        new = pids - self._seen
+        exited = [pid for pid in self._seen - pids if self.tracked.pop(pid, None) is not None]
+        self._seen = pids
+        started = []
+        for pid in new:
+            name = self.source.name(pid)
+            self.resolved += 1
+            if not name:
+                continue
+            name = name.lower()
+            if self.interesting is None or name in self.interesting:
+                self.tracked[pid] = name
+                started.append((pid, name))
+        return started, exited
+
+    def reset(self) -> None:
+        """Treat every running process as new on the next poll, e.g. after the rules changed."""
+        self._seen = set()
+        self.tracked.clear()
+
+
+# Profiles
+class Profile(NamedTuple):
+    name: str
+    names: Tuple[str, ...]  # Lower-case executable names
+    paths: Tuple[str, ...]  # normcase'd full paths
+    settings: Dict[str, object]  # gsync/overlay: "ON"/"OFF", dlss: tuple of DLL paths
+
+    def executables(self) -> Set[str]:
+        # The watcher reports lower-case names; normcase leaves paths as written outside Windows
+        return set(self.names) | {os.path.basename(path).lower() for path in self.paths}
+
+
+def _on_off(value, field: str, profile: str) -> str:
+    if isinstance(value, bool):
+        return "ON" if value else "OFF"
+    if isinstance(value, str) and value.upper() in ("ON", "OFF"):
+        return value.upper()
+    raise ProfileError(f"{profile}: {field} must be \"on\" or \"off\"")
+
+
+def _normpath(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path))
+
+
+def parse_profiles(data) -> List[Profile]:
+    """Profiles from decoded profiles.json content. Raises ProfileError if malformed."""
+    if not isinstance(data, dict) or not isinstance(data.get("profiles", []), list):
+        raise ProfileError("expected {\"profiles\": [...]}")
+    profiles = []
+    for i, entry in enumerate(data.get("profiles", [])):
+        if not isinstance(entry, dict):
+            raise ProfileError(f"profile {i} is not an object")
+        name = str(entry.get("name") or f"profile {i}")
+        match = entry.get("match")
+        if isinstance(match, str):
+            match = [match]
+        if not match or not all(isinstance(m, str) and m for m in match):
+            raise ProfileError(f"{name}: match must list executable names or paths")
+        names = tuple(m.lower() for m in match if os.path.basename(m) == m)
+        paths = tuple(_normpath(m) for m in match if os.path.basename(m) != m)
+
+        settings: Dict[str, object] = {}
+        for field in ("gsync", "overlay"):
+            if entry.get(field) is not None:
+                settings[field] = _on_off(entry[field], field, name)
+        dlss = entry.get("dlss")
+        if dlss:
+            if isinstance(dlss, str):
+                dlss = [dlss]
+            settings["dlss"] = tuple(os.path.expandvars(p) for p in dlss)
+        profiles.append(Profile(name, names, paths, settings))
+    return profiles
+
+
+class ProfileStore:
+    """
+    profiles.json, re-read only when its mtime or size changes.
+
+    Args:
+        path: Defaults to <user data dir>/Settings.PROFILES_FILE
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(user_data_dir(), Settings.PROFILES_FILE)
+        self._stamp = None
+        self.profiles: List[Profile] = []
+
+    def load(self) -> bool:
+        """Reload if the file changed. Returns True if the profiles changed."""
+        try:
+            st = os.stat(self.path)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = None
+        if stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        if stamp is None:
+            profiles = []
+        else:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    profiles = parse_profiles(json.load(f))
+            except (OSError, ValueError, ProfileError) as e:
+                logger.error(f"Ignoring {self.path}: {e}")
+                profiles = []
+        self.profiles = profiles
+        logger.info(f"Loaded {len(profiles)} game profiles")
+        return True
+
+
+# Current state and how to change it
+def read_state() -> Dict[str, object]:
+    """
+    Current G-SYNC and overlay status ("ON"/"OFF") and active DLSS versions ({type: version}).
+
+    Reads the registry and nvngx_config.txt on every call; the window passes a
+    reader backed by its state store instead.
+    """
+    from core.registry import read_dlss_overlay_status, read_status
+    from core.ngx_inventory import NgxInventory
+    state: Dict[str, object] = {}
+    try:
+        state["gsync"] = read_status()
+    except OSError:
+        pass
+    try:
+        state["overlay"] = read_dlss_overlay_status()
+    except OSError:
+        pass
+    state["dlss"] = NgxInventory().active_versions()
+    return state
+
+
+def apply_changes(changes: Dict[str, object]) -> None:
+    """Apply changes synchronously: the wrapper for G-SYNC, the registry for the overlay, a swap for DLSS."""
+    if "gsync" in changes:
+        from core.executor import run_gsync_command
+        from core.registry import update_status_in_registry
+        option = 2 if changes["gsync"] == "ON" else 0
+        success, message = run_gsync_command(Settings.EXECUTABLE_PATH, option, timeout=Settings.COMMAND_TIMEOUT)
+        if success:
+            update_status_in_registry(option)
+        else:
+            logger.error(f"Profile G-SYNC {changes['gsync']} failed: {message}")
+    if "overlay" in changes:
+        from core.registry import update_dlss_overlay_in_registry
+        update_dlss_overlay_in_registry(1 if changes["overlay"] == "ON" else 0)
+    if "dlss" in changes:
+        from core.nvgxswap import update_nvngx_batch
+        update_nvngx_batch(list(changes["dlss"]))
+
+
+def dll_versions(paths: Iterable[str]) -> Dict[str, str]:
+    """{type: version} of DLLs, skipping unreadable ones."""
+    from core.dll_catalog import dll_type
+    from core.pe_version import PEError, read_dll_version
+    versions = {}
+    for path in paths:
+        kind = dll_type(path)
+        try:
+            if kind:
+                versions[kind] = read_dll_version(path).version_string
+        except (PEError, OSError) as e:
+            logger.error(f"Cannot read the version of {path}: {e}")
+    return versions
+
+
+class ProfileEngine:
+    """
+    Watches for games and keeps the system in the state their profile asks for.
+
+    The profile of the most recently started matching game wins. The state it
+    replaced is remembered and restored when no matching game is left (DLSS
+    DLLs are not swapped back). Only settings that differ from read_state()
+    are passed to apply.
+
+    poll() measures its own CPU time; interval_ms backs off up to
+    Settings.PROFILE_MAX_POLL_MS while the average poll costs more than
+    Settings.PROFILE_CPU_BUDGET of the interval, and returns once it is cheap again.
+
+    Args:
+        store: Profiles, reloaded on every poll if profiles.json changed
+        source: Process source, defaults to default_source()
+        read_state: Returns the current state, see read_state()
+        apply: Applies a {setting: value} dict, see apply_changes()
+    """
+
+    def __init__(self, store: Optional[ProfileStore] = None, source: Optional[ProcessSource] = None,
+                 read_state: Callable[[], Dict[str, object]] = read_state,
+                 apply: Callable[[Dict[str, object]], None] = apply_changes,
+                 interval_ms: int = Settings.PROFILE_POLL_MS,
+                 max_interval_ms: int = Settings.PROFILE_MAX_POLL_MS,
+                 cpu_budget: float = Settings.PROFILE_CPU_BUDGET):
+        self.store = store or ProfileStore()
+        # With no process source on this platform the watcher sees an empty table
+        self.watcher = ProcessWatcher(source or default_source() or FakeProcessSource())
+        self.read_state = read_state
+        self.apply = apply
+        self.base_interval_ms = self.interval_ms = interval_ms
+        self.max_interval_ms = max_interval_ms
+        self.cpu_budget = cpu_budget
+        self.poll_cpu_ms = 0.0  # Exponential average of one poll's CPU time
+        self.polls = 0
+        self._by_name: Dict[str, List[Profile]] = {}
+        self._running: Dict[int, Tuple[int, Profile]] = {}  # pid -> (start order, profile)
+        self._order = 0
+        self.active: Optional[Profile] = None
+        self._saved: Optional[Dict[str, object]] = None  # State to restore when the last game exits
+        self._dlss_versions: Dict[Tuple[str, ...], Dict[str, str]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """False while there are no profiles; the caller can stop polling, see poll()."""
+        return bool(self.store.profiles)
+
+    def _index(self) -> None:
+        self._by_name = {}
+        for profile in self.store.profiles:
+            for name in profile.executables():
+                self._by_name.setdefault(name, []).append(profile)
+        self.watcher.interesting = set(self._by_name)
+        self.watcher.reset()
+        self._running.clear()
+        self._dlss_versions.clear()
+
+    def _match(self, pid: int, name: str) -> Optional[Profile]:
+        candidates = self._by_name.get(name, ())
+        path = None
+        for profile in candidates:
+            if name in profile.names:
+                return profile
+            if path is None:
+                path = _normpath(self.watcher.source.path(pid) or "")
+            if path in profile.paths:
+                return profile
+        return None
+
+    def poll(self) -> Optional[Dict[str, object]]:
+        """One watcher step. Returns the changes applied, if any."""
+        started = time.thread_time()
+        try:
+            return self._poll()
+        finally:
+            cost_ms = (time.thread_time() - started) * 1000
+            self.polls += 1
+            self.poll_cpu_ms = cost_ms if self.polls == 1 else self.poll_cpu_ms * 0.8 + cost_ms * 0.2
+            self._adjust_interval()
+
+    def _poll(self) -> Optional[Dict[str, object]]:
+        if self.store.load():
+            self._index()
+        if not self.store.profiles:
+            return self._switch(None) if self.active is not None else None
+
+        launched, exited = self.watcher.poll()
+        for pid in exited:
+            self._running.pop(pid, None)
+        for pid, name in launched:
+            profile = self._match(pid, name)
+            if profile is not None:
+                self._order += 1
+                self._running[pid] = (self._order, profile)
+                logger.info(f"Game started: {name} (pid {pid}), profile {profile.name}")
+
+        latest = max(self._running.values(), key=lambda item: item[0])[1] if self._running else None
+        if latest is self.active:
+            return None
+        return self._switch(latest)
+
+    def _switch(self, profile: Optional[Profile]) -> Dict[str, object]:
+        current = self.read_state()
+        if profile is None:
+            target = self._saved or {}
+            logger.info(f"Profile {self.active.name} ended, restoring {target or 'nothing'}")
+            self._saved = None
+        else:
+            if self._saved is None:
+                self._saved = {}
+            for key in ("gsync", "overlay"):  # Another profile may take over; remember what it adds too
+                if key in profile.settings and key not in self._saved and key in current:
+                    self._saved[key] = current[key]
+            # What an earlier profile changed and this one leaves alone goes back as it was
+            target = {key: value for key, value in self._saved.items() if key not in profile.settings}
+            target.update(profile.settings)
+            logger.info(f"Applying profile {profile.name}")
+        self.active = profile
+
+        changes = {key: value for key, value in target.items()
+                   if key != "dlss" and current.get(key) != value}
+        if "dlss" in target:
+            dlls = target["dlss"]
+            if dlls not in self._dlss_versions:
+                self._dlss_versions[dlls] = dll_versions(dlls)
+            installed = current.get("dlss") or {}
+            if any(installed.get(kind) != version for kind, version in self._dlss_versions[dlls].items()):
+                changes["dlss"] = dlls
+        if changes:
+            self.apply(changes)
+        return changes
+
+    def _adjust_interval(self) -> None:
+        share = self.poll_cpu_ms / self.interval_ms
+        if share > self.cpu_budget and self.interval_ms < self.max_interval_ms:
+            self.interval_ms = min(self.interval_ms * 2, self.max_interval_ms)
+            logger.debug(f"Profile watcher over CPU budget, polling every {self.interval_ms} ms")
+        elif share < self.cpu_budget / 4 and self.interval_ms > self.base_interval_ms:
+            self.interval_ms = max(self.interval_ms // 2, self.base_interval_ms)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "profiles": len(self.store.profiles),
+            "active": self.active.name if self.active else None,
+            "polls": self.polls,
+            "poll_cpu_ms": round(self.poll_cpu_ms, 3),
+            "interval_ms": self.interval_ms,
+            "resolved": self.watcher.resolved,
+        }
@@ -0,0 +1,151 @@
+"""
+Registry Backend Module.
+Pluggable registry access: winreg with reused key handles, or a pure-Python in-memory registry.
+"""
+
+import abc
+import logging
+import threading
+from typing import Dict, Iterable, Tuple
+
+try:
+    import winreg
+except ImportError:  # Not on Windows, only the in-memory backend is usable
+    winreg = None
+
+logger = logging.getLogger(__name__)
+
+HKCU = "HKEY_CURRENT_USER"
+HKLM = "HKEY_LOCAL_MACHINE"
+REG_SZ = "REG_SZ"
+REG_DWORD = "REG_DWORD"
+
+
+class RegistryBackend(abc.ABC):
+    """
+    Interface every backend implements.
+
+    Missing keys raise FileNotFoundError from read_values; missing values are
+    simply absent from the returned dictionary.
+    """
+
+    @abc.abstractmethod
+    def read_values(self, hive: str, path: str, names: Iterable[str]) -> Dict[str, object]:
+        ...
+
+    @abc.abstractmethod
+    def write_value(self, hive: str, path: str, name: str, kind: str, value, create: bool = False) -> None:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class WinRegBackend(RegistryBackend):
+    """winreg backend keeping opened key handles around for reuse."""
+
+    def __init__(self):
+        if winreg is None:
+            raise OSError("winreg is not available on this platform")
+        self._hives = {HKCU: winreg.HKEY_CURRENT_USER, HKLM: winreg.HKEY_LOCAL_MACHINE}
+        self._kinds = {REG_SZ: winreg.REG_SZ, REG_DWORD: winreg.REG_DWORD}
+        self._handles: Dict[Tuple[str, str, str], object] = {}
+        self._lock = threading.Lock()
+
+    def _handle(self, hive: str, path: str, mode: str):
+        cache_key = (hive, path, mode)
+        handle = self._handles.get(cache_key)
+        if handle is None:
+            if mode == "create":
+                handle = winreg.CreateKey(self._hives[hive], path)
+            elif mode == "write":
+                handle = winreg.OpenKey(self._hives[hive], path, 0, winreg.KEY_SET_VALUE)
+            else:
+                handle = winreg.OpenKey(self._hives[hive], path, 0, winreg.KEY_READ)
+            self._handles[cache_key] = handle
+        return handle
+
+    def _drop(self, hive: str, path: str, mode: str) -> None:
+        handle = self._handles.pop((hive, path, mode), None)
+        if handle is not None:
+            try:
+                winreg.CloseKey(handle)
+            except OSError:
+                pass
+
+    def read_values(self, hive, path, names):
+        with self._lock:
+            handle = self._handle(hive, path, "read")
+            values = {}
+            for name in names:
+                try:
+                    values[name] = winreg.QueryValueEx(handle, name)[0]
+                except FileNotFoundError:
+                    continue
+                except OSError:
+                    # The key may have been deleted behind a cached handle
+                    self._drop(hive, path, "read")
+                    raise
+            return values
+
+    def write_value(self, hive, path, name, kind, value, create=False):
+        mode = "create" if create else "write"
+        with self._lock:
+            handle = self._handle(hive, path, mode)
+            try:
+                winreg.SetValueEx(handle, name, 0, self._kinds[kind], value)
+            except OSError:
+                self._drop(hive, path, mode)
+                raise
+
+    def close(self):
+        with self._lock:
+            for hive, path, mode in list(self._handles):
+                self._drop(hive, path, mode)
+
+
+class MemoryRegistryBackend(RegistryBackend):
+    """
+    Pure-Python registry for tests and benchmarks.
+
+    Args:
+        keys: Optional initial content as {(hive, path): {name: value}}
+        writable_hives: Hives that may be written without create=True,
+            mirroring HKLM needing administrator rights when empty
+    """
+
+    def __init__(self, keys: Dict[Tuple[str, str], Dict[str, object]] = None,
+                 writable_hives: Iterable[str] = (HKCU, HKLM)):
+        self.keys = {key: dict(values) for key, values in (keys or {}).items()}
+        self.writable_hives = set(writable_hives)
+        self.reads = 0
+        self.writes = 0
+        self._lock = threading.Lock()
+
+    def read_values(self, hive, path, names):
+        with self._lock:
+            self.reads += 1
+            key = self.keys.get((hive, path))
+            if key is None:
+                raise FileNotFoundError(f"{hive}\\{path}")
+            return {name: key[name] for name in names if name in key}
+
+    def write_value(self, hive, path, name, kind, value, create=False):
+        with self._lock:
+            if hive not in self.writable_hives:
+                raise PermissionError(f"Access is denied: {hive}\\{path}")
+            key = self.keys.get((hive, path))
+            if key is None:
+                if not create:
+                    raise FileNotFoundError(f"{hive}\\{path}")
+                key = self.keys[(hive, path)] = {}
+            self.writes += 1
+            key[name] = value
+
+
+def default_backend() -> RegistryBackend:
+    """winreg on Windows, an empty in-memory registry elsewhere."""
+    if winreg is not None:
+        return WinRegBackend()
+    logger.warning("winreg not available, using in-memory registry backend")
+    return MemoryRegistryBackend()
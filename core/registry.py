@@ -1,71 +1,201 @@
-import winreg as reg
+import atexit
+import logging
+import threading
+import time
+from typing import Dict, Iterable, Optional
 from resources.settings import Settings
+from core.regbackend import RegistryBackend, default_backend, HKCU, HKLM, REG_SZ, REG_DWORD
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class ValueNotFoundError(FileNotFoundError):
+    """The key exists but the value does not."""
+
+
+# Every value the app tracks, with the key it lives in
+TRACKED_VALUES = {
+    "GSyncStatus": (HKCU, Settings.REGISTRY_PATH),
+    "NvngxStatus": (HKCU, Settings.REGISTRY_PATH),
+    "ShowDlssIndicator": (HKLM, Settings.REGISTRY_PATH_DLSS),
+}
+
+
+class RegistryCache:
+    """
+    Cached, batched access to the tracked registry values.
+
+    Values are read together, one backend call per key, and served from
+    memory until they are written through this cache or invalidated.
+    Missing keys and values are cached too, as FileNotFoundError.
+    """
+
+    def __init__(self, backend: Optional[RegistryBackend] = None, tracked: Dict[str, tuple] = None):
+        self._backend = backend
+        self.explicit_backend = backend is not None  # False while using the platform default
+        self.tracked = dict(tracked or TRACKED_VALUES)
+        self._values: Dict[str, object] = {}
+        self._lock = threading.RLock()
+        self.latency: Dict[str, list] = {}  # op -> [calls, total seconds, max seconds]
+
+    @property
+    def backend(self) -> RegistryBackend:
+        if self._backend is None:
+            self._backend = default_backend()
+        return self._backend
+
+    def set_backend(self, backend: RegistryBackend) -> None:
+        with self._lock:
+            if self._backend is not None:
+                self._backend.close()
+            self._backend = backend
+            self.explicit_backend = True
+            self._values.clear()
+
+    def _record(self, op: str, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        stats = self.latency.setdefault(op, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] = max(stats[2], elapsed)
+        metrics.observe("registry_op_seconds", elapsed, op=op)
+
+    def latency_report(self) -> Dict[str, dict]:
+        """Per-operation call count, mean and max latency in milliseconds."""
+        return {
+            op: {"calls": calls, "mean_ms": total / calls * 1000, "max_ms": worst * 1000}
+            for op, (calls, total, worst) in self.latency.items()
+        }
+
+    def refresh(self, names: Optional[Iterable[str]] = None) -> None:
+        """Read the given (default: all tracked) values, one backend call per key."""
+        names = list(names) if names is not None else list(self.tracked)
+        by_key: Dict[tuple, list] = {}
+        for name in names:
+            by_key.setdefault(self.tracked[name], []).append(name)
+
+        with self._lock:
+            for (hive, path), key_names in by_key.items():
+                started = time.perf_counter()
+                try:
+                    values = self.backend.read_values(hive, path, key_names)
+                except OSError as e:
+                    metrics.inc("registry_errors_total", op="read", error=type(e).__name__)
+                    if isinstance(e, PermissionError):
+                        logger.error("PermissionError: Access is denied. Please run the application as an administrator.")
+                    elif not isinstance(e, FileNotFoundError):
+                        logger.error(f"An error occurred reading {hive}\\{path}: {e}")
+                    for name in key_names:
+                        self._values[name] = e
+                    continue
+                finally:
+                    self._record("read", started)
+                for name in key_names:
+                    self._values[name] = values.get(name, ValueNotFoundError(f"Value {name} not found"))
+
+    def read_all(self) -> Dict[str, object]:
+        """Return every tracked value (an exception instance for unreadable ones)."""
+        with self._lock:
+            missing = [name for name in self.tracked if name not in self._values]
+            if missing:
+                self.refresh(missing)
+            return dict(self._values)
+
+    def get(self, name: str):
+        """Return a tracked value, re-raising the error it was read with."""
+        with self._lock:
+            if name not in self._values:
+                # Fill the whole cache in the same pass
+                self.refresh([n for n in self.tracked if n not in self._values])
+            value = self._values[name]
+        if isinstance(value, BaseException):
+            # Raise a fresh copy so cached errors do not accumulate tracebacks
+            raise type(value)(*value.args)
+        return value
+
+    def set(self, name: str, kind: str, value, create: bool = False) -> None:
+        hive, path = self.tracked[name]
+        with self._lock:
+            started = time.perf_counter()
+            try:
+                self.backend.write_value(hive, path, name, kind, value, create=create)
+            except OSError as e:
+                metrics.inc("registry_errors_total", op="write", error=type(e).__name__)
+                self._values.pop(name, None)
+                raise
+            finally:
+                self._record("write", started)
+            self._values[name] = value
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        with self._lock:
+            if name is None:
+                self._values.clear()
+            else:
+                self._values.pop(name, None)
+
+    def close(self) -> None:
+        if self._backend is not None:
+            self._backend.close()
+
+
+# Process-wide registry cache
+registry_cache = RegistryCache()
+atexit.register(registry_cache.close)
+
+
+def load_registry() -> RegistryCache:
+    """The shared cache, for the "registry" capability. Unavailable without winreg unless a backend was set."""
+    from core.capabilities import CapabilityUnavailable
+    from core import regbackend
+    if regbackend.winreg is None and not registry_cache.explicit_backend:
+        raise CapabilityUnavailable("the Windows registry is not available on this platform")
+    registry_cache.refresh()
+    return registry_cache
 
 
 # Read the status of the GSync
 def read_status():
     try:
-        key = reg.OpenKey(reg.HKEY_CURRENT_USER, Settings.REGISTRY_PATH, 0, reg.KEY_READ)
-    except FileNotFoundError:
-        # If the key does not exist, return a default status
-        return "OFF"
-    except PermissionError:
-        print("PermissionError: Access is denied. Please run the application as an administrator.")
-        return "OFF"
-    except Exception as e:
-        print(f"An error occurred: {e}")
+        return registry_cache.get("GSyncStatus")
+    except ValueNotFoundError:
+        # The key exists but holds no status
+        raise
+    except OSError:
+        # If the key does not exist or is unreadable, return a default status
         return "OFF"
-    key = reg.OpenKey(reg.HKEY_CURRENT_USER, Settings.REGISTRY_PATH, 0, reg.KEY_READ)
-    status = reg.QueryValueEx(key, "GSyncStatus")[0]
-    reg.CloseKey(key)
-    return status
+
 # Update the status of the GSync
 def update_status_in_registry(option):
-    key = reg.CreateKey(reg.HKEY_CURRENT_USER, Settings.REGISTRY_PATH)
-    reg.SetValueEx(key, "GSyncStatus", 0, reg.REG_SZ, "ON" if option == 2 else "OFF")
-    reg.CloseKey(key)
+    registry_cache.set("GSyncStatus", REG_SZ, "ON" if option == 2 else "OFF", create=True)
 
 # Read DLSS Overlay status
 def read_dlss_overlay_status():
-    key = reg.OpenKey(reg.HKEY_LOCAL_MACHINE, Settings.REGISTRY_PATH_DLSS, 0, reg.KEY_READ)
-    status = reg.QueryValueEx(key, "ShowDlssIndicator")[0]
-    reg.CloseKey(key)
+    status = registry_cache.get("ShowDlssIndicator")
     return "ON" if status == 0x400 else "OFF"
 
 # Update DLSS Overlay status
 def update_dlss_overlay_in_registry(option):
     try:
-        key = reg.OpenKey(reg.HKEY_LOCAL_MACHINE, Settings.REGISTRY_PATH_DLSS, 0, reg.KEY_SET_VALUE)
-        reg.SetValueEx(key, "ShowDlssIndicator", 0, reg.REG_DWORD, 0x400 if option == 1 else 0x0)
-        reg.CloseKey(key)
+        registry_cache.set("ShowDlssIndicator", REG_DWORD, 0x400 if option == 1 else 0x0)
     except PermissionError:
-        print("PermissionError: Access is denied. Please run the application as an administrator.")
+        logger.error("PermissionError: Access is denied. Please run the application as an administrator.")
     except Exception as e:
-        print(f"An error occurred: {e}")
+        logger.error(f"An error occurred: {e}")
 
 # Read NVNGX status from the registry
 def read_nvngx_status() -> str:
     """
     Reads the NVNGX status from the Windows registry.
-    
+
     Returns:
         str: The status of NVNGX, either "ON" or "OFF".
     """
     try:
-        key = reg.OpenKey(reg.HKEY_CURRENT_USER, Settings.REGISTRY_PATH, 0, reg.KEY_READ)
-        status = reg.QueryValueEx(key, "NvngxStatus")[0]
-        reg.CloseKey(key)
-        return status
+        return registry_cache.get("NvngxStatus")
     except FileNotFoundError:
         return "OFF"
     except Exception as e:
-        print(f"An error occurred while reading NVNGX status: {e}")
+        logger.error(f"An error occurred while reading NVNGX status: {e}")
         return "OFF"
-
-
-
-
-
-
-
-
@@ -1,16 +1,18 @@
-from PyQt5 import QtWidgets, QtGui
+from PyQt5 import QtWidgets
 from PyQt5.QtCore import Qt
 from program.main_W import GSyncToggleApp
 from resources.settings import Settings
+from resources.assets import assets
 
 from program.settings_window import SettingsWindow
 
 import sys
-import os
 import logging
 import core.xmlEt as xl
+from core.logger import setup_logging
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+# Tray icon variant per G-SYNC state; anything else shows the plain icon
+TRAY_STATES = {"ON": "on", "OFF": "off", "ERROR": "error"}
 
 
 class GSyncToggleAppWithTray(GSyncToggleApp):
@@ -37,16 +39,14 @@ class GSyncToggleAppWithTray(GSyncToggleApp):
     def init_tray_icon(self):
         """Initialize the system tray icon and menu."""
         logging.debug("Initializing system tray icon")
-        icon_path = "gvico.ico"
-        if not os.path.exists(icon_path):
-            logging.warning(f"Tray icon '{icon_path}' not found. Using default icon.")
+        if not assets.available(Settings.ICON_PATH):
             QtWidgets.QMessageBox.warning(
-                None, "Warning", f"Tray icon '{icon_path}' not found. Using default icon."
+                None, "Warning", f"Tray icon '{Settings.ICON_PATH}' not found. Using default icon."
             )
-            tray_icon = QtWidgets.QSystemTrayIcon(self)
-            tray_icon.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_ComputerIcon))
-        else:
-            tray_icon = QtWidgets.QSystemTrayIcon(QtGui.QIcon(icon_path), self)
+        # Decoded and painted once here; state changes only swap cached icons
+        assets.preload(Settings.ICON_PATH)
+        tray_icon = QtWidgets.QSystemTrayIcon(assets.tray_icon(), self)
+        self._tray_state = None
 
         # Create the tray menu
         tray_menu = self.create_tray_menu()
@@ -60,6 +60,10 @@ class GSyncToggleAppWithTray(GSyncToggleApp):
         tray_icon.setToolTip(Settings.APP_TITLE)  # Tooltip overlay
         self.tray_icon = tray_icon
 
+        # Follow the state store instead of reading the registry
+        self.state.changed.connect(self.on_state_changed)
+        self.on_state_changed()
+
     def create_tray_menu(self):
         """Create and return the system tray menu."""
         logging.debug("Creating system tray menu")
@@ -67,18 +71,22 @@ class GSyncToggleAppWithTray(GSyncToggleApp):
 
         # Create actions
         show_action = QtWidgets.QAction("Show", self)
+        self.gsync_action = QtWidgets.QAction("G-SYNC", self)
+        self.gsync_action.setCheckable(True)
         settings_action = QtWidgets.QAction("Settings", self)
         about_action = QtWidgets.QAction("About", self)
         exit_action = QtWidgets.QAction("Exit", self)
 
         # Connect actions to methods
         show_action.triggered.connect(self.show)
+        self.gsync_action.triggered.connect(self.on_gsync_action)
         settings_action.triggered.connect(self.open_settings)
         about_action.triggered.connect(self.show_about)
         exit_action.triggered.connect(self.exit_application)
 
         # Add actions to the menu
         tray_menu.addAction(show_action)
+        tray_menu.addAction(self.gsync_action)
         tray_menu.addAction(settings_action)
         tray_menu.addAction(about_action)
         tray_menu.addSeparator()
@@ -89,7 +97,7 @@ class GSyncToggleAppWithTray(GSyncToggleApp):
     def closeEvent(self, event):
         """Override the close event to minimize to the system tray."""
         logging.debug("Handling close event")
-        if xl.loadCFG().get('closeOnTray') == 'false':
+        if not xl.config.get_bool('closeOnTray', default=True):
             logging.debug("Close on tray is disabled. Exiting application.")
             event.accept()
             self.exit_application()
@@ -101,24 +109,49 @@ class GSyncToggleAppWithTray(GSyncToggleApp):
                 self.tray_icon.showMessage(
                     "Application Minimized",
                     "The application is running in the system tray. Right-click the tray icon to manage.",
-                    QtGui.QIcon("gvico.ico") if os.path.exists("gvico.ico") else None,
+                    assets.icon(),
                     3000  # Duration in milliseconds
                 )
     
     def minimizeIfNeeded(self):
             """Minimize the application if configured."""
             logging.debug("Checking if minimize at launch is needed")
-            if xl.loadCFG().get('minimizeAtLaunch') == 'true':
+            if xl.config.get_bool('minimizeAtLaunch'):
                 logging.debug("Minimizing application at launch")
                 self.hide()
                 self.tray_icon.showMessage(
                     "Application Minimized",
                     "The application is running in the system tray. Right-click the tray icon to manage.",
-                    QtGui.QIcon("gvico.ico") if os.path.exists("gvico.ico") else None,
+                    assets.icon(),
                     3000  # Duration in milliseconds
             )
                         
 
+    def on_state_changed(self, key=None, value=None):
+        """Mirror the state store in the tray tooltip and the G-SYNC menu entry."""
+        gsync = self.state.get("gsync")
+        self.gsync_action.setChecked(gsync == "ON")
+        self.gsync_action.setEnabled(gsync in ("ON", "OFF"))
+        tray_state = TRAY_STATES.get(gsync)
+        if tray_state != self._tray_state:
+            self._tray_state = tray_state
+            self.tray_icon.setIcon(assets.tray_icon(tray_state))
+        lines = [Settings.APP_TITLE]
+        if gsync in ("ON", "OFF"):
+            lines.append(f"G-SYNC: {gsync}")
+        overlay = self.state.get("overlay")
+        if overlay in ("ON", "OFF"):
+            lines.append(f"DLSS Overlay: {overlay}")
+        gpu = self.state.get("gpu")
+        if gpu:
+            lines.append(gpu[0]["name"])
+        self.tray_icon.setToolTip("\n".join(lines))
+
+    def on_gsync_action(self, checked):
+        self.run_command(2 if checked else 0)
+        # Keep showing the confirmed state; the store flips it when the command succeeds
+        self.gsync_action.setChecked(self.state.get("gsync") == "ON")
+
     def on_tray_icon_activated(self, reason):
         """Handle interactions with the tray icon."""
         logging.debug(f"Tray icon activated with reason: {reason}")
@@ -126,16 +159,32 @@ class GSyncToggleAppWithTray(GSyncToggleApp):
             self.showNormal()
             self.activateWindow()
 
+    def handle_instance_command(self, command):
+        """Run a command forwarded by a second launch, e.g. ["gsync", "on"]."""
+        logging.debug(f"Instance command: {command}")
+        if command == ["show"]:
+            self.showNormal()
+            self.raise_()
+            self.activateWindow()
+        elif command[:1] == ["gsync"] and len(command) == 2:
+            self.run_command(2 if command[1] == "on" else 0)
+        elif command == ["refresh"]:
+            self.runRefreshWhenOn()
+        else:
+            logging.warning(f"Unknown instance command: {command}")
+
     def exit_application(self):
         """Properly close the application."""
         logging.debug("Exiting application")
+        self.executor.shutdown()  # Kill a hung wrapper instead of waiting on it
+        self.telemetry.stop()
         self.tray_icon.hide()
         QtWidgets.QApplication.quit()
 
     def open_settings(self):
         """Open the settings window."""
         logging.debug("Opening settings window")
-        settings_dialog = SettingsWindow(self)
+        settings_dialog = SettingsWindow(self, inventory=self.ngx_inventory)
         settings_dialog.exec_()
 
     def show_about(self):
@@ -153,6 +202,7 @@ class GSyncToggleAppWithTray(GSyncToggleApp):
 
 # Run the application
 if __name__ == "__main__":
+    setup_logging()
     logging.debug("Starting application")
     app = QtWidgets.QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)  # Ensure the app runs even when all windows are closed
@@ -0,0 +1,220 @@
+"""
+GPU Telemetry Module.
+Streams GPU samples from one long-running nvidia-smi process into fixed-size ring buffers.
+"""
+
+import subprocess
+import threading
+import time
+import logging
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional
+from resources.settings import Settings
+from core.ckGpu import find_nvidia_smi
+
+logger = logging.getLogger(__name__)
+
+# Order matches the --query-gpu field list after the index
+METRICS = ("load", "memoryUsed", "memoryFree", "temperature")
+QUERY_FIELDS = ("index", "utilization.gpu", "memory.used", "memory.free", "temperature.gpu")
+
+NAN = float("nan")
+
+
+class RingBuffer:
+    """Fixed-capacity ring of floats stored in a preallocated array."""
+
+    __slots__ = ("capacity", "_data", "_next", "count")
+
+    def __init__(self, capacity: int, typecode: str = "f"):
+        self.capacity = capacity
+        self._data = array(typecode, [NAN]) * capacity
+        self._next = 0
+        self.count = 0
+
+    def append(self, value: float) -> None:
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def values(self) -> List[float]:
+        """Samples in chronological order."""
+        if self.count < self.capacity:
+            return self._data[:self.count].tolist()
+        return self._data[self._next:].tolist() + self._data[:self._next].tolist()
+
+    @property
+    def latest(self) -> Optional[float]:
+        if not self.count:
+            return None
+        return self._data[self._next - 1]
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.itemsize * self.capacity
+
+
+def open_smi(interval_ms: int, smi_path: Optional[str] = None) -> Optional[subprocess.Popen]:
+    """Start one nvidia-smi process printing a CSV line every interval_ms, or None without nvidia-smi."""
+    smi = smi_path or find_nvidia_smi()
+    if not smi:
+        logger.info("nvidia-smi not found, GPU telemetry disabled")
+        return None
+    return subprocess.Popen(
+        [smi, f"--query-gpu={','.join(QUERY_FIELDS)}", "--format=csv,noheader,nounits", f"-lms={interval_ms}"],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, bufsize=1,
+        creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+    )
+
+
+def _parse_value(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return NAN  # "[N/A]" and friends
+
+
+class TelemetrySampler:
+    """
+    Background sampler feeding per-GPU, per-metric ring buffers.
+
+    Args:
+        source: Callable returning an iterable of CSV lines in QUERY_FIELDS
+            order; defaults to a live nvidia-smi process, which stop() kills.
+            Tests pass a fake.
+        interval_ms: Requested sample interval; samples arriving faster
+            than half of it are dropped so a misbehaving source cannot
+            raise the rate
+        capacity: Samples kept per GPU and metric
+        max_gpus: GPUs tracked at most; memory is bounded by
+            max_gpus * capacity * (len(METRICS) * 4 + 8) bytes
+    """
+
+    def __init__(self, source: Optional[Callable[[], Iterable[str]]] = None,
+                 interval_ms: int = Settings.TELEMETRY_INTERVAL_MS,
+                 capacity: int = Settings.TELEMETRY_CAPACITY, max_gpus: int = 4):
+        self.interval_ms = interval_ms
+        self.capacity = capacity
+        self.max_gpus = max_gpus
+        self.source = source or self._smi_lines
+        self.buffers: Dict[int, Dict[str, RingBuffer]] = {}
+        self.version = 0  # Bumped on every accepted sample, lets views skip repaints
+        self.samples = 0
+        self.dropped = 0
+        self.parse_seconds = 0.0
+        self._last_sample: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._proc: Optional[subprocess.Popen] = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def memory_ceiling(self) -> int:
+        return self.max_gpus * self.capacity * (len(METRICS) * array("f").itemsize + array("d").itemsize)
+
+    @property
+    def parse_cost_us(self) -> float:
+        """Mean parse time per line in microseconds."""
+        lines = self.samples + self.dropped
+        return self.parse_seconds / lines * 1e6 if lines else 0.0
+
+    def start(self) -> None:
+        if self.running:
+            if not self._stop.is_set():
+                return
+            self._thread.join(timeout=1)  # A stopped sampler exits once its process is killed
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="GpuTelemetry", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and kill nvidia-smi; also safe to call while the thread waits for a line."""
+        self._stop.set()
+        with self._lock:
+            proc, self._proc = self._proc, None
+        self._kill(proc)
+
+    @staticmethod
+    def _kill(proc: Optional[subprocess.Popen]) -> None:
+        if proc is None:
+            return
+        try:
+            proc.kill()
+            proc.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+
+    def _smi_lines(self) -> Iterable[str]:
+        proc = open_smi(self.interval_ms)
+        if proc is None:
+            return ()
+        with self._lock:
+            self._proc = proc
+        if self._stop.is_set():  # stop() ran before the handle was published
+            self.stop()
+        return proc.stdout
+
+    def _run(self) -> None:
+        try:
+            for line in self.source():
+                if self._stop.is_set():
+                    break
+                self.feed(line)
+        except Exception as e:
+            if not self._stop.is_set():
+                logger.error(f"GPU telemetry stream failed: {e}")
+        finally:
+            with self._lock:
+                proc = self._proc if self._proc is not None and self._thread is threading.current_thread() else None
+                if proc is not None:
+                    self._proc = None
+            self._kill(proc)
+
+    def feed(self, line: str, now: Optional[float] = None) -> bool:
+        """Parse one CSV line and store it. Returns whether the sample was kept."""
+        started = time.perf_counter()
+        fields = line.split(",")
+        if len(fields) != len(QUERY_FIELDS):
+            self.parse_seconds += time.perf_counter() - started
+            return False
+        try:
+            index = int(fields[0])
+        except ValueError:
+            self.parse_seconds += time.perf_counter() - started
+            return False
+        values = [_parse_value(field) for field in fields[1:]]
+        now = time.monotonic() if now is None else now
+
+        with self._lock:
+            last = self._last_sample.get(index)
+            if index >= self.max_gpus or (last is not None and (now - last) * 1000 < self.interval_ms / 2):
+                self.dropped += 1
+                self.parse_seconds += time.perf_counter() - started
+                return False
+            buffers = self.buffers.get(index)
+            if buffers is None:
+                buffers = self.buffers[index] = {name: RingBuffer(self.capacity) for name in METRICS}
+                buffers["time"] = RingBuffer(self.capacity, "d")
+            for name, value in zip(METRICS, values):
+                buffers[name].append(value)
+            buffers["time"].append(now)
+            self._last_sample[index] = now
+            self.samples += 1
+            self.version += 1
+        self.parse_seconds += time.perf_counter() - started
+        return True
+
+    def series(self, gpu: int, metric: str) -> List[float]:
+        with self._lock:
+            buffers = self.buffers.get(gpu)
+            return buffers[metric].values() if buffers else []
+
+    def latest(self, gpu: int, metric: str) -> Optional[float]:
+        with self._lock:
+            buffers = self.buffers.get(gpu)
+            return buffers[metric].latest if buffers else None
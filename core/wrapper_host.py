@@ -0,0 +1,178 @@
+"""
+Wrapper Host Module.
+Keeps a long-lived G-SYNC helper process and talks to it over its stdin/stdout pipes.
+
+Protocol (UTF-8, one line per message):
+    helper -> host   READY                     once, after start-up
+    host -> helper   <seq> <option>            apply option (0, 1 or 2)
+    helper -> host   <seq> <code> <message>    code 0 means success
+
+Any helper executable that speaks this protocol can be configured through
+Settings.WRAPPER_HELPER. If it cannot be started, dies, or stops answering,
+callers fall back to spawning the one-shot wrapper.
+"""
+
+import os
+import queue
+import subprocess
+import threading
+import logging
+from typing import Callable, List, Optional, Tuple
+from resources.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class HostUnavailable(Exception):
+    """The helper process could not be started or stopped answering."""
+
+
+class WrapperHost:
+    """
+    Client side of the helper protocol.
+
+    Args:
+        command: Helper command line
+        start_timeout: Seconds to wait for READY
+        max_restarts: Consecutive failed starts before the host gives up for good
+    """
+
+    def __init__(self, command: List[str], start_timeout: float = 5.0, max_restarts: int = 3):
+        self.command = command
+        self.start_timeout = start_timeout
+        self.max_restarts = max_restarts
+        self._proc: Optional[subprocess.Popen] = None
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._seq = 0
+        self._failures = 0
+        self._lock = threading.Lock()
+
+    @property
+    def disabled(self) -> bool:
+        return self._failures >= self.max_restarts
+
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def _reader(self, proc: subprocess.Popen, lines: queue.Queue) -> None:
+        for line in proc.stdout:
+            lines.put(line.rstrip("\r\n"))
+        lines.put(None)  # EOF, the helper exited
+
+    def _start(self) -> None:
+        if self.disabled:
+            raise HostUnavailable("helper disabled after repeated failures")
+        self._lines = queue.Queue()
+        try:
+            self._proc = subprocess.Popen(
+                self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                text=True, bufsize=1, creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+            )
+        except OSError as e:
+            self._failures += 1
+            raise HostUnavailable(f"failed to start helper: {e}")
+
+        threading.Thread(target=self._reader, args=(self._proc, self._lines),
+                         name="WrapperHostReader", daemon=True).start()
+        try:
+            line = self._lines.get(timeout=self.start_timeout)
+        except queue.Empty:
+            line = None
+        if line != "READY":
+            self._failures += 1
+            self.kill()
+            raise HostUnavailable(f"helper did not report READY (got {line!r})")
+        self._failures = 0
+        logger.info(f"Wrapper helper started (pid {self._proc.pid})")
+
+    def run(self, option: int, timeout: Optional[float] = None,
+            on_start: Optional[Callable[[subprocess.Popen], None]] = None) -> Tuple[bool, str]:
+        """
+        Send one command and wait for its answer.
+
+        Raises:
+            HostUnavailable: If the helper is unusable; the command can be re-sent elsewhere.
+        """
+        with self._lock:
+            if not self.alive:
+                if self._proc is not None:
+                    logger.warning("Wrapper helper died, restarting it")
+                self._start()
+            if on_start is not None:
+                on_start(self._proc)
+
+            self._seq += 1
+            try:
+                self._proc.stdin.write(f"{self._seq} {option}\n")
+                self._proc.stdin.flush()
+            except OSError as e:
+                self.kill()
+                raise HostUnavailable(f"helper pipe closed: {e}")
+
+            while True:
+                try:
+                    line = self._lines.get(timeout=timeout)
+                except queue.Empty:
+                    self.kill()
+                    return False, f"Command timed out after {timeout} s"
+                if line is None:
+                    # Options set an absolute state, so re-applying through the fallback is safe
+                    self._proc = None
+                    raise HostUnavailable("helper exited while applying the command")
+                seq, _, rest = line.partition(" ")
+                if seq != str(self._seq):
+                    continue  # Stale answer to a command that timed out
+                code, _, message = rest.partition(" ")
+                if code == "0":
+                    return True, f"G-SYNC {'ON' if option == 2 else 'OFF'} applied!"
+                return False, f"Command failed: {message}"
+
+    def kill(self) -> None:
+        if self._proc is not None:
+            try:
+                self._proc.kill()
+            except OSError:
+                pass
+            self._proc = None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._proc is not None:
+                try:
+                    self._proc.stdin.close()
+                    self._proc.wait(timeout=1)
+                except (OSError, subprocess.TimeoutExpired):
+                    pass
+            self.kill()
+
+
+def make_host_runner(host: WrapperHost, fallback: Callable) -> Callable:
+    """
+    Build a runner with run_gsync_command's signature that prefers the helper.
+
+    Args:
+        host: Helper client
+        fallback: One-shot runner used when the helper is unavailable
+    """
+    def runner(gswdll, option, timeout=None, on_start=None, cancelled=None):
+        if not host.disabled:
+            try:
+                return host.run(option, timeout=timeout, on_start=on_start)
+            except HostUnavailable as e:
+                # Cancelling kills the helper, which looks the same as a crash from here
+                if cancelled is not None and cancelled():
+                    return False, "Command cancelled"
+                logger.warning(f"Wrapper helper unavailable ({e}), spawning the wrapper instead")
+        return fallback(gswdll, option, timeout=timeout, on_start=on_start, cancelled=cancelled)
+
+    runner.host = host
+    return runner
+
+
+def helper_command() -> Optional[List[str]]:
+    """The configured helper command line, or None when helper mode is off."""
+    helper = Settings.WRAPPER_HELPER
+    if not helper or not os.path.exists(helper):
+        return None
+    return [os.path.abspath(helper), *Settings.WRAPPER_HELPER_ARGS]
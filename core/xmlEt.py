@@ -1,20 +1,206 @@
+"""
+Config Store Module.
+Process-wide cache of config.xml with change notifications and atomic, debounced writes.
+"""
+
+import atexit
+import logging
+import os
+import tempfile
+import threading
 import xml.etree.ElementTree as ET
+from typing import Callable, Dict, List, Optional, Tuple
+from resources.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+_TRUE_VALUES = ("true", "1", "yes", "on")
+
+
+class ConfigStore:
+    """
+    Parses config.xml once and serves values from memory.
+
+    The file is re-parsed only when its mtime or size changes. set() updates
+    memory immediately and notifies subscribers; the file write is coalesced
+    into a single atomic write (temp file + rename) after `debounce` seconds
+    on a timer thread, so callers on the GUI thread never wait on disk.
+    """
+
+    def __init__(self, path: str = Settings.CONFIG_FILE, debounce: float = Settings.CONFIG_WRITE_DEBOUNCE):
+        self.path = path
+        self.debounce = debounce
+        self._lock = threading.RLock()
+        self._tree: Optional[ET.ElementTree] = None
+        self._values: Dict[str, Optional[str]] = {}
+        self._signature: Optional[Tuple[int, int]] = None
+        self._dirty = False
+        self._timer: Optional[threading.Timer] = None
+        self._subscribers: List[Callable[[str, Optional[str]], None]] = []
+
+    # Change notifications
+    def subscribe(self, callback: Callable[[str, Optional[str]], None]) -> None:
+        """Register callback(key, value), called whenever a value changes in memory or on disk."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[str, Optional[str]], None]) -> None:
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _notify(self, changes: Dict[str, Optional[str]]) -> None:
+        for key, value in changes.items():
+            for callback in list(self._subscribers):
+                try:
+                    callback(key, value)
+                except Exception:
+                    logger.exception(f"Config subscriber failed for '{key}'")
+
+    # Loading
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _revalidate(self) -> None:
+        """Re-parse the file if it changed on disk since we last read or wrote it."""
+        with self._lock:
+            signature = self._stat()
+            if self._tree is not None and (signature == self._signature or self._dirty):
+                # Pending in-memory writes win over external edits
+                return
+
+            if signature is None:
+                tree = ET.ElementTree(ET.Element("config"))
+            else:
+                try:
+                    tree = ET.parse(self.path)
+                except ET.ParseError as e:
+                    logger.error(f"Failed to parse {self.path}: {e}")
+                    if self._tree is not None:
+                        self._signature = signature
+                        return
+                    tree = ET.ElementTree(ET.Element("config"))
+
+            values = {child.tag: child.text for child in tree.getroot()}
+            changes = {}
+            if self._tree is not None:
+                changes = {key: value for key, value in values.items() if self._values.get(key) != value}
+                changes.update({key: None for key in self._values if key not in values})
+
+            self._tree = tree
+            self._values = values
+            self._signature = signature
+
+        if changes:
+            self._notify(changes)
+
+    # Access
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        self._revalidate()
+        value = self._values.get(key)
+        return default if value is None else value
+
+    def get_bool(self, key: str, default: bool = False) -> bool:
+        value = self.get(key)
+        if value is None:
+            return default
+        return value.strip().lower() in _TRUE_VALUES
+
+    def set(self, key: str, value: str) -> None:
+        """Update a value in memory and schedule a debounced write."""
+        self._revalidate()
+        with self._lock:
+            if self._values.get(key) == value:
+                return
+            root = self._tree.getroot()
+            element = root.find(key)
+            if element is None:
+                element = ET.SubElement(root, key)
+            element.text = value
+            self._values[key] = value
+            self._schedule_write()
+        self._notify({key: value})
+
+    def set_bool(self, key: str, value: bool) -> None:
+        self.set(key, "true" if value else "false")
+
+    @property
+    def root(self) -> ET.Element:
+        self._revalidate()
+        return self._tree.getroot()
+
+    def replace_root(self, root: ET.Element) -> None:
+        with self._lock:
+            old_values = self._values
+            self._tree = ET.ElementTree(root)
+            self._values = {child.tag: child.text for child in root}
+            changes = {key: value for key, value in self._values.items() if old_values.get(key) != value}
+            self._schedule_write()
+        self._notify(changes)
+
+    # Writing
+    def _schedule_write(self) -> None:
+        self._dirty = True
+        if self._timer is not None:
+            self._timer.cancel()
+        if self.debounce <= 0:
+            self._timer = None
+            self.flush()
+            return
+        self._timer = threading.Timer(self.debounce, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self) -> None:
+        """Write pending changes now, atomically."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp_path = tempfile.mkstemp(prefix=".config-", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    self._tree.write(f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.error(f"Failed to write {self.path}: {e}")
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                return
+            self._dirty = False
+            self._signature = self._stat()
+
+
+# Process-wide config store
+config = ConfigStore()
+atexit.register(config.flush)
+
 
 class loadCFG():
+    """Compatibility wrapper around the shared ConfigStore."""
+
     def __init__(self):
-        self.tree = ET.parse('config.xml')
-        self.root = self.tree.getroot()
+        self.store = config
 
     def get(self, key):
-        return self.root.find(key).text
+        return self.store.get(key)
 
     def set(self, key, value):
-        self.root.find(key).text = value
-        self.tree.write('config.xml')
+        self.store.set(key, value)
 
     def getall(self):
-        return self.root
+        return self.store.root
 
     def setall(self, data):
-        self.root = data
-        self.tree.write('config.xml')
\ No newline at end of file
+        self.store.replace_root(data)
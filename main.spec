@@ -5,7 +5,7 @@ a = Analysis(
     ['ss_launch.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[('gvico.ico', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
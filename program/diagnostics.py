@@ -0,0 +1,103 @@
+from PyQt5 import QtWidgets, QtCore
+from core.metrics import metrics
+from core.capabilities import capabilities
+from program.themes import theme
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# File dialog filter -> (metrics.export format, extensions; the first is appended when missing)
+EXPORT_FILTERS = {
+    "Prometheus text (*.prom *.txt)": ("prometheus", (".prom", ".txt")),
+    "JSON (*.json)": ("json", (".json",)),
+}
+
+
+class DiagnosticsPanel(QtWidgets.QWidget):
+    """
+    Operation latencies and counters from core.metrics, plus backend availability.
+
+    The text is rebuilt once a second, and only while the tab is visible.
+    """
+
+    def __init__(self, refresh_ms=1000, parent=None):
+        super().__init__(parent)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.view = QtWidgets.QPlainTextEdit(self)
+        self.view.setReadOnly(True)
+        self.view.setUndoRedoEnabled(False)
+        self.view.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+        theme.set_role(self.view, "log")
+        layout.addWidget(self.view)
+
+        buttons = QtWidgets.QHBoxLayout()
+        export_button = QtWidgets.QPushButton("Export...")
+        export_button.clicked.connect(self.export)
+        reset_button = QtWidgets.QPushButton("Reset")
+        reset_button.clicked.connect(self.reset)
+        buttons.addWidget(export_button)
+        buttons.addWidget(reset_button)
+        layout.addLayout(buttons)
+
+        self._text = None
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(refresh_ms)
+        self._timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self._timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        if not metrics.enabled:
+            lines = ["Metrics are disabled (SWAPSPECTRA_METRICS=0)."]
+        else:
+            lines = metrics.summary_lines() or ["No operations recorded yet."]
+        lines += ["", "Backends:"] + [f"  {line}" for line in capabilities.report_lines()]
+        text = "\n".join(lines)
+        if text != self._text:  # Keeps the scroll position while nothing changes
+            self._text = text
+            self.view.setPlainText(text)
+
+    def export(self):
+        path, selected = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Export metrics", "swapspectra_metrics", ";;".join(EXPORT_FILTERS),
+        )
+        if not path:
+            return
+        path, fmt = export_target(path, selected)
+        try:
+            metrics.export(path, fmt)
+            logger.info(f"Metrics exported to {path}")
+        except OSError as e:
+            QtWidgets.QMessageBox.critical(self, "Error", f"Could not export metrics: {e}")
+
+    def reset(self):
+        metrics.reset()
+        self.refresh()
+
+
+def export_target(path, selected_filter):
+    """
+    File path and format for an export, following the filter picked in the dialog.
+
+    A missing extension, or one belonging to the other format, is replaced by
+    the selected format's; with no known filter the extension decides.
+    """
+    if selected_filter not in EXPORT_FILTERS:
+        return path, None
+    fmt, extensions = EXPORT_FILTERS[selected_filter]
+    root, ext = os.path.splitext(path)
+    if ext.lower() not in extensions:
+        known = {e for _, exts in EXPORT_FILTERS.values() for e in exts}
+        path = (root if ext.lower() in known else path) + extensions[0]
+    return path, fmt
@@ -0,0 +1,105 @@
+from PyQt5 import QtWidgets, QtCore
+from resources.settings import Settings
+
+import collections
+import logging
+import threading
+
+# Logger whose records appear in the log viewer; it propagates to the log file
+UI_LOGGER_NAME = "SwapSpectra"
+
+
+class LogBuffer:
+    """
+    Fixed-capacity, thread-safe ring buffer of log lines.
+
+    `lines` keeps the most recent `capacity` lines; `take_pending` hands out
+    what arrived since the last call, also capped at `capacity`.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.lines = collections.deque(maxlen=capacity)
+        self._pending = collections.deque(maxlen=capacity)
+        self._dropped = 0
+        self._lock = threading.Lock()
+
+    def append(self, line):
+        with self._lock:
+            if len(self._pending) == self.capacity:
+                self._dropped += 1
+            self.lines.append(line)
+            self._pending.append(line)
+
+    def take_pending(self):
+        """Return (new lines, number of lines that overflowed before being shown)."""
+        with self._lock:
+            pending = list(self._pending)
+            dropped = self._dropped
+            self._pending.clear()
+            self._dropped = 0
+        return pending, dropped
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.lines)
+
+
+class BufferHandler(logging.Handler):
+    """Logging handler writing formatted records into a LogBuffer. Safe from any thread."""
+
+    def __init__(self, buffer):
+        super().__init__()
+        self.buffer = buffer
+
+    def emit(self, record):
+        try:
+            self.buffer.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+class LogViewer(QtWidgets.QPlainTextEdit):
+    """
+    Read-only log view fed from a LogBuffer.
+
+    New lines are appended in one batch per timer tick and the document is
+    capped at the buffer capacity, so memory stays flat and the cost of an
+    append does not grow with the session length.
+    """
+
+    def __init__(self, max_lines=Settings.LOG_VIEWER_MAX_LINES,
+                 flush_interval=Settings.LOG_VIEWER_FLUSH_MS, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setMaximumBlockCount(max_lines)
+        self.setUndoRedoEnabled(False)
+        self.buffer = LogBuffer(max_lines)
+
+        self.handler = BufferHandler(self.buffer)
+        self.handler.setFormatter(logging.Formatter("%(message)s"))
+        ui_logger = logging.getLogger(UI_LOGGER_NAME)
+        ui_logger.setLevel(logging.INFO)  # Independent of the root logger's level
+        ui_logger.addHandler(self.handler)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(flush_interval)
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+
+    def flush(self):
+        lines, dropped = self.buffer.take_pending()
+        if not lines:
+            return
+        if dropped:
+            lines.insert(0, f"... {dropped} older lines skipped ...")
+        scrollbar = self.verticalScrollBar()
+        at_bottom = scrollbar.value() == scrollbar.maximum()
+        self.appendPlainText("\n".join(lines))
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def detach(self):
+        """Stop receiving records, e.g. before the widget is destroyed."""
+        logging.getLogger(UI_LOGGER_NAME).removeHandler(self.handler)
+        self._timer.stop()
@@ -1,39 +1,92 @@
 from PyQt5 import QtWidgets, QtGui, QtCore
-from core.executor import run_gsync_command
-from core.registry import read_status, update_status_in_registry, read_dlss_overlay_status, update_dlss_overlay_in_registry
+from core.executor import CommandExecutor
 from core.logger import setup_logging
-from core.ckGpu import GPUname
-from core.nvgxswap import update_nvngx
-from core.nvapi_init import initialize_nvapi
+from core.profiler import startup_profiler
+from core.capabilities import CapabilityUnavailable, capabilities
 from resources.settings import Settings, format_text
-from program.themes import Themes
+from program.themes import theme
+from resources.assets import assets
+from core.xmlEt import config
 from program.settings_window import SettingsWindow
+from program.refresh import GSyncRefresher
+from program.state_store import StateStore, ERROR, MISSING, UNAVAILABLE
+from program.log_viewer import LogViewer, UI_LOGGER_NAME
+from program.diagnostics import DiagnosticsPanel
+from program.sparkline import SparklinePanel
+from core.telemetry import TelemetrySampler
+from core.dll_catalog import DllCatalog
+from core.ngx_inventory import NgxInventory
+from program.ngx_watcher import NgxModelsWatcher
+from core.profiles import ProfileEngine
 from core.elevation import is_admin, elevate
 
 
 
 
+import collections
 import logging
+import threading
 import time
 
+ui_logger = logging.getLogger(UI_LOGGER_NAME)
+
 
 # Main application class for G-SYNC Toggle - Order run is important
 class GSyncToggleApp(QtWidgets.QWidget):
+    # Emitted from the GPU probe thread, delivered on the GUI thread
+    gpu_info_ready = QtCore.pyqtSignal(object)
+    # Emitted from the command worker with a CommandResult
+    command_finished = QtCore.pyqtSignal(object)
+    # Emitted from the DLSS swap worker: percent copied, then (success, error)
+    swap_progress = QtCore.pyqtSignal(int)
+    swap_finished = QtCore.pyqtSignal(bool, str)
+    # Emitted from a profile's DLSS swap thread: (profile name, success)
+    profile_swap_finished = QtCore.pyqtSignal(str, bool)
+
     def __init__(self):
         super().__init__()
         self.gswdll = Settings.EXECUTABLE_PATH
+        self.gpu_info = None
+        self._gpu_probe_started = None
+        self.state = StateStore(parent=self)
+        self.state.gsync_changed.connect(self.on_gsync_state)
+        self.state.overlay_changed.connect(self.on_overlay_state)
+        self.state.gpu_changed.connect(self.on_gpu_state)
+        self.executor = CommandExecutor(self.gswdll, on_result=self.command_finished.emit)
+        self.command_finished.connect(self.on_command_finished)
+        self.refresher = GSyncRefresher(self.executor, parent=self)
+        self.refresher.progress.connect(self.logInfo)
+        self.refresher.finished.connect(self.on_refresh_finished)
+        self._swap_cancel = None
+        # One DLSS swap at a time, manual or from a profile: (DLL paths, profile name or None)
+        self._swap_busy = False
+        self._swap_queue = collections.deque()
+        self.swap_finished.connect(self.on_swap_finished)
+        self._quiet_options = set()  # G-SYNC options queued by a profile, reported in the log only
+        self.profile_swap_finished.connect(self.on_profile_swap_finished)
         setup_logging()
-        self.init_ui()
-        self.checkNV()
+        with startup_profiler.phase("init_ui"):
+            self.init_ui()
+        self.start_gpu_probe()
         '''self.init_nvapi()'''  # Under construction, not needed for now
-        self.checkGvLib()
-        self.detect_current_status()
-        self.detect_dlss_overlay_status()
+        QtCore.QTimer.singleShot(0, self.checkGvLib)  # Loads the CLR bridge once the window is up
+        with startup_profiler.phase("detect_current_status"):
+            self.detect_current_status()
+        with startup_profiler.phase("detect_dlss_overlay_status"):
+            self.detect_dlss_overlay_status()
+        self.state.refresh_nvngx()  # Same registry key as G-SYNC, already cached
+        self.dll_catalog = DllCatalog()
+        self.ngx_inventory = NgxInventory()
+        self.ngx_watcher = NgxModelsWatcher(self.ngx_inventory, parent=self)
+        self.ngx_watcher.changed.connect(self.on_ngx_models_changed)
+        self._ngx_models_summary = None
+        QtCore.QTimer.singleShot(Settings.DLSS_CATALOG_SCAN_DELAY_MS, self.start_catalog_scan)
+        self.start_profile_watcher()
         
     def init_ui(self):  # Initialize the UI components
         self.setWindowTitle(Settings.APP_TITLE)
         self.setFixedSize(Settings.WINDOW_WIDTH, Settings.WINDOW_HEIGHT)
-        self.setWindowIcon(QtGui.QIcon(Settings.ICON_PATH))
+        self.setWindowIcon(assets.icon(Settings.ICON_PATH))
         self.setWindowFlags(QtCore.Qt.WindowStaysOnTopHint)
 
         main_layout = QtWidgets.QVBoxLayout()
@@ -44,112 +97,108 @@ class GSyncToggleApp(QtWidgets.QWidget):
         self.add_title_bar(main_layout)
         self.add_status_label(main_layout)
         self.add_dlss_overlay_label(main_layout)
+        self.add_telemetry_panel(main_layout)
         '''self.add_dlssSwap_label(main_layout)'''  # DLSS Swap label is not needed for now, can be added later
         self.add_buttons(main_layout)
         self.add_log_viewer(main_layout)
         self.add_footer(main_layout)
         self.add_settings_button(main_layout)
         self.setLayout(main_layout)
-        self.apply_dark_mode()
+        self.apply_theme()
         self.show()
         self.center_window()
 
     def add_title_bar(self, layout):
         title_label = QtWidgets.QLabel(Settings.MAIN_TITLE)
         title_label.setAlignment(QtCore.Qt.AlignCenter)
-        title_label.setStyleSheet(Themes.TITLE_STYLE)
+        theme.set_role(title_label, "title")
         layout.addWidget(title_label)
 
     def add_status_label(self, layout):
         self.status_label = QtWidgets.QLabel("Current Status: Detecting...")
         self.status_label.setAlignment(QtCore.Qt.AlignCenter)
-        self.status_label.setStyleSheet(Themes.STATUS_STYLE)
+        theme.set_role(self.status_label, "status")
         layout.addWidget(self.status_label)
 
     def add_dlss_overlay_label(self, layout):
         self.dlss_overlay_label = QtWidgets.QLabel("DLSS Overlay: Detecting...")
         self.dlss_overlay_label.setAlignment(QtCore.Qt.AlignCenter)
-        self.dlss_overlay_label.setStyleSheet(Themes.STATUS_STYLE)
+        theme.set_role(self.dlss_overlay_label, "status")
         layout.addWidget(self.dlss_overlay_label)
 
+    def add_telemetry_panel(self, layout):
+        # Hidden until an NVIDIA GPU is detected and sampling starts
+        self.telemetry = TelemetrySampler()
+        self.telemetry_panel = SparklinePanel(self.telemetry, parent=self)
+        self.telemetry_panel.setVisible(False)
+        layout.addWidget(self.telemetry_panel)
+
     def add_dlssSwap_label(self, layout):
         self.dlssSwap_label = QtWidgets.QLabel("DLSS Swap: Detecting...")
         self.dlssSwap_label.setAlignment(QtCore.Qt.AlignCenter)
-        self.dlssSwap_label.setStyleSheet(Themes.STATUS_STYLE)
+        theme.set_role(self.dlssSwap_label, "status")
         layout.addWidget(self.dlssSwap_label)        
 
     def add_buttons(self, layout):
         button_layout = QtWidgets.QHBoxLayout()
         
         button_off = QtWidgets.QPushButton(Settings.BUTTON_OFF_TEXT)
-        button_off.setStyleSheet(Themes.BUTTON_STYLE)
         button_off.clicked.connect(lambda: self.run_command(0))
         button_layout.addWidget(button_off)
 
         button_on = QtWidgets.QPushButton(Settings.BUTTON_ON_TEXT)
-        button_on.setStyleSheet(Themes.BUTTON_STYLE)
         button_on.clicked.connect(lambda: self.run_command(2))
         button_layout.addWidget(button_on)
 
-        refresh_button = QtWidgets.QPushButton(Settings.BUTTON_REFRESH_TEXT)
-        refresh_button.setStyleSheet(Themes.BUTTON_STYLE)
-        refresh_button.clicked.connect(self.runRefreshWhenOn)
-        if read_status() == "OFF":
-            refresh_button.setEnabled(False)
-        else:
-            refresh_button.setEnabled(True)
-        button_layout.addWidget(refresh_button)
+        self.refresh_button = QtWidgets.QPushButton(Settings.BUTTON_REFRESH_TEXT)
+        self.refresh_button.clicked.connect(self.runRefreshWhenOn)
+        self.refresh_button.setEnabled(False)  # Enabled by on_gsync_state while G-SYNC is ON
+        button_layout.addWidget(self.refresh_button)
 
         dlss_overlay_on = QtWidgets.QPushButton(Settings.DLSS_ON_TEXT)
-        dlss_overlay_on.setStyleSheet(Themes.BUTTON_STYLE)
-        dlss_overlay_on.clicked.connect(lambda: self.update_dlss_overlay_status(1))
-        dlss_overlay_on.clicked.connect(lambda: update_dlss_overlay_in_registry(1))
+        dlss_overlay_on.clicked.connect(lambda: self.state.set_overlay(1))
         button_layout.addWidget(dlss_overlay_on)
 
         dlss_overlay_off = QtWidgets.QPushButton(Settings.DLSS_OFF_TEXT)
-        dlss_overlay_off.setStyleSheet(Themes.BUTTON_STYLE)
-        dlss_overlay_off.clicked.connect(lambda: self.update_dlss_overlay_status(0))
-        dlss_overlay_off.clicked.connect(lambda: update_dlss_overlay_in_registry(0))    
+        dlss_overlay_off.clicked.connect(lambda: self.state.set_overlay(0))
         button_layout.addWidget(dlss_overlay_off)
 
-        if not is_admin():
-            dlss_overlay_on.setEnabled(False)
+        if not is_admin() or not capabilities.available("registry"):
+            dlss_overlay_on.setEnabled(False)  # Greyed out by the QPushButton:disabled rule
             dlss_overlay_off.setEnabled(False)
-            dlss_overlay_on.setStyleSheet("background-color: gray; color: white;")
-            dlss_overlay_off.setStyleSheet("background-color: gray; color: white;")
 
         dlssswap_button = QtWidgets.QPushButton(Settings.DLSS_SWAP_TEXT)
-        dlssswap_button.setStyleSheet(Themes.BUTTON_STYLE)
         dlssswap_button.clicked.connect(self.show_dlss_swap_dialog)
         button_layout.addWidget(dlssswap_button)
 
         layout.addLayout(button_layout)
 
     def add_log_viewer(self, layout):
-        self.log_viewer = QtWidgets.QTextEdit()
-        self.log_viewer.setReadOnly(True)
-        self.log_viewer.setStyleSheet(Themes.LOG_STYLE)
-        layout.addWidget(self.log_viewer)
+        self.log_viewer = LogViewer(parent=self)
+        theme.set_role(self.log_viewer, "log")
+        self.diagnostics = DiagnosticsPanel(parent=self)
+        tabs = QtWidgets.QTabWidget()
+        tabs.addTab(self.log_viewer, "Log")
+        tabs.addTab(self.diagnostics, "Diagnostics")
+        layout.addWidget(tabs)
 
     def add_footer(self, layout):
         layout.addStretch()
         copyright_label = QtWidgets.QLabel(format_text.cpVbuild)
         copyright_label.setAlignment(QtCore.Qt.AlignCenter)
-        copyright_label.setStyleSheet(Themes.COPYRIGHT_STYLE)
+        theme.set_role(copyright_label, "copyright")
         layout.addWidget(copyright_label)
 
     def add_settings_button(self, layout):
         settings_layout = QtWidgets.QHBoxLayout()
 
         settings_button = QtWidgets.QPushButton("Settings")
-        settings_button.setStyleSheet(Themes.BUTTON_STYLE)
         settings_button.clicked.connect(self.open_settings)
 
         restartinAdmin = QtWidgets.QPushButton("Restart in Admin Mode")
-        restartinAdmin.setStyleSheet(Themes.BUTTON_STYLE)
         restartinAdmin.clicked.connect(lambda: elevate())
         restartinAdmin.setEnabled(not is_admin())
-        restartinAdmin.setStyleSheet(is_admin() and "background-color: gray; color: white;" or "background-color: lightgreen; color: black;")
+        restartinAdmin.setProperty("accent", not is_admin())
         restartinAdmin.setToolTip("Restart the application with administrative privileges.")
         
         
@@ -160,20 +209,49 @@ class GSyncToggleApp(QtWidgets.QWidget):
         layout.addLayout(settings_layout)
 
     def open_settings(self):
-        settings_dialog = SettingsWindow(self)
+        settings_dialog = SettingsWindow(self, inventory=self.ngx_inventory)
         settings_dialog.exec_()
 
     def toggle_close_on_tray(self, state):
         Settings.CLOSE_ON_TRAY = bool(state)
 
     def logInfo(self, log):
-        """Log a message to the console log viewer and log file."""
-        self.log_viewer.append(log)
-        logging.info(log)
+        """Log a message to the console log viewer and log file. Safe from any thread."""
+        ui_logger.info(log)
+
+    def start_gpu_probe(self):
+        """Probe GPUs in the background; results arrive through gpu_info_ready."""
+        try:
+            gpu_probe = capabilities.get("gpu_probe")
+        except CapabilityUnavailable as e:
+            self.logInfo(f"GPU detection disabled: {e}")
+            return
+        self.gpu_info_ready.connect(self.on_gpu_info)
+        self.logInfo("Detecting GPU...")
+        self._gpu_probe_started = time.perf_counter()
+        # Resolves at once from a fresh cache, otherwise on the probe thread (the signal queues it)
+        gpu_probe.refresh_async().add_done_callback(lambda future: self.gpu_info_ready.emit(future.result()))
+
+    def on_gpu_info(self, gpu_info_list):
+        if self._gpu_probe_started is not None:
+            startup_profiler.record("gpu_probe (background)", (time.perf_counter() - self._gpu_probe_started) * 1000)
+            self._gpu_probe_started = None
+        self.state.set_gpu(gpu_info_list)
+
+    def on_gpu_state(self, gpu_info_list):
+        self.gpu_info = gpu_info_list
+        if gpu_info_list is not None:
+            from core.ckGpu import first_gpu_name
+            self.logInfo(f"GPU Model: {first_gpu_name(gpu_info_list)}")
+        with startup_profiler.phase("checkNV"):
+            nvidia = self.checkNV()
+        if nvidia:
+            self.telemetry_panel.setVisible(True)  # Samples while the panel is on screen
 
     def checkNV(self):
+        from core.ckGpu import is_nvidia
         nvST = 0  # Default state for NVIDIA hardware detection
-        if "NVIDIA" in GPUname:
+        if is_nvidia(self.gpu_info):
             self.logInfo("NVIDIA Hardware detected")
             nvST = 1
         else:
@@ -183,107 +261,124 @@ class GSyncToggleApp(QtWidgets.QWidget):
 
     def checkGvLib(self):  # Check if GvLib is available
         try:
-            import clr
-            clr.AddReference("idsw-gvlib")
-            from ReturnPresence import ReturnPresence  # type: ignore
-            self.logInfo("GvLib found")
-            readPresence = ReturnPresence.GetPresence()
-            self.logInfo(f"{readPresence}")
-            return True
-
-        except ImportError as e:
+            gvlib = capabilities.get("gvlib")
+        except CapabilityUnavailable as e:
             self.logInfo(f"Error loading GvLib: {e}")
             return False
+        self.logInfo("GvLib found")
+        readPresence = gvlib.ReturnPresence.GetPresence()
+        self.logInfo(f"{readPresence}")
+        return True
     
     def init_nvapi(self):  # Under construction
         """Initialize the NVAPI wrapper library."""
         try:
-            if initialize_nvapi():
-                self.logInfo("NVAPI initialized successfully.")
-            else:
-                self.logInfo("NVAPI initialization failed.")
-        except Exception as e:
-            self.logInfo(f"Error initializing NVAPI: {e}")
-            raise ImportError(f"Failed to initialize NVAPI: {e}")
+            capabilities.get("nvapi")
+            self.logInfo("NVAPI initialized successfully.")
+        except CapabilityUnavailable as e:
+            self.logInfo(f"NVAPI disabled: {e}")
 
     def detect_current_status(self):  # Detect the current G-SYNC status
-        try:
-            self.logInfo(f"GPU Model: {GPUname}")
-            status = read_status()
-            self.update_status(2 if status == "ON" else 0)
-            self.logInfo(f"Detected G-SYNC status: {status}")
-        except FileNotFoundError:
-            self.status_label.setVisible(False)
+        status = self.state.refresh_gsync()
+        if status == UNAVAILABLE:
+            return
+        if status == MISSING:
             self.logInfo("Error: Status file not found.")
-        except Exception as e:
-            self.status_label.setText("Current Status: Error")
-            self.status_label.setStyleSheet(Themes.ERROR_STYLE)
-            self.status_label.setVisible(True)
-            self.logInfo(f"Error detecting status: {e}")
-            
+        elif status != ERROR:
+            self.logInfo(f"Detected G-SYNC status: {status}")
+
     def detect_dlss_overlay_status(self):  # Detect the DLSS Overlay status
-        try:
-            dlss_overlay_status = read_dlss_overlay_status()
-            self.update_dlss_overlay_status(1 if dlss_overlay_status == "ON" else 0)
-            self.logInfo(f"Detected DLSS Overlay status: {dlss_overlay_status}")
-        except FileNotFoundError:
-            self.dlss_overlay_label.setVisible(False)
+        status = self.state.refresh_overlay()
+        if status == UNAVAILABLE:
+            self.logInfo(f"DLSS Overlay disabled: {capabilities['registry'].error}")
+        elif status == MISSING:
             self.logInfo("Error: DLSS Overlay status file not found.")
-        except Exception as e:
+        elif status != ERROR:
+            self.logInfo(f"Detected DLSS Overlay status: {status}")
+
+    def on_gsync_state(self, status):
+        """Render a G-SYNC state change from the state store."""
+        self.refresh_button.setEnabled(status == "ON")
+        if status in ("ON", "OFF"):
+            self.update_status(2 if status == "ON" else 0)
+            self.status_label.setVisible(True)
+        elif status == ERROR:
+            self.status_label.setText("Current Status: Error")
+            theme.set_status(self.status_label, "error")
+            self.status_label.setVisible(True)
+        else:
+            self.status_label.setVisible(False)
+
+    def on_overlay_state(self, status):
+        """Render a DLSS overlay state change from the state store."""
+        if status in ("ON", "OFF"):
+            self.update_dlss_overlay_status(1 if status == "ON" else 0)
+            self.dlss_overlay_label.setVisible(True)
+        elif status == ERROR:
             self.dlss_overlay_label.setText("DLSS Overlay: Error")
-            self.dlss_overlay_label.setStyleSheet(Themes.ERROR_STYLE)
+            theme.set_status(self.dlss_overlay_label, "error")
             self.dlss_overlay_label.setVisible(True)
-            self.logInfo(f"Error detecting DLSS Overlay status: {e}")
+        else:
+            self.dlss_overlay_label.setVisible(False)
 
     # Update the DLSS Overlay status label
     def update_dlss_overlay_status(self, option):
         status_text = Settings.TXT_TRUE if option == 1 else Settings.TXT_FALSE
-        color = "lightgreen" if option == 1 else "red"
         self.dlss_overlay_label.setText(f"DLSS Overlay: {status_text}")
-        self.dlss_overlay_label.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {color};")
+        theme.set_status(self.dlss_overlay_label, "on" if option == 1 else "off")
 
-    def run_command(self, option):  # Run the G-SYNC command based on the option
+    def run_command(self, option, quiet=False):  # Queue the G-SYNC command, the result arrives in on_command_finished
+        self.logInfo(f"Applying G-SYNC {'ON' if option == 2 else 'OFF'}...")
+        if quiet:
+            self._quiet_options.add(option)
+        else:
+            self._quiet_options.discard(option)
+        return self.executor.submit(option)
+
+    def on_command_finished(self, result):
+        if self.refresher.active:
+            return  # The refresh sequence reports its own progress
+        if result.cancelled:
+            self.logInfo(f"Command cancelled: G-SYNC {'ON' if result.option == 2 else 'OFF'}")
+            return
+        quiet = result.option in self._quiet_options
+        self._quiet_options.discard(result.option)
         try:
-            success, message = run_gsync_command(self.gswdll, option)
-            if success:
-                self.update_status(option)
-                update_status_in_registry(option)
-                QtWidgets.QMessageBox.information(self, "Success", message)
-                self.logInfo(f"Command executed successfully: {message}")
-                self.refresh_status_label()  # Refresh status label
+            if result.success:
+                self.state.set_gsync(result.option)
+                if not quiet:
+                    QtWidgets.QMessageBox.information(self, "Success", result.message)
+                self.logInfo(f"Command executed successfully: {result.message} ({result.elapsed * 1000:.0f} ms)")
             else:
-                QtWidgets.QMessageBox.critical(self, "Error", message)
-                self.logInfo(f"Command execution failed: {message}")
+                if not quiet:
+                    QtWidgets.QMessageBox.critical(self, "Error", result.message)
+                self.logInfo(f"Command execution failed: {result.message}")
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Error", str(e))
             self.logInfo(f"Exception during command execution: {e}")
 
     def runRefreshWhenOn(self):
-        self.run_command(0)
-        time.sleep(3)
-        self.run_command(2)
-        self.logInfo("Refreshed G-SYNC done!")
-        run_gsync_command(self.gswdll, 2)
-        self.logInfo("Refreshed G-SYNC done!")
+        self.refresher.start()
+
+    def on_refresh_finished(self, success, latency_ms):
+        self.refresh_status_label()
 
     def refresh_status_label(self):
         """Refresh the status label."""
-        status = read_status()
-        self.update_status(2 if status == "ON" else 0)
+        self.state.refresh_gsync()
 
     def refresh_dlss_overlay_label(self):
         """Refresh the DLSS overlay label."""
-        dlss_overlay_status = read_dlss_overlay_status()
-        self.update_dlss_overlay_status(1 if dlss_overlay_status == "ON" else 0)
+        self.state.refresh_overlay()
 
     def update_status(self, option):
         status_text = "ON" if option == 2 else "OFF"
-        color = "lightgreen" if option == 2 else "red"
         self.status_label.setText(f"Current Status: G-SYNC {status_text}")
-        self.status_label.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {color};")
+        theme.set_status(self.status_label, "on" if option == 2 else "off")
 
-    def apply_dark_mode(self):
-        self.setStyleSheet(Themes.DARK_MODE)
+    def apply_theme(self, name=None):
+        """Install the compiled theme application-wide (config.xml <theme>, else Settings.THEME)."""
+        theme.apply(name or config.get("theme") or Settings.THEME)
 
     def center_window(self):
         screen = QtGui.QGuiApplication.primaryScreen()
@@ -292,61 +387,200 @@ class GSyncToggleApp(QtWidgets.QWidget):
         qr.moveCenter(center_point)
         self.move(qr.topLeft())
 
+    def start_catalog_scan(self):
+        """Refresh the DLSS DLL catalog in the background (the scan thread also opens its database)."""
+        threading.Thread(target=self.dll_catalog.scan, name="DllCatalogScan", daemon=True).start()
+        self.ngx_watcher.refresh()  # Also starts watching the NGX models folders
+
+    def on_ngx_models_changed(self, versions):
+        active = ", ".join(f"{v.type} {v.version}" for v in versions if v.active) or "none"
+        summary = f"NGX models: {len(versions)} versions installed, active: {active}"
+        # The versions swaps manage; v.active also covers versions other apps keep in the config
+        self.state.set_ngx_versions(self.ngx_inventory.active_versions())
+        if summary != self._ngx_models_summary:
+            self._ngx_models_summary = summary
+            self.logInfo(summary)
+
+    def start_profile_watcher(self):
+        """Poll for games with a profile; the interval widens if polling gets expensive."""
+        self.profile_engine = ProfileEngine(read_state=self.profile_state, apply=self.apply_profile_changes)
+        self.profile_timer = QtCore.QTimer(self)
+        self.profile_timer.setSingleShot(True)
+        self.profile_timer.setTimerType(QtCore.Qt.CoarseTimer)
+        self.profile_timer.timeout.connect(self.poll_profiles)
+        self.profile_timer.start(Settings.PROFILE_POLL_MS)
+
+    def profile_state(self):
+        """Current state for the profile engine, served by the state store instead of the backends."""
+        state = {"dlss": self.state.get("ngx_versions") or {}}
+        for key in ("gsync", "overlay"):
+            if self.state.get(key) in ("ON", "OFF"):
+                state[key] = self.state.get(key)
+        return state
+
+    def poll_profiles(self):
+        try:
+            self.profile_engine.poll()
+        except Exception as e:
+            logging.getLogger(__name__).error(f"Profile watcher error: {e}")
+        # Without profiles only profiles.json is checked, at the slowest rate
+        interval = self.profile_engine.interval_ms if self.profile_engine.enabled else Settings.PROFILE_MAX_POLL_MS
+        self.profile_timer.start(interval)
+
+    def apply_profile_changes(self, changes):
+        """Apply a profile without dialogs: G-SYNC through the executor, DLSS on a worker thread."""
+        profile = self.profile_engine.active.name if self.profile_engine.active else "default"
+        if "gsync" in changes:
+            self.run_command(2 if changes["gsync"] == "ON" else 0, quiet=True)
+        if "overlay" in changes:
+            self.state.set_overlay(1 if changes["overlay"] == "ON" else 0)
+            self.logInfo(f"Profile {profile}: DLSS Overlay {changes['overlay']}")
+        if "dlss" in changes:
+            self.queue_dlss_swap(changes["dlss"], profile)
+
+    def _profile_swap_worker(self, profile, dll_paths):
+        from core.nvgxswap import update_nvngx_batch
+        try:
+            success = update_nvngx_batch(dll_paths)
+        except Exception as e:
+            logging.getLogger(__name__).error(f"Profile {profile} DLSS swap failed: {e}")
+            success = False
+        self.profile_swap_finished.emit(profile, success)
+
+    def on_profile_swap_finished(self, profile, success):
+        self.logInfo(f"Profile {profile}: DLSS swap {'completed' if success else 'failed, see the log'}")
+        self._swap_busy = False
+        self._next_swap()
+
+    def queue_dlss_swap(self, dll_paths, profile=None):
+        """
+        Run a DLSS swap in the single swap slot, or queue it until the running one finishes.
+
+        profile is the name of the profile asking for it, None for a swap the user started.
+        Only the newest profile swap is kept waiting: an older one is out of date.
+        """
+        if profile is not None:
+            self._swap_queue = collections.deque(r for r in self._swap_queue if r[1] is None)
+        self._swap_queue.append((list(dll_paths), profile))
+        if self._swap_busy:
+            message = f"DLSS swap already running, queued {', '.join(dll_paths)}"
+            self.logInfo(f"Profile {profile}: {message}" if profile is not None else message)
+        self._next_swap()
+
+    def _next_swap(self):
+        if self._swap_busy or not self._swap_queue:
+            return
+        dll_paths, profile = self._swap_queue.popleft()
+        self._swap_busy = True
+        if profile is None:
+            self._start_swap(dll_paths)
+            return
+        self.logInfo(f"Profile {profile}: installing {', '.join(dll_paths)}")
+        threading.Thread(target=self._profile_swap_worker, args=(profile, dll_paths),
+                         name="ProfileDlssSwap", daemon=True).start()
+
     def show_dlss_swap_dialog(self):
-        """Show file dialog for DLSS DLL selection and perform the swap."""
+        """Offer DLLs from the catalog, or a file dialog, and perform the swap."""
+        entries = self.dll_catalog.entries()
+        if entries:
+            browse = "Browse..."
+            labels = [f"{entry.type} {entry.version or '?'}  -  {entry.path}" for entry in entries] + [browse]
+            choice, ok = QtWidgets.QInputDialog.getItem(
+                self, Settings.DLSS_SWAP_TEXT, "Select a DLSS DLL:", labels, 0, False
+            )
+            if not ok:
+                return
+            if choice != browse:
+                self.perform_dlss_swap(entries[labels.index(choice)].path)
+                return
+
         file_dialog = QtWidgets.QFileDialog()
-        file_dialog.setFileMode(QtWidgets.QFileDialog.ExistingFile)
+        file_dialog.setFileMode(QtWidgets.QFileDialog.ExistingFiles)
         file_dialog.setNameFilter("DLSS DLL Files (nvngx_dlss*.dll);;All Files (*.*)")
         
         if file_dialog.exec_():
             selected_files = file_dialog.selectedFiles()
             if selected_files:
-                dll_path = selected_files[0]
-                self.perform_dlss_swap(dll_path)
+                self.perform_dlss_swap(selected_files)
+
+    def perform_dlss_swap(self, dll_paths):
+        """Start the DLSS DLL swap; several DLLs are installed all-or-nothing, off the GUI thread."""
+        if isinstance(dll_paths, str):
+            dll_paths = [dll_paths]
+        self.queue_dlss_swap(dll_paths)
+
+    def _start_swap(self, dll_paths):
+        self.logInfo(f"Attempting to swap DLSS DLL: {', '.join(dll_paths)}")
+
+        """ 
+        # Check if the application is running with administrator privileges
+        # Uncomment this block if you want to enforce admin rights for the swap operation
+        if not is_admin(): 
+            QtWidgets.QMessageBox.warning(
+                self,
+                "Administrator Rights Required",
+                "This operation requires administrator privileges. Please restart the application as administrator."
+            )
+            return
+        """
+
+        self._swap_cancel = threading.Event()
+        self.swap_dialog = QtWidgets.QProgressDialog("Installing DLSS DLL...", "Cancel", 0, 100, self)
+        self.swap_dialog.setWindowTitle(Settings.DLSS_SWAP_TEXT)
+        self.swap_dialog.setMinimumDuration(300)  # Small DLLs finish before it would show
+        self.swap_dialog.canceled.connect(self._swap_cancel.set)
+        self.swap_progress.connect(self.swap_dialog.setValue)
+        threading.Thread(
+            target=self._swap_worker, args=(dll_paths, self._swap_cancel), name="DlssSwap", daemon=True
+        ).start()
+
+    def _swap_worker(self, dll_paths, cancel):
+        from core.nvgxswap import update_nvngx_batch
+        def progress(done, total):
+            self.swap_progress.emit(int(done * 100 / total) if total else 100)
 
-    def perform_dlss_swap(self, dll_path: str):
-        """Perform the DLSS DLL swap operation."""
         try:
-            self.logInfo(f"Attempting to swap DLSS DLL: {dll_path}")
-           
-            """ 
-            # Check if the application is running with administrator privileges
-            # Uncomment this block if you want to enforce admin rights for the swap operation
-            if not is_admin(): 
-                QtWidgets.QMessageBox.warning(
-                    self,
-                    "Administrator Rights Required",
-                    "This operation requires administrator privileges. Please restart the application as administrator."
-                )
-                return
-            """
-                
-            if update_nvngx(dll_path):
-                QtWidgets.QMessageBox.information(
-                    self,
-                    "Success",
-                    "DLSS DLL swap completed successfully."
-                )
-                self.update_dlss_swap_status(True)
-            else:
-                QtWidgets.QMessageBox.critical(
-                    self,
-                    "Error",
-                    "Failed to swap DLSS DLL. Check the logs for details."
-                )
-                self.update_dlss_swap_status(False)
+            success, error = update_nvngx_batch(dll_paths, progress=progress, cancel=cancel), ""
         except Exception as e:
-            self.logInfo(f"Error during DLSS swap: {e}")
+            success, error = False, str(e)
+        self.swap_finished.emit(success, error)
+
+    def on_swap_finished(self, success: bool, error: str):
+        cancelled = self._swap_cancel.is_set()
+        # Closing a QProgressDialog emits canceled, which must not count as a user cancel
+        self.swap_dialog.canceled.disconnect(self._swap_cancel.set)
+        self.swap_progress.disconnect(self.swap_dialog.setValue)
+        self.swap_dialog.close()
+        self._swap_cancel = None
+        if success:
+            QtWidgets.QMessageBox.information(
+                self,
+                "Success",
+                "DLSS DLL swap completed successfully."
+            )
+        elif cancelled:
+            self.logInfo("DLSS swap cancelled, nothing was changed")
+        elif error:
+            self.logInfo(f"Error during DLSS swap: {error}")
+            QtWidgets.QMessageBox.critical(
+                self,
+                "Error",
+                f"An error occurred during DLSS swap: {error}"
+            )
+        else:
             QtWidgets.QMessageBox.critical(
                 self,
                 "Error",
-                f"An error occurred during DLSS swap: {str(e)}"
+                "Failed to swap DLSS DLL. Check the logs for details."
             )
-            self.update_dlss_swap_status(False)
+        self.update_dlss_swap_status(success)
+        self._swap_busy = False
+        self._next_swap()
 
     def update_dlss_swap_status(self, success: bool):
         """Update the DLSS swap status label."""
+        if not hasattr(self, "dlssSwap_label"):
+            return  # Label is not part of the layout for now, see init_ui
         status_text = "Success" if success else "Failed"
-        color = "lightgreen" if success else "red"
         self.dlssSwap_label.setText(f"DLSS Swap: {status_text}")
-        self.dlssSwap_label.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {color};")
\ No newline at end of file
+        theme.set_status(self.dlssSwap_label, "on" if success else "error")
\ No newline at end of file
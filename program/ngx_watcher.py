@@ -0,0 +1,46 @@
+"""
+NGX Models Watcher.
+Keeps an NgxInventory current by following the models folders with QFileSystemWatcher.
+"""
+
+from PyQt5 import QtCore
+from core.ngx_inventory import NgxInventory
+
+
+class NgxModelsWatcher(QtCore.QObject):
+    """
+    Invalidates the inventory on folder changes and refreshes it once things settle.
+
+    Args:
+        inventory: Inventory to keep current
+        settle_ms: Quiet time after the last change before refreshing
+    """
+
+    # List[InstalledVersion], after each refresh
+    changed = QtCore.pyqtSignal(object)
+
+    def __init__(self, inventory: NgxInventory, settle_ms: int = 500, parent=None):
+        super().__init__(parent)
+        self.inventory = inventory
+        self.watcher = QtCore.QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(settle_ms)
+        self.timer.timeout.connect(self.refresh)
+
+    def on_directory_changed(self, path: str):
+        self.inventory.invalidate(path)
+        self.timer.start()  # A swap touches several folders; refresh once
+
+    def refresh(self):
+        versions = self.inventory.refresh()
+        # Follow folders that appeared, drop the ones that went away
+        wanted = set(self.inventory.watch_paths())
+        watched = set(self.watcher.directories())
+        if watched - wanted:
+            self.watcher.removePaths(list(watched - wanted))
+        if wanted - watched:
+            self.watcher.addPaths(list(wanted - watched))
+        self.changed.emit(versions)
+        return versions
@@ -0,0 +1,125 @@
+from PyQt5 import QtCore
+from core.registry import update_status_in_registry
+from resources.settings import Settings
+
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+OFF, ON = 0, 2
+
+
+class GSyncRefresher(QtCore.QObject):
+    """
+    Asynchronous G-SYNC refresh: OFF, let the driver settle, ON.
+
+    Nothing in the app can read the driver's G-SYNC state back (the wrapper
+    only sets it, and the registry value is the app's own record), so by
+    default the OFF step waits `settle_delay` seconds on a QTimer instead of
+    sleeping, as the old fixed 3 s delay did, and the refresh finishes as soon
+    as the ON command succeeds. Steps are reported as applied, not confirmed.
+
+    Given a `verifier` that reads the real state, each step instead polls it
+    with a doubling backoff and moves on as soon as it matches, or after
+    `settle_timeout` seconds if it never does.
+
+    Args:
+        executor: core.executor.CommandExecutor used for both commands
+        verifier: Optional callable returning the observed driver state (0 or 2)
+    """
+
+    # success, total latency in milliseconds
+    finished = QtCore.pyqtSignal(bool, float)
+    progress = QtCore.pyqtSignal(str)
+    _command_done = QtCore.pyqtSignal(object)
+
+    POLL_START = 0.05  # seconds
+    POLL_MAX = 0.8
+
+    def __init__(self, executor, verifier=None, settle_delay=Settings.REFRESH_SETTLE_SECONDS,
+                 settle_timeout=10.0, parent=None):
+        super().__init__(parent)
+        self.executor = executor
+        self.verifier = verifier
+        self.settle_delay = settle_delay
+        self.settle_timeout = settle_timeout
+        self.active = False
+        self._target = None
+        self._started = 0.0
+        self._wait_started = 0.0
+        self._delay = self.POLL_START
+        self._command_done.connect(self._on_command_done)
+
+    def start(self):
+        if self.active:
+            logger.debug("Refresh already running")
+            return False
+        self.active = True
+        self._started = time.perf_counter()
+        self._send(OFF)
+        return True
+
+    def _send(self, option):
+        self._target = option
+        self.progress.emit(f"Refresh: applying G-SYNC {self._label(option)}")
+        future = self.executor.submit(option)
+        future.add_done_callback(lambda f: self._command_done.emit(None if f.cancelled() else f.result()))
+
+    @staticmethod
+    def _label(option):
+        return "ON" if option == ON else "OFF"
+
+    def _on_command_done(self, result):
+        if result is None or result.cancelled or result.option != self._target:
+            self._finish(False, "Refresh interrupted")
+            return
+        if not result.success:
+            self._finish(False, f"Refresh failed: {result.message}")
+            return
+        update_status_in_registry(result.option)  # The app's record, not a readback
+        self._wait_started = time.perf_counter()
+        if self.verifier is None:
+            if self._target == ON:
+                self._finish(True, "Refreshed G-SYNC done!")  # Nothing left to settle for
+            else:
+                QtCore.QTimer.singleShot(int(self.settle_delay * 1000), self._settled)
+            return
+        self._delay = self.POLL_START
+        self._poll()
+
+    def _settled(self):
+        waited = time.perf_counter() - self._wait_started
+        self.progress.emit(f"Refresh: G-SYNC {self._label(self._target)} applied, waited {waited:.1f} s")
+        self._next()
+
+    def _poll(self):
+        try:
+            observed = self.verifier()
+        except Exception as e:
+            logger.error(f"Refresh state check failed: {e}")
+            observed = None
+
+        waited = time.perf_counter() - self._wait_started
+        if observed != self._target:
+            if waited < self.settle_timeout:
+                QtCore.QTimer.singleShot(int(self._delay * 1000), self._poll)
+                self._delay = min(self._delay * 2, self.POLL_MAX)
+                return
+            self.progress.emit(f"Refresh: state not confirmed after {waited:.1f} s, continuing")
+        else:
+            self.progress.emit(f"Refresh: G-SYNC {self._label(self._target)} confirmed after {waited * 1000:.0f} ms")
+        self._next()
+
+    def _next(self):
+        if self._target == OFF:
+            self._send(ON)
+        else:
+            self._finish(True, "Refreshed G-SYNC done!")
+
+    def _finish(self, success, message):
+        self.active = False
+        self._target = None
+        latency = (time.perf_counter() - self._started) * 1000
+        self.progress.emit(f"{message} ({latency:.0f} ms)")
+        self.finished.emit(success, latency)
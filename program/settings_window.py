@@ -1,38 +1,69 @@
-from PyQt5 import QtWidgets
-#from resources.settings import Settings
-from program.themes import Themes
-from core.xmlEt import loadCFG as xl
+from PyQt5 import QtWidgets, QtCore
+from resources.settings import Settings
+from program.themes import Themes, theme
+from core.xmlEt import config
+
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
 
 class SettingsWindow(QtWidgets.QDialog):
-    def __init__(self, parent=None):
+    # Versions removed by a background prune (a list, or None if it failed)
+    prune_finished = QtCore.pyqtSignal(object)
+    # Installed versions and what a prune would remove, from a background dry run
+    ngx_models_ready = QtCore.pyqtSignal(object, object)
+
+    def __init__(self, parent=None, inventory=None):
         super().__init__(parent)
         self.setWindowTitle("Settings")
-        self.setFixedSize(300, 200)
-        self.setStyleSheet(Themes.DARK_MODE)
-        self.config = xl()  # Instantiate loadCFG
+        self.setFixedSize(300, 300 if inventory is not None else 240)
+        self.config = config  # Shared config store, writes are debounced off the GUI thread
+        self.inventory = inventory  # NgxInventory of the installed DLSS models, if any
+        self._doomed = []  # Latest dry run, shown in the prune confirmation
+        self.prune_finished.connect(self.on_prune_finished)
+        self.ngx_models_ready.connect(self.on_ngx_models_ready)
         self.init_ui()
 
     def init_ui(self):
         layout = QtWidgets.QVBoxLayout()
 
         self.close_on_tray_checkbox = QtWidgets.QCheckBox("Keep running in system tray")
-        self.close_on_tray_checkbox.setChecked(self.config.get('closeOnTray') == 'true')
+        self.close_on_tray_checkbox.setChecked(self.config.get_bool('closeOnTray'))
         self.close_on_tray_checkbox.stateChanged.connect(self.toggle_close_on_tray)
         layout.addWidget(self.close_on_tray_checkbox)
 
         self.run_as_admin_checkbox = QtWidgets.QCheckBox("Run as administrator")
-        self.run_as_admin_checkbox.setChecked(self.config.get('runAsAdmin') == 'true')
+        self.run_as_admin_checkbox.setChecked(self.config.get_bool('runAsAdmin'))
         self.run_as_admin_checkbox.stateChanged.connect(self.toggle_run_as_admin)
         layout.addWidget(self.run_as_admin_checkbox)
 
         self.minimizeAtLaunch_checkbox = QtWidgets.QCheckBox("Minimize at launch")
-        self.minimizeAtLaunch_checkbox.setChecked(self.config.get('minimizeAtLaunch') == 'true')
+        self.minimizeAtLaunch_checkbox.setChecked(self.config.get_bool('minimizeAtLaunch'))
         self.minimizeAtLaunch_checkbox.stateChanged.connect(self.minimizeAtLaunch)
         layout.addWidget(self.minimizeAtLaunch_checkbox)
-        
+
+        theme_layout = QtWidgets.QHBoxLayout()
+        theme_layout.addWidget(QtWidgets.QLabel("Theme"))
+        self.theme_combo = QtWidgets.QComboBox()
+        self.theme_combo.addItems([name.capitalize() for name in Themes.PALETTES])
+        self.theme_combo.setCurrentText(theme.name.capitalize())
+        self.theme_combo.currentTextChanged.connect(self.change_theme)
+        theme_layout.addWidget(self.theme_combo)
+        layout.addLayout(theme_layout)
+
+        if self.inventory is not None:
+            self.ngx_models_label = QtWidgets.QLabel()
+            layout.addWidget(self.ngx_models_label)
+            self.prune_button = QtWidgets.QPushButton(
+                f"Keep newest {Settings.NGX_KEEP_VERSIONS} DLSS versions per type"
+            )
+            self.prune_button.clicked.connect(self.prune_ngx_models)
+            layout.addWidget(self.prune_button)
+            self.update_ngx_models_label()
+
 
         close_button = QtWidgets.QPushButton("Close")
-        close_button.setStyleSheet(Themes.BUTTON_STYLE)
         close_button.clicked.connect(self.accept)
         layout.addWidget(close_button)
 
@@ -49,5 +80,59 @@ class SettingsWindow(QtWidgets.QDialog):
 
     def minimizeAtLaunch(self, state):
         new_value = 'true' if state == QtWidgets.QCheckBox.isChecked or state == 2 else 'false'
-        self.config.set('minimizeAtLaunch', new_value)    
-        
+        self.config.set('minimizeAtLaunch', new_value)
+
+    def change_theme(self, text):
+        theme.apply(text.lower())  # Restyles every open window at once
+        self.config.set('theme', theme.name)
+
+    def update_ngx_models_label(self):
+        """Size up the models folder and dry-run the prune off the GUI thread; see on_ngx_models_ready."""
+        self.prune_button.setEnabled(False)
+        self.ngx_models_label.setText("Installed DLSS models: checking...")
+        threading.Thread(target=self._ngx_models_worker, name="NgxModels", daemon=True).start()
+
+    def _ngx_models_worker(self):
+        try:
+            versions = self.inventory.refresh()
+            doomed = self.inventory.prune(Settings.NGX_KEEP_VERSIONS, dry_run=True)  # Served from the cache
+        except Exception as e:
+            logger.error(f"Reading the DLSS models folder failed: {e}")
+            versions, doomed = None, []
+        self.ngx_models_ready.emit(versions, doomed)
+
+    def on_ngx_models_ready(self, versions, doomed):
+        self._doomed = doomed
+        if versions is None:
+            self.ngx_models_label.setText("Installed DLSS models: unavailable")
+        else:
+            size = sum(v.size for v in versions) / 1024 / 1024
+            self.ngx_models_label.setText(f"Installed DLSS models: {len(versions)} versions, {size:.0f} MB")
+        self.prune_button.setEnabled(bool(doomed))
+
+    def prune_ngx_models(self):
+        doomed = self._doomed  # The prune itself decides again under the swap lock
+        size = sum(v.size for v in doomed) / 1024 / 1024
+        answer = QtWidgets.QMessageBox.question(
+            self,
+            "Remove old DLSS models",
+            f"Remove {len(doomed)} older DLSS versions ({size:.0f} MB)? The active versions are kept."
+        )
+        if answer == QtWidgets.QMessageBox.Yes:
+            # Deleting model folders and pruning the store can take a while; keep the dialog responsive
+            self.prune_button.setEnabled(False)
+            self.ngx_models_label.setText("Removing old DLSS models...")
+            threading.Thread(target=self._prune_worker, name="NgxPrune", daemon=True).start()
+
+    def _prune_worker(self):
+        try:
+            removed = self.inventory.prune(Settings.NGX_KEEP_VERSIONS)
+        except Exception as e:
+            logger.error(f"Removing old DLSS models failed: {e}")
+            removed = None
+        self.prune_finished.emit(removed)
+
+    def on_prune_finished(self, removed):
+        if removed is None:
+            QtWidgets.QMessageBox.critical(self, "Error", "Failed to remove old DLSS models. Check the logs for details.")
+        self.update_ngx_models_label()
@@ -0,0 +1,161 @@
+"""
+Single Instance Module.
+Keeps one SwapSpectra per user. A second launch forwards its command
+(--gsync on|off, --refresh, --show) to the running tray instance over a
+QLocalSocket (a named pipe on Windows, a Unix socket elsewhere) and exits.
+
+Only QtCore and QtNetwork are imported, so forwarding costs no widgets,
+no CLR and no GPU probe.
+"""
+
+import getpass
+import json
+import os
+import re
+import logging
+from typing import Callable, List, Optional
+from PyQt5 import QtCore, QtNetwork
+from resources.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+COMMANDS = {
+    "--gsync": 1,  # Flag: number of values it takes
+    "--refresh": 0,
+    "--show": 0,
+}
+GSYNC_STATES = ("on", "off")
+
+
+def parse_instance_args(argv: List[str]) -> List[List[str]]:
+    """
+    Take the instance commands out of argv (Qt never sees them) and return them.
+
+    "--gsync on" becomes ["gsync", "on"], "--show" becomes ["show"].
+
+    Raises:
+        ValueError: If a flag is missing its value.
+    """
+    commands, i = [], 1
+    while i < len(argv):
+        flag = argv[i]
+        if flag not in COMMANDS:
+            i += 1
+            continue
+        values = argv[i + 1:i + 1 + COMMANDS[flag]]
+        if len(values) != COMMANDS[flag] or (flag == "--gsync" and values[0].lower() not in GSYNC_STATES):
+            raise ValueError(f"{flag} expects one of: {', '.join(GSYNC_STATES)}")
+        commands.append([flag[2:]] + [value.lower() for value in values])
+        del argv[i:i + 1 + COMMANDS[flag]]
+    return commands
+
+
+def server_name() -> str:
+    """Per-user name, so users on one machine do not reach each other's instance."""
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = "user"
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", f"{Settings.APP_TITLE}-{user}")
+
+
+class SingleInstance(QtCore.QObject):
+    """
+    Owns the per-user instance lock and, in the first instance, the command server.
+
+    Args:
+        name: Server and lock name, defaults to server_name()
+    """
+
+    # A forwarded command, e.g. ["gsync", "on"], delivered on the GUI thread
+    command_received = QtCore.pyqtSignal(list)
+
+    def __init__(self, name: Optional[str] = None, parent=None):
+        super().__init__(parent)
+        self.name = name or server_name()
+        self.lock = QtCore.QLockFile(os.path.join(QtCore.QDir.tempPath(), f"{self.name}.lock"))
+        self.server: Optional[QtNetwork.QLocalServer] = None
+
+    def acquire(self) -> bool:
+        """True if this is the first instance. The lock is released before an elevated restart."""
+        if not self.lock.tryLock(0):
+            return False
+        from core import elevation  # Not needed on the forwarding path
+        elevation.before_restart(self.release)
+        return True
+
+    def release(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            self.server = None
+        self.lock.unlock()
+
+    # First instance
+    def listen(self, handler: Callable[[List[str]], None]) -> bool:
+        """Start accepting forwarded commands; handler runs on the GUI thread."""
+        self.command_received.connect(handler)
+        QtNetwork.QLocalServer.removeServer(self.name)  # Stale socket from a crashed instance
+        self.server = QtNetwork.QLocalServer(self)
+        self.server.setSocketOptions(QtNetwork.QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self._on_new_connection)
+        if not self.server.listen(self.name):
+            logger.error(f"Single instance server failed to listen: {self.server.errorString()}")
+            return False
+        return True
+
+    def _on_new_connection(self):
+        while self.server is not None and self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            socket.readyRead.connect(lambda s=socket: self._on_ready_read(s))
+            socket.disconnected.connect(socket.deleteLater)
+
+    def _on_ready_read(self, socket: QtNetwork.QLocalSocket):
+        if not socket.canReadLine():
+            return
+        line = bytes(socket.readLine()).decode("utf-8", "replace").strip()
+        try:
+            commands = json.loads(line)
+            if not isinstance(commands, list) or not all(isinstance(c, list) for c in commands):
+                raise ValueError("expected a list of commands")
+        except ValueError as e:
+            socket.write(f"error {e}\n".encode("utf-8"))
+            socket.disconnectFromServer()
+            return
+        socket.write(b"ok\n")
+        socket.flush()
+        socket.disconnectFromServer()
+        for command in commands:
+            logger.info(f"Forwarded command: {' '.join(map(str, command))}")
+            self.command_received.emit([str(part) for part in command])
+
+    # Later instances
+    def forward(self, commands: List[List[str]], timeout_ms: int = 2000) -> bool:
+        """
+        Send commands to the running instance and wait for its acknowledgement.
+
+        The first instance may still be starting, so connecting is retried until timeout_ms.
+        """
+        deadline = QtCore.QDeadlineTimer(timeout_ms)
+        socket = QtNetwork.QLocalSocket()
+        while True:
+            socket.connectToServer(self.name)
+            if socket.waitForConnected(min(200, max(deadline.remainingTime(), 0))):
+                break
+            if deadline.hasExpired():
+                logger.error(f"No running instance answered: {socket.errorString()}")
+                return False
+            QtCore.QThread.msleep(50)
+
+        socket.write((json.dumps(commands) + "\n").encode("utf-8"))
+        if not socket.waitForBytesWritten(max(deadline.remainingTime(), 1)):
+            return False
+        while not socket.canReadLine():
+            if not socket.waitForReadyRead(max(deadline.remainingTime(), 1)):
+                logger.error("Running instance did not acknowledge the command")
+                return False
+        reply = bytes(socket.readLine()).decode("utf-8", "replace").strip()
+        socket.disconnectFromServer()
+        if reply != "ok":
+            logger.error(f"Running instance rejected the command: {reply}")
+            return False
+        return True
@@ -0,0 +1,96 @@
+from PyQt5 import QtWidgets, QtGui, QtCore
+from resources.settings import Settings
+
+import math
+
+# metric, label, unit, fixed range (None = scale to the data)
+PANEL_METRICS = (
+    ("load", "Load", "%", (0.0, 100.0)),
+    ("temperature", "Temp", "°C", None),
+    ("memoryUsed", "VRAM", "MB", None),
+)
+
+
+class Sparkline(QtWidgets.QWidget):
+    """Minimal line chart: one polyline, no axes, latest value as text."""
+
+    def __init__(self, label, unit, value_range=None, parent=None):
+        super().__init__(parent)
+        self.label = label
+        self.unit = unit
+        self.value_range = value_range
+        self.values = []
+        self.setMinimumHeight(36)
+        self._pen = QtGui.QPen(QtGui.QColor("lightgreen"), 1.5)
+        self._text_pen = QtGui.QPen(QtGui.QColor("gray"))
+
+    def set_values(self, values):
+        self.values = [v for v in values if not math.isnan(v)]
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        rect = self.rect().adjusted(2, 14, -2, -2)
+
+        latest = f"{self.values[-1]:.0f} {self.unit}" if self.values else "-"
+        painter.setPen(self._text_pen)
+        painter.drawText(self.rect().adjusted(2, 0, -2, 0), QtCore.Qt.AlignTop | QtCore.Qt.AlignLeft, self.label)
+        painter.drawText(self.rect().adjusted(2, 0, -2, 0), QtCore.Qt.AlignTop | QtCore.Qt.AlignRight, latest)
+
+        if len(self.values) < 2:
+            return
+        low, high = self.value_range or (min(self.values), max(self.values))
+        span = (high - low) or 1.0
+        step = rect.width() / (len(self.values) - 1)
+        points = QtGui.QPolygonF([
+            QtCore.QPointF(rect.left() + i * step, rect.bottom() - (value - low) / span * rect.height())
+            for i, value in enumerate(self.values)
+        ])
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setPen(self._pen)
+        painter.drawPolyline(points)
+
+
+class SparklinePanel(QtWidgets.QWidget):
+    """
+    Row of sparklines for one GPU fed by a core.telemetry.TelemetrySampler.
+
+    Polls the sampler on a timer and repaints only when new samples arrived.
+    The sampler (and its nvidia-smi process) runs only while the panel is
+    shown, so nothing is sampled while the window sits in the tray.
+    """
+
+    def __init__(self, sampler, gpu=0, refresh_ms=Settings.TELEMETRY_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self.sampler = sampler
+        self.gpu = gpu
+        self._seen_version = -1
+
+        layout = QtWidgets.QHBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.lines = {}
+        for metric, label, unit, value_range in PANEL_METRICS:
+            self.lines[metric] = Sparkline(label, unit, value_range, self)
+            layout.addWidget(self.lines[metric])
+        self.setLayout(layout)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(refresh_ms)
+        self._timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.sampler.start()
+        self._timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        self.sampler.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        if self.sampler.version == self._seen_version or not self.isVisible():
+            return
+        self._seen_version = self.sampler.version
+        for metric, sparkline in self.lines.items():
+            sparkline.set_values(self.sampler.series(self.gpu, metric))
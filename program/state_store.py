@@ -0,0 +1,116 @@
+from PyQt5 import QtCore
+from core.capabilities import capabilities
+from core.registry import (read_dlss_overlay_status, read_nvngx_status, read_status,
+                           update_dlss_overlay_in_registry, update_status_in_registry)
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Values of the gsync and overlay entries besides "ON" and "OFF"
+MISSING = "MISSING"  # The registry key or value does not exist
+ERROR = "ERROR"  # Reading failed for another reason
+UNAVAILABLE = "UNAVAILABLE"  # No registry on this platform
+
+
+class StateStore(QtCore.QObject):
+    """
+    Single owner of the state the window and tray display.
+
+    gsync and overlay are "ON"/"OFF" or one of MISSING, ERROR, UNAVAILABLE;
+    nvngx is the NVNGX registry status ("ON"/"OFF"); ngx_versions is
+    {type: active version}; gpu is the GPU probe's list of dicts (or None).
+
+    Backends are read by the refresh_* methods only, writes go through the
+    set_* methods, and every signal fires only when its value actually
+    changed, so subscribers never re-read a backend themselves.
+    Use it from the GUI thread.
+    """
+
+    gsync_changed = QtCore.pyqtSignal(str)
+    overlay_changed = QtCore.pyqtSignal(str)
+    nvngx_changed = QtCore.pyqtSignal(str)
+    ngx_versions_changed = QtCore.pyqtSignal(dict)
+    gpu_changed = QtCore.pyqtSignal(object)
+    # Any of the above, as (key, new value)
+    changed = QtCore.pyqtSignal(str, object)
+
+    _UNSET = object()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._values = {key: self._UNSET for key in ("gsync", "overlay", "nvngx", "ngx_versions", "gpu")}
+        self._signals = {
+            "gsync": self.gsync_changed,
+            "overlay": self.overlay_changed,
+            "nvngx": self.nvngx_changed,
+            "ngx_versions": self.ngx_versions_changed,
+            "gpu": self.gpu_changed,
+        }
+        self.emitted = 0  # Change signals sent, for checking updates stay diff-based
+
+    def get(self, key, default=None):
+        value = self._values[key]
+        return default if value is self._UNSET else value
+
+    def _put(self, key, value) -> bool:
+        if self._values[key] == value:
+            return False
+        self._values[key] = value
+        self.emitted += 1
+        self._signals[key].emit(value)
+        self.changed.emit(key, value)
+        return True
+
+    # Registry-backed values
+    @staticmethod
+    def _read(reader) -> str:
+        if not capabilities.available("registry"):
+            return UNAVAILABLE
+        try:
+            return reader()
+        except FileNotFoundError:
+            return MISSING
+        except Exception as e:
+            logger.error(f"Reading {reader.__name__} failed: {e}")
+            return ERROR
+
+    def refresh_gsync(self) -> str:
+        """Read G-SYNC status (from the registry cache when it is current)."""
+        self._put("gsync", self._read(read_status))
+        return self.get("gsync")
+
+    def refresh_overlay(self) -> str:
+        self._put("overlay", self._read(read_dlss_overlay_status))
+        return self.get("overlay")
+
+    def refresh_nvngx(self) -> str:
+        self._put("nvngx", self._read(read_nvngx_status))
+        return self.get("nvngx")
+
+    def refresh_all(self) -> None:
+        self.refresh_gsync()
+        self.refresh_overlay()
+        self.refresh_nvngx()
+
+    def set_gsync(self, option: int) -> None:
+        """Record a G-SYNC change the wrapper confirmed (option 2 = ON, 0 = OFF)."""
+        status = "ON" if option == 2 else "OFF"
+        if self.get("gsync") != status:
+            update_status_in_registry(option)
+            self._put("gsync", status)
+
+    def set_overlay(self, option: int) -> str:
+        """Write the DLSS overlay flag (1 = ON, 0 = OFF) and publish what the registry now holds."""
+        if self.get("overlay") == ("ON" if option == 1 else "OFF"):
+            return self.get("overlay")
+        update_dlss_overlay_in_registry(option)  # Logs its own errors
+        # Served from the cache after a successful write; a failed write dropped it, so this re-reads
+        return self.refresh_overlay()
+
+    # Values pushed by other components
+    def set_ngx_versions(self, versions: dict) -> None:
+        self._put("ngx_versions", dict(versions))
+
+    def set_gpu(self, gpu_info_list) -> None:
+        self._put("gpu", gpu_info_list)
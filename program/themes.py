@@ -1,58 +1,205 @@
+from PyQt5 import QtWidgets, QtGui, QtCore
+from resources.settings import Settings
+
+from string import Template
+import logging
+
+logger = logging.getLogger(__name__)
+
+
 class Themes:
-    DARK_MODE = """
+    """
+    Colour palettes and the one stylesheet they fill in.
+
+    Widgets pick their look with dynamic properties instead of their own
+    stylesheets: role = title / status / log / copyright (set once), and
+    accent = true (flipped at runtime through ThemeEngine.set_property).
+    Status colours (on / off / error) are not in the stylesheet, see
+    ThemeEngine.set_status.
+    """
+
+    DARK = {
+        "window_bg": "#121212", "text": "#ffffff", "input_bg": "#1e1e1e", "border": "#333333",
+        "button_bg": "#333333", "button_text": "#ffffff", "button_hover": "#444444", "button_pressed": "#555555",
+        "disabled_bg": "gray", "disabled_text": "#ffffff", "accent_bg": "lightgreen", "accent_text": "#000000",
+        "scroll_bg": "#2e2e2e", "scroll_handle": "#555555", "muted": "gray",
+        "on": "lightgreen", "off": "red", "error": "red",
+    }
+    LIGHT = {
+        "window_bg": "#f5f5f5", "text": "#111111", "input_bg": "#ffffff", "border": "#c8c8c8",
+        "button_bg": "#e0e0e0", "button_text": "#111111", "button_hover": "#d0d0d0", "button_pressed": "#c0c0c0",
+        "disabled_bg": "#bdbdbd", "disabled_text": "#ffffff", "accent_bg": "#4caf50", "accent_text": "#ffffff",
+        "scroll_bg": "#e8e8e8", "scroll_handle": "#b0b0b0", "muted": "#666666",
+        "on": "#1b8a3a", "off": "#c62828", "error": "#c62828",
+    }
+    PALETTES = {"dark": DARK, "light": LIGHT}
+
+    STYLESHEET = Template("""
         QWidget {
-            background-color: #121212;
-            color: #ffffff;
+            background-color: $window_bg;
+            color: $text;
             font-family: Arial, sans-serif;
         }
-        QLineEdit, QTextEdit {
-            background-color: #1e1e1e;
-            border: 1px solid #333;
+        QLineEdit, QTextEdit, QPlainTextEdit {
+            background-color: $input_bg;
+            border: 1px solid $border;
             padding: 5px;
-            color: #ffffff;
+            color: $text;
         }
         QPushButton {
-            background-color: #333333;
-            color: white;
+            background-color: $button_bg;
+            color: $button_text;
             padding: 10px;
             border: none;
             border-radius: 5px;
         }
         QPushButton:hover {
-            background-color: #444444;
+            background-color: $button_hover;
         }
         QPushButton:pressed {
-            background-color: #555555;
+            background-color: $button_pressed;
+        }
+        QPushButton:disabled {
+            background-color: $disabled_bg;
+            color: $disabled_text;
+        }
+        QPushButton[accent="true"] {
+            background-color: $accent_bg;
+            color: $accent_text;
         }
         QScrollBar:vertical {
-            background: #2e2e2e;
+            background: $scroll_bg;
             width: 10px;
         }
         QScrollBar::handle:vertical {
-            background: #555555;
+            background: $scroll_handle;
             min-height: 20px;
         }
         QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
             background: none;
         }
-    """
-    TITLE_STYLE = "font-size: 18px; font-weight: bold; text-align: center; margin-bottom: 10px;"
-    STATUS_STYLE = "font-size: 16px; text-align: center; margin-bottom: 10px;"
-    BUTTON_STYLE = """
-        QPushButton {
-            background-color: #333333;
-            color: white;
-            padding: 10px;
-            border: none;
-            border-radius: 5px;
+        QLabel[role="title"] {
+            font-size: 18px;
+            font-weight: bold;
+            margin-bottom: 10px;
         }
-        QPushButton:hover {
-            background-color: #444444;
+        QLabel[role="status"] {
+            font-size: 16px;
+            font-weight: bold;
+            margin-bottom: 10px;
         }
-        QPushButton:pressed {
-            background-color: #555555;
+        QLabel[role="copyright"] {
+            font-size: 12px;
+            color: $muted;
+            margin-top: 10px;
+        }
+        QPlainTextEdit[role="log"] {
+            font-size: 10px;
+            background-color: $input_bg;
+            border: 1px solid $border;
+            padding: 5px;
         }
+    """)
+
+
+# Palette roles carrying the status colours; the stylesheet only sets the foreground ones
+STATUS_ROLES = {"on": QtGui.QPalette.Link, "off": QtGui.QPalette.LinkVisited, "error": QtGui.QPalette.BrightText}
+
+
+class _StatusRepainter(QtCore.QObject):
+    """
+    Puts the status colours back after a (re-)polish. The first polish runs in
+    the widget's own Polish handler, after event filters, so Show is used
+    for it; a theme switch ends with StyleChange.
+    """
+
+    def __init__(self, engine):
+        super().__init__()
+        self.engine = engine
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QtCore.QEvent.Show, QtCore.QEvent.StyleChange):
+            self.engine._paint_status(obj)
+        return False
+
+
+class ThemeEngine:
+    """
+    Applies a compiled theme to the whole application and restyles widgets by property.
+
+    Each theme's stylesheet is built once. Switching themes is a single
+    QApplication.setStyleSheet call; a status change is a foreground role
+    switch (set_status), and other state changes a property flip and a
+    re-polish of that one widget, with no CSS parsed.
     """
-    COPYRIGHT_STYLE = "font-size: 12px; color: gray; text-align: center; margin-top: 10px;"
-    ERROR_STYLE = "font-size: 16px; font-weight: bold; color: red; text-align: center;"
-    LOG_STYLE = "font-size: 10px; background-color: #1e1e1e; color: #ffffff; border: 1px solid #333; padding: 5px;"
+
+    def __init__(self, name=Settings.THEME):
+        self.name = name if name in Themes.PALETTES else "dark"
+        self._compiled = {}
+        self._status_filter = None
+
+    def stylesheet(self, name=None):
+        name = name or self.name
+        if name not in self._compiled:
+            self._compiled[name] = Themes.STYLESHEET.substitute(Themes.PALETTES[name])
+        return self._compiled[name]
+
+    def color(self, key, name=None):
+        """A palette colour, for widgets that paint themselves."""
+        return Themes.PALETTES[name or self.name][key]
+
+    def apply(self, name=None, app=None):
+        """Install the theme application-wide; widgets already shown are restyled by Qt."""
+        if name is not None:
+            if name not in Themes.PALETTES:
+                logger.warning(f"Unknown theme {name}, keeping {self.name}")
+                return
+            self.name = name
+        app = app or QtWidgets.QApplication.instance()
+        if app is not None:
+            app.setStyleSheet(self.stylesheet())
+
+    @staticmethod
+    def set_role(widget, role):
+        """Pick a widget's base look; call before it is first shown."""
+        widget.setProperty("role", role)
+
+    @staticmethod
+    def set_property(widget, name, value):
+        """Change a styled property and re-polish the widget, only if the value differs."""
+        if widget.property(name) == value:
+            return
+        widget.setProperty(name, value)
+        style = widget.style()
+        style.unpolish(widget)
+        style.polish(widget)
+
+    def _paint_status(self, widget):
+        palette = widget.palette()
+        for status, role in STATUS_ROLES.items():
+            palette.setColor(role, QtGui.QColor(self.color(status)))
+        widget.setPalette(palette)
+
+    def set_status(self, widget, status):
+        """
+        status is "on", "off" or "error".
+
+        Each status colour sits in its own palette role of the widget, so a
+        change only switches the foreground role: no re-polish, no palette
+        change. Polishing resets the palette, so it is painted again then.
+        """
+        previous = widget.property("status")
+        if previous == status:
+            return
+        if previous is None:
+            if self._status_filter is None:
+                self._status_filter = _StatusRepainter(self)
+            widget.installEventFilter(self._status_filter)
+            self._paint_status(widget)
+        widget.setProperty("status", status)
+        widget.setForegroundRole(STATUS_ROLES[status])
+        widget.update()
+
+
+# Process-wide engine
+theme = ThemeEngine()
@@ -0,0 +1,160 @@
+"""
+Assets Module.
+Locates bundled files (icons and other static data) for source checkouts and
+PyInstaller builds, and hands out QIcon/QPixmap instances decoded once.
+
+Files are read from memory after their first use: each asset is read once,
+decoded into pixmaps, and the tray icon's state variants (a coloured dot per
+G-SYNC state) are painted up front, so showing a tray message or switching
+the tray state never goes to disk.
+"""
+
+import os
+import sys
+import threading
+import logging
+from typing import Dict, List, Optional, Tuple
+from resources.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# Dot colour per tray state; None is the plain icon
+TRAY_STATE_COLORS = {"on": "#3ccf4e", "off": "#e53935", "error": "#ffb300"}
+TRAY_SIZES = (16, 24, 32, 48)
+
+
+def asset_dirs() -> List[str]:
+    """
+    Folders searched for bundled files, in order.
+
+    A frozen build looks in the PyInstaller bundle (sys._MEIPASS), then next to
+    the executable; a source checkout looks in the repository root.
+    """
+    if getattr(sys, "frozen", False):
+        dirs = [getattr(sys, "_MEIPASS", None), os.path.dirname(os.path.abspath(sys.executable))]
+    else:
+        dirs = [os.path.dirname(os.path.dirname(os.path.abspath(__file__)))]
+    return [d for d in dirs if d]
+
+
+def asset_path(name: str) -> Optional[str]:
+    """Absolute path of a bundled file, or None if it is not shipped."""
+    if os.path.isabs(name):
+        return name if os.path.exists(name) else None
+    for directory in asset_dirs():
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+class AssetRegistry:
+    """
+    Cache of bundled files as bytes, QIcons and QPixmaps.
+
+    Qt objects are created on first use, which must happen on the GUI thread
+    after the QApplication exists. preload() does all of it at startup.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: Dict[str, Optional[bytes]] = {}
+        self._icons: Dict[Tuple[str, Optional[str]], object] = {}
+        self._pixmaps: Dict[Tuple[str, int], object] = {}
+
+    def data(self, name: str) -> Optional[bytes]:
+        """Content of a bundled file, read once; None if it is missing."""
+        with self._lock:
+            if name not in self._data:
+                path = asset_path(name)
+                try:
+                    with open(path, "rb") as f:
+                        self._data[name] = f.read()
+                except (OSError, TypeError):
+                    logger.warning(f"Asset not found: {name} (searched {', '.join(asset_dirs())})")
+                    self._data[name] = None
+            return self._data[name]
+
+    def available(self, name: str = Settings.ICON_PATH) -> bool:
+        return self.data(name) is not None
+
+    @staticmethod
+    def _decode(data: bytes) -> list:
+        """Every image in the file (all sizes of an .ico) as QPixmaps."""
+        from PyQt5 import QtCore, QtGui
+        buffer = QtCore.QBuffer()
+        buffer.setData(data)
+        buffer.open(QtCore.QIODevice.ReadOnly)
+        reader = QtGui.QImageReader(buffer)
+        pixmaps = []
+        for _ in range(max(reader.imageCount(), 1)):
+            image = reader.read()
+            if image.isNull():
+                break
+            pixmaps.append(QtGui.QPixmap.fromImage(image))
+            if not reader.jumpToNextImage():
+                break
+        return pixmaps
+
+    def icon(self, name: str = Settings.ICON_PATH):
+        """Cached QIcon; the platform's generic application icon if the file is missing."""
+        key = (name, None)
+        icon = self._icons.get(key)
+        if icon is None:
+            from PyQt5 import QtGui, QtWidgets
+            data = self.data(name)
+            pixmaps = self._decode(data) if data is not None else []
+            if pixmaps:
+                icon = QtGui.QIcon()
+                for pixmap in pixmaps:
+                    icon.addPixmap(pixmap)
+            else:
+                icon = QtWidgets.QApplication.style().standardIcon(QtWidgets.QStyle.SP_ComputerIcon)
+            self._icons[key] = icon
+        return icon
+
+    def pixmap(self, name: str = Settings.ICON_PATH, size: int = 32):
+        key = (name, size)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            pixmap = self._pixmaps[key] = self.icon(name).pixmap(size, size)
+        return pixmap
+
+    def tray_icon(self, state: Optional[str] = None, name: str = Settings.ICON_PATH):
+        """The app icon with a status dot for state ("on", "off", "error"), or plain for None."""
+        if state not in TRAY_STATE_COLORS:
+            return self.icon(name)
+        key = (name, state)
+        icon = self._icons.get(key)
+        if icon is None:
+            icon = self._icons[key] = self._render_variant(self.icon(name), TRAY_STATE_COLORS[state])
+        return icon
+
+    @staticmethod
+    def _render_variant(base, color: str):
+        from PyQt5 import QtCore, QtGui
+        icon = QtGui.QIcon()
+        for size in TRAY_SIZES:
+            pixmap = base.pixmap(size, size)
+            if pixmap.isNull():
+                continue
+            pixmap = pixmap.copy()  # Do not paint on the base icon's cached pixmap
+            dot = max(size * 3 // 8, 6)
+            painter = QtGui.QPainter(pixmap)
+            painter.setRenderHint(QtGui.QPainter.Antialiasing)
+            painter.setPen(QtGui.QPen(QtGui.QColor("#000000"), max(size // 16, 1)))
+            painter.setBrush(QtGui.QColor(color))
+            painter.drawEllipse(QtCore.QRectF(size - dot, size - dot, dot - 1, dot - 1))
+            painter.end()
+            icon.addPixmap(pixmap)
+        return icon
+
+    def preload(self, name: str = Settings.ICON_PATH) -> None:
+        """Decode the icon and paint every tray variant now, at startup."""
+        self.icon(name)
+        for state in TRAY_STATE_COLORS:
+            self.tray_icon(state, name)
+
+
+# Process-wide registry
+assets = AssetRegistry()
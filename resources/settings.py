@@ -4,8 +4,23 @@ class Settings:
     BUILD_VERSION = "250601"
     MAIN_TITLE = "SwapSpectra"
     EXECUTABLE_PATH = "gsyncwrapper-1.1.0-x86_64.dll"
+    COMMAND_TIMEOUT = 15.0  # Seconds before a hung wrapper is killed
+    REFRESH_SETTLE_SECONDS = 3.0  # Pause after each refresh step so the driver settles (nothing reads the state back)
+    # Optional long-lived helper speaking the core.wrapper_host protocol, empty to always spawn the wrapper
+    WRAPPER_HELPER = ""
+    WRAPPER_HELPER_ARGS = ["--serve"]
     LOG_FILE = "gsyncwrapper.log"
+    LOG_LEVEL = "INFO"
+    LOG_MAX_BYTES = 1024 * 1024  # Rotate the log file at 1 MiB
+    LOG_BACKUP_COUNT = 3
+    LOG_JSON = False  # Also write structured JSON lines (or set SWAPSPECTRA_LOG_JSON=1)
+    STARTUP_TRACE_FILE = "startup_trace.json"
+    LOG_VIEWER_MAX_LINES = 1000
+    LOG_VIEWER_FLUSH_MS = 100
+    CONFIG_FILE = "config.xml"
+    CONFIG_WRITE_DEBOUNCE = 0.5  # Seconds to coalesce config writes
     ICON_PATH = "gvico.ico"
+    THEME = "dark"  # "dark" or "light"; the settings window saves the choice to config.xml
     REGISTRY_PATH = r"Software\NoID Softwork\GvSync"
     WINDOW_WIDTH = 700
     WINDOW_HEIGHT = 600
@@ -23,6 +38,37 @@ class Settings:
 
     # Path to the DLL
     gvlibname = "idsw-gvlib.dll"
+
+    # NGX models folder the DLSS swap installs into
+    # (override with SWAPSPECTRA_NGX_MODELS_ROOT, e.g. a temp folder for testing)
+    NGX_MODELS_ROOT = r"C:\ProgramData\NVIDIA\NGX\models"
+    NGX_KEEP_VERSIONS = 2  # Versions per type kept by "remove old DLSS models"
+
+    # DLSS DLL catalog: SQLite index file and default folders to crawl
+    # (override with <dlssCatalogRoots> in config.xml, ';'-separated)
+    DLSS_CATALOG_DB = "dlss_catalog.sqlite3"
+    DLSS_CATALOG_SCAN_DELAY_MS = 5000  # Keep the first crawl off the startup path
+    DLSS_CATALOG_ROOTS = [
+        r"%ProgramFiles(x86)%\Steam\steamapps\common",
+        r"%ProgramFiles%\Epic Games",
+        r"%ProgramFiles%\Steam\steamapps\common",
+    ]
+
+    # GPU probe (nvidia-smi) cache lifetime and timeout, in seconds
+    GPU_PROBE_TTL = 30.0
+    GPU_PROBE_TIMEOUT = 10.0
+
+    # GPU telemetry sampling interval and samples kept per metric
+    TELEMETRY_INTERVAL_MS = 1000
+    TELEMETRY_CAPACITY = 120
+
+    # Per-game profiles: file in the user data folder, process poll interval
+    # (backed off up to the max while a poll costs more than the CPU budget,
+    # a fraction of one core)
+    PROFILES_FILE = "profiles.json"
+    PROFILE_POLL_MS = 2000
+    PROFILE_MAX_POLL_MS = 16000
+    PROFILE_CPU_BUDGET = 0.002
     
     # System Tray Settings
     # Need to put this to an external file
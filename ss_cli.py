@@ -0,0 +1,153 @@
+"""
+SwapSpectra command line.
+Drives the same backends as the tray app without Qt, for scripts and scheduled tasks:
+
+    python -m ss_cli gsync on|off
+    python -m ss_cli overlay on|off
+    python -m ss_cli swap C:\\path\\to\\nvngx_dlss.dll [more DLLs...]
+    python -m ss_cli status [--json] [--gpu]
+
+Each subcommand imports only the backend modules it needs; nothing here imports PyQt5.
+"""
+
+import argparse
+import os
+import sys
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+
+
+def _app_path(path: str) -> str:
+    """Resolve a bundled file from the app folder, so the CLI works from any cwd."""
+    if os.path.isabs(path) or os.path.exists(path):
+        return path
+    base = os.path.dirname(sys.executable if getattr(sys, "frozen", False) else os.path.abspath(__file__))
+    return os.path.join(base, path)
+
+
+def cmd_gsync(args) -> int:
+    from resources.settings import Settings
+    from core.executor import run_gsync_command
+    from core.registry import update_status_in_registry
+
+    option = 2 if args.state == "on" else 0
+    success, message = run_gsync_command(_app_path(Settings.EXECUTABLE_PATH), option, timeout=Settings.COMMAND_TIMEOUT)
+    if not success:
+        print(message, file=sys.stderr)
+        return EXIT_FAILED
+    update_status_in_registry(option)
+    print(message)
+    return EXIT_OK
+
+
+def cmd_overlay(args) -> int:
+    from core.registry import read_dlss_overlay_status, registry_cache, update_dlss_overlay_in_registry
+
+    update_dlss_overlay_in_registry(1 if args.state == "on" else 0)  # Logs its own errors
+    registry_cache.invalidate("ShowDlssIndicator")
+    try:
+        status = read_dlss_overlay_status()
+    except OSError as e:
+        print(f"Could not read the DLSS overlay status: {e}", file=sys.stderr)
+        return EXIT_FAILED
+    print(f"DLSS Overlay: {status}")
+    return EXIT_OK if status == args.state.upper() else EXIT_FAILED
+
+
+def cmd_swap(args) -> int:
+    from core.ngx_swap import NgxSwapEngine, SwapError
+
+    engine = NgxSwapEngine(args.models_root)
+    try:
+        if args.dry_run:
+            items = engine.plan(args.dlls)
+        else:
+            progress = None
+            if sys.stderr is not None and sys.stderr.isatty():
+                def progress(done, total):
+                    print(f"\r{done * 100 // total if total else 100:3d}%", end="", file=sys.stderr, flush=True)
+            items = engine.apply(args.dlls, progress=progress)
+            if progress is not None:
+                print(file=sys.stderr)
+    except SwapError as e:
+        print(e, file=sys.stderr)
+        return EXIT_FAILED
+    for item in items:
+        print(f"{'Would install' if args.dry_run else 'Installed'} {item.type} {item.version} -> {item.dest}")
+    return EXIT_OK
+
+
+def collect_status(gpu: bool = False, models_root: str = None) -> dict:
+    """Current state as a dict of plain values; None where a value could not be read."""
+    from core.registry import read_dlss_overlay_status, read_nvngx_status, read_status
+    from core.ngx_inventory import NgxInventory
+
+    status = {}
+    for key, read in (("gsync", read_status), ("overlay", read_dlss_overlay_status), ("nvngx", read_nvngx_status)):
+        try:
+            status[key] = read()
+        except OSError:
+            status[key] = None
+    try:
+        status["ngx_models"] = NgxInventory(models_root).active_versions()
+    except OSError:
+        status["ngx_models"] = None
+    if gpu:
+        from core.ckGpu import get_gpu_info
+        status["gpus"] = get_gpu_info()
+    return status
+
+
+def cmd_status(args) -> int:
+    status = collect_status(args.gpu, args.models_root)
+    if args.json:
+        import json
+        print(json.dumps(status, indent=2))
+        return EXIT_OK
+    print(f"G-SYNC: {status['gsync'] or 'unknown'}")
+    print(f"DLSS Overlay: {status['overlay'] or 'unknown'}")
+    print(f"NVNGX: {status['nvngx'] or 'unknown'}")
+    for kind, version in sorted((status["ngx_models"] or {}).items()):
+        print(f"{kind}: {version}")
+    for gpu in status.get("gpus") or []:
+        print(f"GPU: {gpu.get('name')}")
+    return EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="ss_cli", description="SwapSpectra without the window.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log at INFO instead of WARNING")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gsync = sub.add_parser("gsync", help="turn G-SYNC on or off")
+    gsync.add_argument("state", choices=("on", "off"))
+    gsync.set_defaults(func=cmd_gsync)
+
+    overlay = sub.add_parser("overlay", help="turn the DLSS indicator overlay on or off")
+    overlay.add_argument("state", choices=("on", "off"))
+    overlay.set_defaults(func=cmd_overlay)
+
+    swap = sub.add_parser("swap", help="install DLSS DLLs (at most one per type) as one transaction")
+    swap.add_argument("dlls", nargs="+", metavar="DLL")
+    swap.add_argument("--dry-run", action="store_true", help="show what would be installed")
+    swap.add_argument("--models-root", default=None, help="NGX models folder (default: the NVIDIA one)")
+    swap.set_defaults(func=cmd_swap)
+
+    status = sub.add_parser("status", help="show G-SYNC, overlay and DLSS model state")
+    status.add_argument("--json", action="store_true")
+    status.add_argument("--gpu", action="store_true", help="also query nvidia-smi")
+    status.add_argument("--models-root", default=None, help="NGX models folder (default: the NVIDIA one)")
+    status.set_defaults(func=cmd_status)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    from core.logger import setup_logging
+    setup_logging(level="INFO" if args.verbose else "WARNING")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,57 @@
-from PyQt5 import QtWidgets
-from core.system_tray import GSyncToggleAppWithTray
 import sys
-#$import resources.settings as id12
-import core.elevation as id13
-#import core.xmlEt as id14
+from core.profiler import startup_profiler
+from core.logger import setup_logging
+from resources.settings import Settings
 
 
-class load():
-    def __init__(self):
-        self.app = QtWidgets.QApplication(sys.argv)
-        self.uacElevate = id13.elevate_by_config()
-
 def main():
-    id13.elevate_by_config()  # Attempt elevation if configured and not admin
-    app = QtWidgets.QApplication(sys.argv)
-    app.setQuitOnLastWindowClosed(False)  # Ensure app stays running in the system tray
-    window = GSyncToggleAppWithTray()
+    # Our flags are stripped from a copy for Qt; sys.argv stays whole so an
+    # elevated relaunch (pyuac.runAsAdmin) passes them on
+    qt_argv = list(sys.argv)
+    startup_profiler.configure(qt_argv)
+    setup_logging()
+
+    with startup_profiler.phase("single instance"):
+        from program.single_instance import SingleInstance, parse_instance_args
+        try:
+            commands = parse_instance_args(qt_argv)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            sys.exit(2)
+        instance = SingleInstance()
+        if not instance.acquire():
+            # Already running: hand the command over and leave before loading anything else
+            sys.exit(0 if instance.forward(commands or [["show"]]) else 1)
+
+    with startup_profiler.phase("elevate_by_config"):
+        import core.elevation as id13
+        id13.elevate_by_config()  # Attempt elevation if configured and not admin
+
+    with startup_profiler.phase("import PyQt5"):
+        from PyQt5 import QtWidgets, QtCore
+
+    with startup_profiler.phase("import application modules"):
+        from core.system_tray import GSyncToggleAppWithTray
+
+    with startup_profiler.phase("QApplication"):
+        app = QtWidgets.QApplication(qt_argv)
+        app.setQuitOnLastWindowClosed(False)  # Ensure app stays running in the system tray
+
+    with startup_profiler.phase("GSyncToggleAppWithTray"):
+        window = GSyncToggleAppWithTray()
     window.show()
+    instance.listen(window.handle_instance_command)
+    for command in commands:
+        window.handle_instance_command(command)
+
+    if startup_profiler.enabled:
+        # Runs on the first event loop iteration, once the window is on screen
+        def report():
+            for line in startup_profiler.finish(Settings.STARTUP_TRACE_FILE):
+                window.logInfo(line)
+        QtCore.QTimer.singleShot(0, report)
+
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
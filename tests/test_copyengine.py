@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+from core import copyengine
+from core.copyengine import copy_file
+
+DATA = os.urandom(3 * 4096 + 17)
+
+
+@pytest.fixture
+def src(tmp_path):
+    path = tmp_path / "src.dll"
+    path.write_bytes(DATA)
+    return str(path)
+
+
+def no_reflink(monkeypatch):
+    monkeypatch.setattr(copyengine, "_reflink", lambda fsrc, fdst: False)
+
+
+def test_kernel_copy(src, tmp_path, monkeypatch):
+    no_reflink(monkeypatch)
+    dst = str(tmp_path / "dst.dll")
+    result = copy_file(src, dst, verify=False, chunk_size=4096)
+    assert result.method in ("copy_file_range", "sendfile")
+    assert result.size == len(DATA)
+    with open(dst, "rb") as f:
+        assert f.read() == DATA
+
+
+def test_kernel_copy_serving_nothing_falls_back_to_stream(src, tmp_path, monkeypatch):
+    no_reflink(monkeypatch)
+    monkeypatch.setattr(os, "copy_file_range", lambda *args: 0, raising=False)
+    monkeypatch.setattr(os, "sendfile", lambda *args: 0, raising=False)
+    dst = str(tmp_path / "dst.dll")
+    result = copy_file(src, dst, verify=False, chunk_size=4096)
+    assert result.method == "stream"
+    with open(dst, "rb") as f:
+        assert f.read() == DATA
+
+
+def test_kernel_copy_short_source_raises(src, tmp_path, monkeypatch):
+    no_reflink(monkeypatch)
+    real = os.copy_file_range
+    calls = []
+
+    def shrinking(src_fd, dst_fd, count, offset_src, offset_dst):
+        calls.append(count)
+        if len(calls) > 1:
+            return 0  # The source was truncated after the first chunk
+        return real(src_fd, dst_fd, count, offset_src, offset_dst)
+
+    monkeypatch.setattr(os, "copy_file_range", shrinking)
+    dst = str(tmp_path / "dst.dll")
+    with pytest.raises(OSError, match="Source ended after 4096"):
+        copy_file(src, dst, verify=False, chunk_size=4096)
+    assert not os.path.exists(dst)
@@ -0,0 +1,29 @@
+import json
+
+from core.metrics import MetricsRegistry
+from program.diagnostics import export_target
+
+PROM = "Prometheus text (*.prom *.txt)"
+JSON = "JSON (*.json)"
+
+
+def test_export_target_follows_selected_filter():
+    assert export_target("/tmp/m", JSON) == ("/tmp/m.json", "json")
+    assert export_target("/tmp/m.prom", JSON) == ("/tmp/m.json", "json")
+    assert export_target("/tmp/m.json", PROM) == ("/tmp/m.prom", "prometheus")
+    assert export_target("/tmp/m.txt", PROM) == ("/tmp/m.txt", "prometheus")
+    assert export_target("/tmp/m.v2", JSON) == ("/tmp/m.v2.json", "json")
+
+
+def test_export_target_without_filter_keeps_path():
+    assert export_target("/tmp/m.json", "") == ("/tmp/m.json", None)
+
+
+def test_export_format_overrides_extension(tmp_path):
+    registry = MetricsRegistry()
+    registry.inc("swaps_total", outcome="ok")
+    path = tmp_path / "metrics.txt"
+    registry.export(str(path), "json")
+    assert json.loads(path.read_text())["counters"][0]["value"] == 1
+    registry.export(str(path))
+    assert "# TYPE" in path.read_text()
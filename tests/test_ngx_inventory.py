@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+
+import pytest
+
+from core.ngx_inventory import NgxInventory
+from core.ngx_swap import MODEL_FILE, NgxSwapEngine
+
+
+def snippet(version):
+    major, minor, patch = map(int, version.split("."))
+    return (major << 16) | (minor << 8) | patch
+
+
+def install(root, kind, version, size=1024):
+    files = os.path.join(root, kind, "versions", str(snippet(version)), "files")
+    os.makedirs(files)
+    with open(os.path.join(files, MODEL_FILE), "wb") as f:
+        f.write(b"\0" * size)
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = str(tmp_path / "models")
+    for version in ("3.7.10", "3.5.0", "3.1.0", "2.5.1"):
+        install(root, "dlss", version)
+    for version in ("3.7.10", "3.5.0"):
+        install(root, "dlssg", version)
+    with open(os.path.join(root, "nvngx_config.txt"), "w", encoding="utf-8") as f:
+        f.write("[dlss]\napp_E658703 = 3.7.10\napp_3A1B2C3 = 2.5.1\n\n[dlssg]\napp_E658703 = 3.5.0\n")
+    return root
+
+
+def remaining(root, kind):
+    return sorted(os.listdir(os.path.join(root, kind, "versions")))
+
+
+def test_active_covers_every_key(root):
+    inventory = NgxInventory(root)
+    active = {(v.type, v.version) for v in inventory.refresh() if v.active}
+    assert active == {("dlss", "3.7.10"), ("dlss", "2.5.1"), ("dlssg", "3.5.0")}
+    assert inventory.active_versions() == {"dlss": "3.7.10", "dlssg": "3.5.0"}
+
+
+def test_prune_keeps_versions_other_keys_reference(root):
+    inventory = NgxInventory(root)
+    dry = inventory.prune(1, dry_run=True)
+    assert sorted((v.type, v.version) for v in dry) == [("dlss", "3.1.0"), ("dlss", "3.5.0")]
+    removed = inventory.prune(1)
+    assert [v.path for v in removed] == [v.path for v in dry]
+    assert remaining(root, "dlss") == sorted(str(snippet(v)) for v in ("3.7.10", "2.5.1"))
+    assert remaining(root, "dlssg") == sorted(str(snippet(v)) for v in ("3.7.10", "3.5.0"))
+
+
+def test_prune_waits_for_the_swap_lock_and_prunes_the_store(root):
+    engine = NgxSwapEngine(root)
+    os.makedirs(engine.store_dir)
+    orphan = os.path.join(engine.store_dir, "0" * 64)
+    with open(orphan, "wb") as f:
+        f.write(b"unused")
+
+    held, release = threading.Event(), threading.Event()
+
+    def hold():
+        with engine.lock():
+            held.set()
+            release.wait(10)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    held.wait(10)
+    pruner = threading.Thread(target=NgxInventory(root).prune, args=(1,))
+    pruner.start()
+    time.sleep(0.2)
+    assert len(remaining(root, "dlss")) == 4  # Still waiting for the install to finish
+    release.set()
+    holder.join(10)
+    pruner.join(10)
+    assert len(remaining(root, "dlss")) == 2
+    assert not os.path.exists(orphan)
@@ -0,0 +1,188 @@
+import os
+
+import pytest
+
+from benchmarks.bench_pe_version import build_synthetic_pe
+from core import ngx_swap
+from core.ngx_config import CONFIG_FILE
+from core.ngx_swap import BACKUP_SUFFIX, STAGED_SUFFIX, NgxSwapEngine, SwapError
+
+
+class Crash(BaseException):
+    """Stands in for the process dying: not caught by apply()'s rollback handlers."""
+
+
+def make_dll(folder, name, version, padding=0):
+    path = os.path.join(folder, name)
+    with open(path, "wb") as f:
+        f.write(build_synthetic_pe(version, padding=padding))
+    return path
+
+
+@pytest.fixture
+def env(tmp_path):
+    dlls = tmp_path / "dlls"
+    dlls.mkdir()
+    engine = NgxSwapEngine(str(tmp_path / "models"), str(tmp_path / "state"))
+    return engine, str(dlls)
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def config_text(engine):
+    return read(engine.config_path).decode("utf-8") if os.path.exists(engine.config_path) else None
+
+
+def leftovers(engine):
+    found = [os.path.join(d, f) for d, _, files in os.walk(engine.root) for f in files
+             if f.endswith((STAGED_SUFFIX, BACKUP_SUFFIX))]
+    if os.path.exists(engine.journal_path):
+        found.append(engine.journal_path)
+    return found
+
+
+def version_dirs(engine, kind):
+    path = os.path.join(engine.root, kind, "versions")
+    return sorted(os.listdir(path)) if os.path.isdir(path) else []
+
+
+def test_commit(env):
+    engine, dlls = env
+    dlss = make_dll(dlls, "nvngx_dlss.dll", (3, 7, 10, 0))
+    dlssg = make_dll(dlls, "nvngx_dlssg.dll", (3, 7, 20, 0))
+    items = engine.apply([dlss, dlssg])
+
+    assert {item.type for item in items} == {"dlss", "dlssg"}
+    for item in items:
+        assert read(item.dest) == read(item.source)
+        assert os.stat(item.dest).st_nlink == 2  # Linked to the store object
+    assert config_text(engine) == "[dlss]\napp_E658703 = 3.7.10\n[dlssg]\napp_E658703 = 3.7.20\n"
+    assert leftovers(engine) == []
+
+
+def test_skips_files_already_installed(env, monkeypatch):
+    engine, dlls = env
+    dlss = make_dll(dlls, "nvngx_dlss.dll", (3, 7, 10, 0))
+    engine.apply([dlss])
+    config_stamp = os.stat(engine.config_path).st_mtime_ns
+
+    def no_stage(*args):
+        raise AssertionError("an installed file was staged again")
+
+    monkeypatch.setattr(engine, "_stage", no_stage)
+    progress = []
+    items = engine.apply([dlss], progress=lambda done, total: progress.append((done, total)))
+    assert read(items[0].dest) == read(dlss)
+    assert os.stat(engine.config_path).st_mtime_ns == config_stamp  # Not rewritten
+    assert progress == []
+    assert leftovers(engine) == []
+
+
+def test_rollback_on_staging_failure(env, monkeypatch):
+    engine, dlls = env
+    engine.apply([make_dll(dlls, "nvngx_dlss.dll", (3, 5, 0, 0))])
+    before = config_text(engine)
+    old_versions = version_dirs(engine, "dlss")
+
+    stage = engine._stage
+    calls = []
+
+    def failing_stage(obj, staged):
+        calls.append(staged)
+        if len(calls) == 2:
+            raise OSError("disk full")
+        stage(obj, staged)
+
+    monkeypatch.setattr(engine, "_stage", failing_stage)
+    new = [make_dll(dlls, "nvngx_dlss_new.dll", (3, 7, 10, 0)), make_dll(dlls, "nvngx_dlssg.dll", (3, 7, 10, 0))]
+    with pytest.raises(SwapError, match="disk full"):
+        engine.apply(new)
+
+    assert config_text(engine) == before
+    assert version_dirs(engine, "dlss") == old_versions  # Folders created for the batch are gone
+    assert version_dirs(engine, "dlssg") == []
+    assert leftovers(engine) == []
+
+
+def test_recover_after_crash_while_prepared(env, monkeypatch):
+    engine, dlls = env
+    engine.apply([make_dll(dlls, "nvngx_dlss.dll", (3, 5, 0, 0))])
+    before = config_text(engine)
+
+    write_journal = engine._write_journal
+
+    def crash_before_commit(journal):
+        if journal["state"] == "committing":
+            raise Crash()
+        write_journal(journal)
+
+    monkeypatch.setattr(engine, "_write_journal", crash_before_commit)
+    with pytest.raises(Crash):
+        engine.apply([make_dll(dlls, "nvngx_dlss_new.dll", (3, 7, 10, 0))])
+    assert os.path.exists(engine.journal_path)
+    monkeypatch.undo()
+
+    assert engine.recover() == "rolled back"
+    assert config_text(engine) == before
+    assert version_dirs(engine, "dlss") == [str((3 << 16) | (5 << 8))]
+    assert leftovers(engine) == []
+    assert engine.recover() is None
+
+
+def test_recover_after_crash_while_committing(env, monkeypatch):
+    engine, dlls = env
+    engine.apply([make_dll(dlls, "nvngx_dlss.dll", (3, 5, 0, 0))])
+    before = config_text(engine)
+
+    replace = os.replace
+    crashed = []
+
+    def crash_before_config(src, dst):
+        if src == engine.config_path + STAGED_SUFFIX and not crashed:
+            crashed.append(src)
+            raise Crash()  # The DLLs are in place, the config is not
+        replace(src, dst)
+
+    monkeypatch.setattr(ngx_swap.os, "replace", crash_before_config)
+    with pytest.raises(Crash):
+        engine.apply([make_dll(dlls, "nvngx_dlss_new.dll", (3, 7, 10, 0))])
+    monkeypatch.undo()
+    assert len(version_dirs(engine, "dlss")) == 2
+
+    assert engine.recover() == "rolled back"
+    assert config_text(engine) == before
+    assert version_dirs(engine, "dlss") == [str((3 << 16) | (5 << 8))]
+    assert leftovers(engine) == []
+
+
+def test_recover_completes_a_committed_batch(env, monkeypatch):
+    engine, dlls = env
+    engine.apply([make_dll(dlls, "nvngx_dlss.dll", (3, 5, 0, 0))])
+    monkeypatch.setattr(engine, "_cleanup", lambda journal: (_ for _ in ()).throw(Crash()))
+    with pytest.raises(Crash):
+        engine.apply([make_dll(dlls, "nvngx_dlss_new.dll", (3, 7, 10, 0))])
+    monkeypatch.undo()
+
+    assert engine.recover() == "completed"
+    assert "app_E658703 = 3.7.10" in config_text(engine)
+    assert leftovers(engine) == []
+
+
+def test_store_object_modified_through_a_link_is_replaced(env):
+    engine, dlls = env
+    dlss = make_dll(dlls, "nvngx_dlss.dll", (3, 7, 10, 0))
+    [item] = engine.apply([dlss])
+
+    # Something rewrites the installed DLL in place, which also rewrites the stored copy
+    with open(item.dest, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        f.write(b"\xff")
+    obj = os.path.join(engine.store_dir, item.sha256)
+    assert read(obj) != read(dlss)
+
+    [item] = engine.apply([dlss])
+    assert read(item.dest) == read(dlss)
+    assert read(obj) == read(dlss)
@@ -0,0 +1,150 @@
+import json
+import os
+
+import pytest
+
+from core.profiles import FakeProcessSource, ProfileEngine, ProfileStore
+
+PROFILES = [
+    {"name": "by name", "match": "Alpha.exe", "gsync": "off"},
+    {"name": "by path", "match": "/opt/Games/Bee.bin", "gsync": "on", "overlay": "on"},
+]
+
+
+def write_profiles(path, profiles):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"profiles": profiles}, f)
+    # Make sure the store sees a new stamp even on filesystems with coarse mtimes
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def setup(tmp_path):
+    path = str(tmp_path / "profiles.json")
+    write_profiles(path, PROFILES)
+    state = {"gsync": "ON", "overlay": "OFF"}
+    applied = []
+
+    def apply(changes):
+        applied.append(dict(changes))
+        state.update(changes)
+
+    source = FakeProcessSource()
+    engine = ProfileEngine(ProfileStore(path), source, read_state=lambda: dict(state), apply=apply)
+    return engine, source, state, applied, path
+
+
+def current(engine, state):
+    return engine.active.name if engine.active else None, state["gsync"], state["overlay"]
+
+
+def test_name_and_path_rules_restore_on_exit(setup):
+    engine, source, state, applied, _ = setup
+    engine.poll()
+    assert current(engine, state) == (None, "ON", "OFF")
+
+    alpha = source.start("alpha.exe", "/games/alpha.exe")
+    engine.poll()
+    assert current(engine, state) == ("by name", "OFF", "OFF")
+    source.stop(alpha)
+    engine.poll()
+    assert current(engine, state) == (None, "ON", "OFF")
+
+    bee = source.start("Bee.bin", "/opt/Games/Bee.bin")
+    other = source.start("bee.bin", "/tmp/bee.bin")  # Same name, different path
+    engine.poll()
+    assert current(engine, state) == ("by path", "ON", "ON")
+    source.stop(bee)
+    engine.poll()
+    assert current(engine, state) == (None, "ON", "OFF")
+    source.stop(other)
+    engine.poll()
+    assert applied == [{"gsync": "OFF"}, {"gsync": "ON"}, {"overlay": "ON"}, {"overlay": "OFF"}]
+
+
+def test_only_new_processes_are_resolved(setup):
+    engine, source, _, _, _ = setup
+    for i in range(50):
+        source.start(f"proc{i}")
+    engine.poll()
+    lookups = source.lookups
+    engine.poll()
+    assert source.lookups == lookups
+    source.start("alpha.exe")
+    engine.poll()
+    assert source.lookups == lookups + 1
+
+
+def test_overlapping_games(setup):
+    engine, source, state, _, _ = setup
+    engine.poll()
+    alpha = source.start("alpha.exe", "/games/alpha.exe")
+    engine.poll()
+    bee = source.start("Bee.bin", "/opt/Games/Bee.bin")
+    engine.poll()
+    assert current(engine, state) == ("by path", "ON", "ON")  # Most recent game wins
+
+    # Back to the first game: its G-SYNC setting, and the overlay it never asked for as it was
+    source.stop(bee)
+    engine.poll()
+    assert current(engine, state) == ("by name", "OFF", "OFF")
+
+    bee = source.start("Bee.bin", "/opt/Games/Bee.bin")
+    engine.poll()
+    source.stop(alpha)
+    engine.poll()
+    assert current(engine, state) == ("by path", "ON", "ON")  # Still running, keeps its profile
+    source.stop(bee)
+    engine.poll()
+    assert current(engine, state) == (None, "ON", "OFF")
+
+
+def test_reload_while_game_runs(setup):
+    engine, source, state, _, path = setup
+    engine.poll()
+    source.start("alpha.exe", "/games/alpha.exe")
+    engine.poll()
+    assert current(engine, state) == ("by name", "OFF", "OFF")
+
+    # The running game's profile changes: applied without restarting the game
+    write_profiles(path, [{"name": "by name", "match": "Alpha.exe", "gsync": "off", "overlay": "on"}])
+    engine.poll()
+    assert current(engine, state) == ("by name", "OFF", "ON")
+
+    # Its profile is removed: the state from before the game is restored
+    write_profiles(path, [PROFILES[1]])
+    engine.poll()
+    assert current(engine, state) == (None, "ON", "OFF")
+
+    # profiles.json deleted while a matching game runs
+    source.start("Bee.bin", "/opt/Games/Bee.bin")
+    engine.poll()
+    assert current(engine, state) == ("by path", "ON", "ON")
+    os.remove(path)
+    engine.poll()
+    assert current(engine, state) == (None, "ON", "OFF")
+    assert not engine.enabled
+
+
+def test_adjust_interval_backs_off_and_returns(tmp_path):
+    engine = ProfileEngine(ProfileStore(str(tmp_path / "none.json")), FakeProcessSource(),
+                           read_state=dict, apply=lambda changes: None,
+                           interval_ms=100, max_interval_ms=800, cpu_budget=0.01)
+    engine.poll_cpu_ms = 5.0  # 5% of a 100 ms interval, over the 1% budget
+    intervals = []
+    for _ in range(5):
+        engine._adjust_interval()
+        intervals.append(engine.interval_ms)
+    assert intervals == [200, 400, 800, 800, 800]
+
+    engine.poll_cpu_ms = 4.0  # Within budget at 800 ms, but not cheap enough to speed up
+    engine._adjust_interval()
+    assert engine.interval_ms == 800
+
+    engine.poll_cpu_ms = 0.0
+    intervals = []
+    for _ in range(4):
+        engine._adjust_interval()
+        intervals.append(engine.interval_ms)
+    assert intervals == [400, 200, 100, 100]